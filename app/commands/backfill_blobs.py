@@ -0,0 +1,125 @@
+"""
+downloads/ 아래의 기존 파일을 병렬로 해시해 blob 테이블과 Media.sha256 을 채우고,
+내용이 같은 파일은 하드링크로 합쳐 디스크를 회수합니다.
+
+    python -m app.commands.backfill_blobs [--workers 8] [--dry-run]
+"""
+import argparse, asyncio, logging, os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import select, update
+
+from app.models.blob import Blob
+from app.models.media import Media
+from core import settings
+from core.database import AsyncSessionLocal, init_db
+from core.unit_of_work import unit_of_work
+from utils.file_utils import hash_file, replace_with_link
+
+logger = logging.getLogger(__name__)
+
+UPDATE_BATCH_SIZE = 1000
+
+
+def _hash(path: Path) -> Optional[Tuple[Path, int, str]]:
+    try:
+        size, digest = hash_file(path)
+    except OSError:
+        logger.warning("해시 실패: %s", path)
+        return None
+    return path, size, digest
+
+
+def _scan(root: Path) -> List[Path]:
+    return [
+        p for p in root.rglob("*")
+        if p.is_file() and not p.name.startswith(".") and p.suffix != ".part"
+    ]
+
+
+async def backfill(root: Path, workers: int, dry_run: bool) -> None:
+    paths = await asyncio.to_thread(_scan, root)
+    logger.info("%d개 파일 해시 시작 (workers=%d)", len(paths), workers)
+
+    def _hash_all():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return [r for r in pool.map(_hash, paths, chunksize=64) if r is not None]
+
+    hashed = await asyncio.to_thread(_hash_all)
+
+    by_digest: Dict[str, List[Path]] = defaultdict(list)
+    sizes: Dict[str, int] = {}
+    path_digest: Dict[str, str] = {}
+    for path, size, digest in hashed:
+        by_digest[digest].append(path)
+        sizes[digest] = size
+        path_digest[str(path.resolve())] = digest
+
+    async with AsyncSessionLocal() as session:
+        async with unit_of_work(session):
+            blobs = {b.digest: b for b in (await session.exec(select(Blob))).all()}
+
+            canonical: Dict[str, Path] = {}
+            reclaimed = 0
+            for digest, group in by_digest.items():
+                blob = blobs.get(digest)
+                keep = Path(blob.filepath) if blob and Path(blob.filepath).exists() else sorted(group)[0]
+                canonical[digest] = keep
+                for path in group:
+                    if path == keep or path.samefile(keep):
+                        continue
+                    if dry_run or await asyncio.to_thread(replace_with_link, keep, path):
+                        reclaimed += sizes[digest]
+
+            rows = (await session.exec(select(Media.id, Media.filepath))).all()
+            refs: Dict[str, int] = defaultdict(int)
+            updates = []
+            for media_id, filepath in rows:
+                digest = path_digest.get(str(Path(filepath).resolve()))
+                if digest is None:
+                    continue
+                refs[digest] += 1
+                updates.append({"id": media_id, "sha256": digest, "file_size": sizes[digest]})
+
+            for i in range(0, len(updates), UPDATE_BATCH_SIZE):
+                await session.exec(update(Media), params=updates[i:i + UPDATE_BATCH_SIZE])
+
+            for digest, count in refs.items():
+                blob = blobs.get(digest)
+                if blob is None:
+                    blob = Blob(digest=digest, file_size=sizes[digest], filepath="")
+                    session.add(blob)
+                blob.filepath = str(canonical[digest])
+                blob.refcount = count
+
+            if dry_run:
+                await session.rollback()
+
+    logger.info(
+        "완료: 파일 %d개, 고유 내용 %d개, Media %d건 갱신, 회수 %.1f MiB%s",
+        len(hashed), len(by_digest), len(updates), reclaimed / 2**20,
+        " (dry-run)" if dry_run else "",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="기존 다운로드 파일을 blob 테이블로 백필합니다.")
+    parser.add_argument("--root", type=Path, default=Path(settings.download_dir))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--dry-run", action="store_true", help="DB 와 파일을 변경하지 않고 결과만 출력합니다.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    async def _run():
+        await init_db()
+        await backfill(args.root, args.workers, args.dry_run)
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
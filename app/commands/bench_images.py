@@ -0,0 +1,82 @@
+"""
+이미지 파이프라인의 프로필별 변환 처리량(images/sec)을 측정합니다.
+원본은 변경하지 않고 임시 디렉터리에 결과를 씁니다.
+
+    python -m app.commands.bench_images <이미지 디렉터리> [--profiles media,thumbnail] [--workers 4] [--limit 200]
+"""
+import argparse, asyncio, logging, tempfile, time
+from pathlib import Path
+from typing import List
+
+from core import settings
+from utils.image_pipeline import ImagePipeline, ImageProfile
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def _scan(root: Path, limit: int) -> List[Path]:
+    paths = sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in IMAGE_EXTS)
+    return paths[:limit] if limit > 0 else paths
+
+
+async def bench_profile(
+    pipeline: ImagePipeline, name: str, sources: List[Path], out_dir: Path
+) -> None:
+    pairs = [(src, out_dir / f"{i}.webp") for i, src in enumerate(sources)]
+
+    started = time.perf_counter()
+    results = await pipeline.convert_many(pairs, name)
+    elapsed = time.perf_counter() - started
+
+    converted = [dst for (_, dst), ok in zip(pairs, results) if ok]
+    in_bytes = sum(src.stat().st_size for (src, _), ok in zip(pairs, results) if ok)
+    out_bytes = sum(dst.stat().st_size for dst in converted)
+    profile: ImageProfile = pipeline.profile(name)
+
+    logger.info(
+        "%-10s %7.1f images/sec  %d/%d 성공  %.2fs  크기 %.1f MiB → %.1f MiB (%.0f%%)  "
+        "[quality=%d method=%d max_dimension=%s lossless=%s]",
+        name, len(converted) / elapsed if elapsed else 0.0, len(converted), len(pairs), elapsed,
+        in_bytes / 2**20, out_bytes / 2**20, out_bytes / in_bytes * 100 if in_bytes else 0.0,
+        profile.quality, profile.method, profile.max_dimension, profile.lossless,
+    )
+
+
+async def bench(root: Path, profiles: List[str], workers: int, limit: int) -> None:
+    sources = await asyncio.to_thread(_scan, root, limit)
+    if not sources:
+        logger.warning("측정할 이미지가 없습니다: %s", root)
+        return
+    logger.info("이미지 %d개, workers=%d", len(sources), workers)
+
+    pipeline = ImagePipeline(workers=workers, profiles=settings.image_profiles)
+    try:
+        # 워커 프로세스 기동 시간이 첫 프로필 결과에 섞이지 않도록 미리 한 장 변환합니다.
+        with tempfile.TemporaryDirectory() as warmup:
+            await pipeline.convert(sources[0], Path(warmup) / "warmup.webp", profiles[0])
+
+        for name in profiles:
+            with tempfile.TemporaryDirectory() as out_dir:
+                await bench_profile(pipeline, name, sources, Path(out_dir))
+    finally:
+        pipeline.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="이미지 변환 프로필별 처리량을 측정합니다.")
+    parser.add_argument("root", type=Path, help="원본 이미지 디렉터리")
+    parser.add_argument("--profiles", default=",".join(settings.image_profiles), help="쉼표로 구분한 프로필 이름")
+    parser.add_argument("--workers", type=int, default=settings.image_workers, help="0 이면 스레드에서 변환합니다.")
+    parser.add_argument("--limit", type=int, default=200, help="최대 이미지 수 (0 이면 전부)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    asyncio.run(bench(args.root, profiles, args.workers, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+DB 의 Media 전체로 Meilisearch media 인덱스를 다시 만듭니다.
+
+새 임시 인덱스에 keyset 배치로 문서를 채운 뒤 live 인덱스와 원자적으로 교체하므로
+재색인 중에도 검색은 기존 인덱스로 계속 동작합니다.
+시작 시점의 outbox 위치를 기록해 두고, 교체 뒤 그 이후의 outbox 행(삭제 포함)을 새 인덱스에 다시 반영합니다.
+
+    python -m app.commands.reindex [--batch-size 1000] [--concurrency 4]
+"""
+import argparse, asyncio, logging, time
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List, Set
+
+from meilisearch_python_async.index import Index
+from meilisearch_python_async.task import wait_for_task
+from sqlmodel import select
+
+from app.models.media import Media
+from app.repositories.search_outbox_repository import SearchOutboxRepository
+from app.services.search_index_service import SearchIndexService
+from core import settings
+from core.database import AsyncSessionLocal, init_db
+from core.meili import MEDIA_INDEX_NAME, close_meili, configure_media_index, get_client
+from core.search_sync import apply_outbox_rows
+from utils.app_utils import now_kst
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CONCURRENCY = 4
+
+
+async def iter_document_batches(batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Media 를 id 기준 keyset 페이지로 읽어 문서 배치를 하나씩 돌려줍니다.
+    배치마다 세션을 비워 테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    last_id = 0
+    async with AsyncSessionLocal() as session:
+        while True:
+            stmt = SearchIndexService.with_relations(
+                select(Media).where(Media.id > last_id).order_by(Media.id).limit(batch_size)
+            )
+
+            medias = (await session.exec(stmt)).all()
+            if not medias:
+                return
+
+            last_id = medias[-1].id
+            documents = [SearchIndexService.build_document(m) for m in medias]
+            session.expunge_all()
+            yield documents
+
+
+async def push_documents(
+    index: Index, batches: AsyncIterator[List[Dict[str, Any]]], concurrency: int
+) -> int:
+    """
+    배치를 최대 concurrency 개까지 동시에 보내고, 각 배치의 Meilisearch 작업이 끝날 때까지 기다립니다.
+    """
+    client = get_client()
+    slots = asyncio.Semaphore(concurrency)
+    pending: Set[asyncio.Task] = set()
+    errors: List[BaseException] = []
+    total = 0
+
+    async def _send(documents: List[Dict[str, Any]]) -> None:
+        try:
+            task = await index.add_documents(documents)
+            await wait_for_task(client, task.task_uid, timeout_in_ms=None, raise_for_status=True)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            slots.release()
+
+    try:
+        async for documents in batches:
+            await slots.acquire()
+            if errors:
+                slots.release()
+                break
+            task = asyncio.create_task(_send(documents))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            total += len(documents)
+            logger.info("%d건 전송", total)
+
+        await asyncio.gather(*pending)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if errors:
+        raise errors[0]
+    return total
+
+
+async def replay_outbox(after_id: int, batch_size: int) -> int:
+    """
+    after_id 뒤의 outbox 행을 반영 여부와 관계없이 live 인덱스에 다시 반영합니다.
+    재색인 도중의 변경은 flusher 가 교체 전의 인덱스에 반영했으므로 새 인덱스에는 빠져 있습니다.
+    """
+    replayed = 0
+    async with AsyncSessionLocal() as session:
+        repo = SearchOutboxRepository(session)
+        while True:
+            rows = await repo.fetch_since(after_id, batch_size)
+            if not rows:
+                return replayed
+            await apply_outbox_rows(rows, session)
+            after_id = rows[-1].id
+            replayed += len(rows)
+            session.expunge_all()
+
+
+async def reindex(batch_size: int, concurrency: int) -> None:
+    client = get_client()
+    started_at = now_kst()
+    tmp_uid = f"{MEDIA_INDEX_NAME}_{int(time.time())}"
+    # 이 위치 이후의 outbox 행은 문서 배치를 읽는 도중이나 그 뒤에 생긴 변경입니다.
+    async with AsyncSessionLocal() as session:
+        high_water = await SearchOutboxRepository(session).max_id()
+
+    index = await configure_media_index(tmp_uid)
+    await configure_media_index(MEDIA_INDEX_NAME)
+    logger.info("임시 인덱스 %s 에 재색인 시작 (batch=%d, concurrency=%d)", tmp_uid, batch_size, concurrency)
+
+    try:
+        total = await push_documents(index, iter_document_batches(batch_size), concurrency)
+        task = await client.swap_indexes([(MEDIA_INDEX_NAME, tmp_uid)])
+        await wait_for_task(client, task.task_uid, timeout_in_ms=None, raise_for_status=True)
+    finally:
+        # 교체에 성공했다면 tmp_uid 는 이전 live 인덱스를 가리킵니다.
+        await client.delete_index_if_exists(tmp_uid)
+
+    if now_kst() - started_at > timedelta(seconds=settings.search_outbox_retention):
+        logger.warning(
+            "재색인이 outbox 보존 기간(%.0f초)보다 오래 걸려 도중의 변경 일부가 빠졌을 수 있습니다.",
+            settings.search_outbox_retention,
+        )
+    changed = await replay_outbox(high_water, batch_size)
+    logger.info("완료: %d건 색인, 재색인 중 변경 %d건 재반영", total, changed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Media 전체로 Meilisearch 인덱스를 다시 만듭니다.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    async def _run():
+        await init_db()
+        try:
+            await reindex(max(1, args.batch_size), max(1, args.concurrency))
+        finally:
+            await close_meili()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
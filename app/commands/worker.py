@@ -0,0 +1,86 @@
+"""
+API 서버와 별도 프로세스에서 download_job 대기열을 실행하는 워커.
+
+API 는 DOWNLOAD_EMBEDDED_WORKERS=false 로 두고 작업 예약만 하며, 진행 상황은 download_job.progress 를
+통해 API 의 조회/SSE 로 전달됩니다. 플랫폼별로 프로세스를 나눠 따로 늘릴 수 있습니다.
+
+    python -m app.commands.worker [--concurrency 2] [--platforms instagram,youtube] [--poll-interval 5]
+"""
+import argparse, asyncio, logging, signal
+from typing import List, Optional
+
+from app.services.registry import SERVICE_BY_PLATFORM
+from core import settings
+from core.database import init_db
+from core.http import close_http_client, get_http_client
+from core.images import shutdown_image_pipeline
+from core.instagram import close_instaloader_pool
+from core.progress import ProgressBroker
+from core.tasks import DownloadWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker(concurrency: int, platforms: Optional[List[str]], poll_interval: float) -> None:
+    await init_db()
+
+    broker = ProgressBroker(persist_interval=settings.download_progress_persist_interval)
+    pool = DownloadWorkerPool(
+        SERVICE_BY_PLATFORM,
+        concurrency=concurrency,
+        poll_interval=poll_interval,
+        broker=broker,
+        platforms=platforms,
+        lease_seconds=settings.download_lease_seconds,
+        heartbeat_interval=settings.download_heartbeat_interval,
+        max_attempts=settings.download_max_attempts,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    get_http_client()
+    await broker.start()
+    await pool.start()
+    logger.info(
+        "다운로드 워커 시작: concurrency=%d platforms=%s",
+        pool.concurrency, ",".join(pool.platforms or ["*"]),
+    )
+    try:
+        await stop.wait()
+    finally:
+        logger.info("다운로드 워커를 종료합니다.")
+        await pool.stop()
+        await broker.stop()
+        await close_http_client()
+        shutdown_image_pipeline()
+        close_instaloader_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="download_job 대기열의 작업을 실행합니다.")
+    parser.add_argument("--concurrency", type=int, default=settings.download_concurrency)
+    parser.add_argument(
+        "--platforms",
+        default=None,
+        help=f"쉼표로 구분한 플랫폼 이름 (기본: 전체, 지원: {','.join(sorted(SERVICE_BY_PLATFORM))})",
+    )
+    parser.add_argument("--poll-interval", type=float, default=settings.download_poll_interval)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    platforms = None
+    if args.platforms:
+        platforms = [p.strip().lower() for p in args.platforms.split(",") if p.strip()]
+        unknown = set(platforms) - SERVICE_BY_PLATFORM.keys()
+        if unknown:
+            parser.error(f"지원하지 않는 플랫폼입니다: {', '.join(sorted(unknown))}")
+
+    asyncio.run(run_worker(max(1, args.concurrency), platforms, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field, BigInteger, Column
+from utils.app_utils import now_kst
+
+
+class Blob(SQLModel, table=True):
+    """sha256 으로 식별되는 실제 파일. 같은 내용의 Media 는 하나의 Blob 을 공유합니다."""
+    __tablename__ = "blob"
+
+    digest: str = Field(primary_key=True)
+    filepath: str = Field(nullable=False)
+    file_size: Optional[int] = Field(default=None, sa_column=Column(BigInteger))
+    refcount: int = Field(default=1, nullable=False)
+    created_at: datetime = Field(default_factory=now_kst)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from sqlmodel import SQLModel, Field, Column, Index, JSON
+from utils.app_utils import now_kst
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class DownloadJob(SQLModel, table=True):
+    __tablename__ = "download_job"
+    __table_args__ = (
+        Index("ix_download_job_claim", "status", "priority", "id"),
+        Index("ix_download_job_lease", "status", "lease_expires_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    url: str = Field(nullable=False)
+    canonical_url: Optional[str] = Field(default=None, index=True, nullable=True)
+    platform: str = Field(nullable=False, index=True)
+    status: str = Field(default=JobStatus.queued.value, nullable=False)
+    priority: int = Field(default=0, nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    # 작업을 실행 중인 워커와 임대 만료 시각. 만료되면 다른 워커가 다시 가져갑니다.
+    worker_id: Optional[str] = Field(default=None, index=True, nullable=True)
+    lease_expires_at: Optional[datetime] = Field(default=None, nullable=True)
+    error: Optional[str] = Field(default=None, nullable=True)
+    # 실행 중인 작업의 최근 진행 상황. 워커가 다른 프로세스에서 실행될 때 API 가 읽습니다.
+    progress: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    created_at: datetime = Field(default_factory=now_kst)
+    updated_at: datetime = Field(default_factory=now_kst)
+    started_at: Optional[datetime] = Field(default=None, nullable=True)
+    finished_at: Optional[datetime] = Field(default=None, nullable=True)
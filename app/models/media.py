@@ -1,10 +1,14 @@
-from sqlmodel import SQLModel, Field, BigInteger, Column, Relationship
+from sqlmodel import SQLModel, Field, BigInteger, Column, Index, Relationship
 from typing import Optional, List
 from datetime import datetime
 from utils.app_utils import now_kst
 
 class MediaTag(SQLModel, table=True):
     __tablename__ = 'media_tag'
+    # 기본 키는 (media_id, tag_id) 순서라 태그별 미디어 목록에는 역순 인덱스가 필요합니다.
+    __table_args__ = (
+        Index("ix_media_tag_tag_media", "tag_id", "media_id"),
+    )
     
     media_id: Optional[int] = Field(default=None, foreign_key="media.id", primary_key=True)
     tag_id: Optional[int] = Field(default=None, foreign_key="tag.id", primary_key=True)
@@ -12,19 +16,75 @@ class MediaTag(SQLModel, table=True):
 
 class Media(SQLModel, table=True):
     __tablename__ = "media"
+    __table_args__ = (
+        Index("ix_media_owner_source", "owner_id", "source_id"),
+        Index("ix_media_platform_cursor", "platform_id", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     title: str
     filepath: str
     file_size: Optional[int] = Field(default=None, sa_column=Column(BigInteger))
+    sha256: Optional[str] = Field(default=None, index=True, nullable=True)
     thumbnail_path: str = Field(default=None, nullable=True)
-    platform_id: Optional[int] = Field(index=True, foreign_key="platform.id", nullable=False)
+    # platform_id 조회는 ix_media_platform_cursor (platform_id, id) 가 맡습니다.
+    platform_id: Optional[int] = Field(foreign_key="platform.id", nullable=False)
     owner_id: Optional[int] = Field(foreign_key="profile.owner_id", nullable=True)
     url_id: Optional[int] = Field(default=None, foreign_key="url.id", index=True, nullable=True)
+    # 플랫폼의 원본 게시물 식별자 (Instagram shortcode 등). 프로필 증분 동기화에 사용합니다.
+    source_id: Optional[str] = Field(default=None, nullable=True)
     created_at: datetime = Field(default_factory=now_kst)
-    updated_at: datetime = Field(default_factory=now_kst)
+    # export 의 updated_since 증분 조회에 사용합니다.
+    updated_at: datetime = Field(default_factory=now_kst, index=True)
     
     platform: Optional["Platform"] = Relationship(back_populates="medias") # type: ignore
     url: Optional["Url"] = Relationship(back_populates="medias") # type: ignore
     profile: Optional["Profile"] = Relationship(back_populates="medias") # type: ignore
-    tags: List["Tag"] = Relationship(back_populates="media", link_model=MediaTag) # type: ignore
\ No newline at end of file
+    tags: List["Tag"] = Relationship(back_populates="media", link_model=MediaTag) # type: ignore
+
+class TagRead(SQLModel):
+    id: int
+    name: str
+
+
+class PlatformRead(SQLModel):
+    id: int
+    name: str
+
+
+class ProfileRead(SQLModel):
+    owner_id: int
+    owner_name: str
+
+
+class MediaRead(SQLModel):
+    """API 응답용 Media. 관계는 포함하지 않습니다."""
+    id: int
+    title: str
+    filepath: str
+    file_size: Optional[int] = None
+    sha256: Optional[str] = None
+    thumbnail_path: Optional[str] = None
+    platform_id: int
+    owner_id: Optional[int] = None
+    url_id: Optional[int] = None
+    source_id: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class MediaReadWithRelations(MediaRead):
+    """tags/platform/profile 을 함께 담은 Media. 관계는 미리 eager load 되어 있어야 합니다."""
+    platform: Optional[PlatformRead] = None
+    profile: Optional[ProfileRead] = None
+    tags: List[TagRead] = []
+
+
+class MediaReadExpanded(MediaRead):
+    """
+    expand 로 요청한 관계만 채운 Media. 요청하지 않은 관계는 응답에서 빠집니다.
+    (response_model_exclude_unset 과 함께 사용)
+    """
+    platform: Optional[PlatformRead] = None
+    profile: Optional[ProfileRead] = None
+    tags: Optional[List[TagRead]] = None
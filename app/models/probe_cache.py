@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Any, Dict
+from sqlmodel import SQLModel, Field, Column, JSON
+from utils.app_utils import now_kst
+
+
+class ProbeCache(SQLModel, table=True):
+    """yt-dlp 추출 결과(info dict) 캐시. canonical URL 당 한 행이며 expires_at 이후에는 쓰지 않습니다."""
+    __tablename__ = "probe_cache"
+
+    canonical_url: str = Field(primary_key=True)
+    url: str = Field(nullable=False)
+    platform: str = Field(nullable=False)
+    info: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(default_factory=now_kst)
+    expires_at: datetime = Field(nullable=False, index=True)
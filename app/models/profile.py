@@ -13,5 +13,9 @@ class Profile(SQLModel, table=True):
 
     medias: List[Media] = Relationship(back_populates="profile")
 
+    # True 면 스케줄러가 INSTAGRAM_SYNC_INTERVAL 마다 새 게시물을 동기화합니다.
+    followed: bool = Field(default=False, index=True)
+
     updated_at: datetime = Field(default_factory=now_kst)
-    last_update: datetime = Field(default=None)
\ No newline at end of file
+    # 마지막으로 게시물 동기화에 성공한 시각
+    last_update: Optional[datetime] = Field(default=None, nullable=True)
\ No newline at end of file
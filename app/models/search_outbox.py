@@ -0,0 +1,24 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from utils.app_utils import now_kst
+
+
+class OutboxOp(str, Enum):
+    upsert = "upsert"
+    delete = "delete"
+
+
+class SearchOutbox(SQLModel, table=True):
+    """
+    Meilisearch 에 반영할 Media 변경 내역. 변경과 같은 트랜잭션에서 기록됩니다.
+    반영한 행은 processed_at 을 채워 보존 기간 동안 남겨 두며, 재색인이 그동안의 변경을 새 인덱스에 다시 반영합니다.
+    """
+    __tablename__ = "search_outbox"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    media_id: int = Field(nullable=False, index=True)
+    op: str = Field(default=OutboxOp.upsert.value, nullable=False)
+    created_at: datetime = Field(default_factory=now_kst)
+    processed_at: Optional[datetime] = Field(default=None, index=True, nullable=True)
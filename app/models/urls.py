@@ -7,5 +7,6 @@ class Url(SQLModel, table=True):
 
     id: Optional[int] = Field(default=None, primary_key=True)
     url: str = Field(nullable=False, unique=True)
+    canonical: Optional[str] = Field(default=None, unique=True, index=True, nullable=True)
 
     medias: List["Media"] = Relationship(back_populates="url")
\ No newline at end of file
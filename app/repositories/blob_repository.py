@@ -0,0 +1,41 @@
+import asyncio
+from pathlib import Path
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.blob import Blob
+from utils.file_utils import replace_with_link
+
+
+class BlobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def store(self, path: Path, digest: str, file_size: int | None) -> Path:
+        """
+        path 에 저장된 파일을 content-addressed blob 으로 등록합니다.
+
+        같은 digest 의 blob 이 이미 있으면 path 를 기존 파일의 하드링크로 바꾸고,
+        하드링크를 만들 수 없으면 path 를 지우고 기존 파일을 공유합니다.
+        반환값은 Media.filepath 로 저장할 경로입니다.
+        """
+        blob = await self.session.get(Blob, digest)
+        if blob is None:
+            try:
+                async with self.session.begin_nested():
+                    self.session.add(Blob(digest=digest, filepath=str(path), file_size=file_size))
+                return path
+            except IntegrityError:
+                # 다른 작업이 같은 내용을 먼저 등록한 경우
+                blob = await self.session.get(Blob, digest, populate_existing=True)
+
+        blob.refcount += 1
+        existing = Path(blob.filepath)
+        if not existing.exists():
+            blob.filepath = str(path)
+            return path
+
+        if await asyncio.to_thread(replace_with_link, existing, path):
+            return path
+
+        path.unlink(missing_ok=True)
+        return existing
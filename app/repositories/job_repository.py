@@ -0,0 +1,245 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.job import DownloadJob, JobStatus
+from core.canonical import canonicalize_url
+from utils.app_utils import now_kst
+
+ACTIVE_STATUSES = (JobStatus.queued.value, JobStatus.running.value)
+
+
+class DownloadJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, *, url: str, platform: str, priority: int = 0) -> DownloadJob:
+        job = DownloadJob(
+            url=url,
+            canonical_url=canonicalize_url(url),
+            platform=platform,
+            priority=priority,
+        )
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def enqueue_many(
+        self, entries: Sequence[tuple[str, str]], *, priority: int = 0
+    ) -> list[DownloadJob]:
+        """
+        (url, platform) 목록을 한 번의 flush 로 대기열에 넣습니다.
+        """
+        jobs = [
+            DownloadJob(
+                url=url,
+                canonical_url=canonicalize_url(url),
+                platform=platform,
+                priority=priority,
+            )
+            for url, platform in entries
+        ]
+        self.session.add_all(jobs)
+        await self.session.flush()
+        return jobs
+
+    async def get(self, job_id: int) -> DownloadJob | None:
+        return await self.session.get(DownloadJob, job_id)
+
+    async def find_active(self, url: str) -> DownloadJob | None:
+        stmt = select(DownloadJob).where(
+            DownloadJob.canonical_url == canonicalize_url(url),
+            DownloadJob.status.in_(ACTIVE_STATUSES),
+        )
+        return (await self.session.exec(stmt)).first()
+
+    async def find_active_keys(self, keys: Sequence[str]) -> set[str]:
+        if not keys:
+            return set()
+        stmt = select(DownloadJob.canonical_url).where(
+            DownloadJob.canonical_url.in_(list(keys)),
+            DownloadJob.status.in_(ACTIVE_STATUSES),
+        )
+        return set((await self.session.exec(stmt)).all())
+
+    async def find_recent_keys(self, keys: Sequence[str], since: datetime) -> set[str]:
+        """
+        keys 중 진행 중이거나 since 이후에 예약된 작업이 있는 canonical key 집합을 반환합니다.
+        """
+        if not keys:
+            return set()
+        stmt = select(DownloadJob.canonical_url).where(
+            DownloadJob.canonical_url.in_(list(keys)),
+            DownloadJob.status.in_(ACTIVE_STATUSES) | (DownloadJob.created_at >= since),
+        )
+        return set((await self.session.exec(stmt)).all())
+
+    async def claim_next(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        platforms: Sequence[str] | None = None,
+    ) -> DownloadJob | None:
+        """
+        대기 중인 작업 중 우선순위가 가장 높고 먼저 들어온 작업을 running 으로 전환하고
+        worker_id 에게 lease_seconds 동안 임대합니다. platforms 를 주면 해당 플랫폼의 작업만 가져옵니다.
+
+        PostgreSQL 은 FOR UPDATE SKIP LOCKED 로 여러 노드가 서로 기다리지 않고 다른 행을 가져가며,
+        SQLite 는 조건부 UPDATE 로 한 노드 안에서만 중복을 막습니다.
+        다른 워커가 먼저 가져간 경우 None 을 반환합니다.
+        """
+        candidate = (
+            select(DownloadJob.id)
+            .where(DownloadJob.status == JobStatus.queued.value)
+            .order_by(DownloadJob.priority.desc(), DownloadJob.id)
+            .limit(1)
+        )
+        if platforms is not None:
+            candidate = candidate.where(DownloadJob.platform.in_(list(platforms)))
+
+        now = now_kst()
+        claim = update(DownloadJob).values(
+            status=JobStatus.running.value,
+            worker_id=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=DownloadJob.attempts + 1,
+            started_at=now,
+            updated_at=now,
+        )
+
+        if self.session.bind.dialect.name == "postgresql":
+            locked = candidate.with_for_update(skip_locked=True).scalar_subquery()
+            stmt = claim.where(DownloadJob.id == locked).returning(DownloadJob.id)
+            job_id = (await self.session.exec(stmt)).scalar_one_or_none()
+            if job_id is None:
+                return None
+        else:
+            job_id = (await self.session.exec(candidate)).first()
+            if job_id is None:
+                return None
+            result = await self.session.exec(
+                claim.where(DownloadJob.id == job_id, DownloadJob.status == JobStatus.queued.value)
+            )
+            if result.rowcount != 1:
+                return None
+        return await self.session.get(DownloadJob, job_id, populate_existing=True)
+
+    async def heartbeat(
+        self, worker_id: str, job_ids: Sequence[int], lease_seconds: float
+    ) -> set[int]:
+        """
+        worker_id 가 실행 중인 작업의 임대를 연장하고, 아직 임대를 가진 작업 id 를 반환합니다.
+        반환되지 않은 작업은 임대가 만료되어 다른 워커에게 넘어간 것입니다.
+        """
+        if not job_ids:
+            return set()
+        now = now_kst()
+        stmt = (
+            update(DownloadJob)
+            .where(
+                DownloadJob.id.in_(list(job_ids)),
+                DownloadJob.worker_id == worker_id,
+                DownloadJob.status == JobStatus.running.value,
+            )
+            .values(lease_expires_at=now + timedelta(seconds=lease_seconds), updated_at=now)
+            .returning(DownloadJob.id)
+        )
+        return set((await self.session.exec(stmt)).scalars().all())
+
+    async def requeue_expired(self, max_attempts: int) -> tuple[int, int]:
+        """
+        임대가 만료된 running 작업을 다시 대기열에 넣습니다. 노드가 죽거나 멈춘 경우입니다.
+        이미 max_attempts 번 실행한 작업은 반복해서 노드를 멈추게 하지 않도록 실패로 처리합니다.
+        (다시 넣은 수, 실패 처리한 수) 를 반환합니다.
+        """
+        now = now_kst()
+        expired = (
+            DownloadJob.status == JobStatus.running.value,
+            DownloadJob.lease_expires_at.is_(None) | (DownloadJob.lease_expires_at < now),
+        )
+        requeued = await self.session.exec(
+            update(DownloadJob)
+            .where(*expired, DownloadJob.attempts < max_attempts)
+            .values(
+                status=JobStatus.queued.value,
+                worker_id=None,
+                lease_expires_at=None,
+                progress=None,
+                updated_at=now,
+            )
+        )
+        failed = await self.session.exec(
+            update(DownloadJob)
+            .where(*expired, DownloadJob.attempts >= max_attempts)
+            .values(
+                status=JobStatus.failed.value,
+                error="작업 임대가 만료되었습니다. (최대 시도 횟수 초과)",
+                worker_id=None,
+                lease_expires_at=None,
+                progress=None,
+                finished_at=now,
+                updated_at=now,
+            )
+        )
+        return requeued.rowcount, failed.rowcount
+
+    async def release(self, worker_id: str) -> int:
+        """
+        워커가 종료될 때 실행 중이던 작업을 바로 대기열에 돌려놓습니다.
+        """
+        now = now_kst()
+        result = await self.session.exec(
+            update(DownloadJob)
+            .where(DownloadJob.worker_id == worker_id, DownloadJob.status == JobStatus.running.value)
+            .values(
+                status=JobStatus.queued.value,
+                worker_id=None,
+                lease_expires_at=None,
+                progress=None,
+                updated_at=now,
+            )
+        )
+        return result.rowcount
+
+    async def mark_done(self, job_id: int, worker_id: str) -> bool:
+        return await self._finish(job_id, worker_id, JobStatus.done, None)
+
+    async def mark_failed(self, job_id: int, worker_id: str, error: str) -> bool:
+        return await self._finish(job_id, worker_id, JobStatus.failed, error)
+
+    async def save_progress(self, progress: dict[int, dict]) -> None:
+        """
+        실행 중인 작업의 진행 상황을 저장합니다. 이미 끝난 작업은 건드리지 않습니다.
+        """
+        for job_id, event in progress.items():
+            await self.session.exec(
+                update(DownloadJob)
+                .where(DownloadJob.id == job_id, DownloadJob.status == JobStatus.running.value)
+                .values(progress=event)
+            )
+
+    async def _finish(
+        self, job_id: int, worker_id: str, status: JobStatus, error: str | None
+    ) -> bool:
+        """
+        임대를 가진 워커일 때만 결과를 기록합니다. 임대를 잃었으면 False 를 반환합니다.
+        """
+        now = now_kst()
+        result = await self.session.exec(
+            update(DownloadJob)
+            .where(
+                DownloadJob.id == job_id,
+                DownloadJob.worker_id == worker_id,
+                DownloadJob.status == JobStatus.running.value,
+            )
+            .values(
+                status=status.value,
+                error=error,
+                worker_id=None,
+                lease_expires_at=None,
+                progress=None,
+                finished_at=now,
+                updated_at=now,
+            )
+        )
+        return result.rowcount == 1
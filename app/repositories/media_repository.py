@@ -1,8 +1,38 @@
+import asyncio
 from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.media import Media
+from app.repositories.blob_repository import BlobRepository
 from downloader.models import FileInfo
 from utils.app_utils import now_kst
+from utils.file_utils import hash_file
+
+
+def _hash_if_exists(path: Path) -> tuple[int | None, str | None]:
+    if not path.is_file():
+        return None, None
+    return hash_file(path)
+
+
+def apply_media_filters(
+    stmt,
+    owner_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+):
+    """
+    미디어 목록 조회에 공통으로 쓰는 소유자/생성일 범위 조건을 붙입니다.
+    created_from 은 포함, created_to 는 제외합니다.
+    """
+    if owner_id is not None:
+        stmt = stmt.where(Media.owner_id == owner_id)
+    if created_from is not None:
+        stmt = stmt.where(Media.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Media.created_at < created_to)
+    return stmt
 
 class MediaRepository:
     def __init__(self, session: AsyncSession):
@@ -30,17 +60,28 @@ class MediaRepository:
             "caption": caption
         }.items() if v is not None}
         
-        objs = [
-            Media(
-                **common,
-                **optional,
-                filepath=str(f.filepath),
-                filename=f.filename,
-                filesize=f.filesize,
-                title=caption or f.filename,
+        hashes = await asyncio.gather(
+            *(asyncio.to_thread(_hash_if_exists, Path(f.filepath)) for f in files)
+        )
+        blobs = BlobRepository(self.session)
+        
+        objs = []
+        for f, (file_size, digest) in zip(files, hashes):
+            filepath = Path(f.filepath)
+            if digest is not None:
+                filepath = await blobs.store(filepath, digest, file_size)
+            objs.append(
+                Media(
+                    **common,
+                    **optional,
+                    filepath=str(filepath),
+                    filename=f.filename,
+                    file_size=file_size or f.filesize,
+                    sha256=digest,
+                    source_id=f.source_id,
+                    title=caption or f.filename,
+                )
             )
-            for f in files
-        ]
         self.session.add_all(objs)
         
         await self.session.flush()
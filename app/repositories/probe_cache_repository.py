@@ -0,0 +1,39 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from sqlmodel import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.probe_cache import ProbeCache
+from core.canonical import canonicalize_url
+from utils.app_utils import now_kst
+
+
+class ProbeCacheRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_fresh(self, url: str) -> Optional[ProbeCache]:
+        row = await self.session.get(ProbeCache, canonicalize_url(url))
+        if row is None or row.expires_at <= now_kst():
+            return None
+        return row
+
+    async def put(
+        self, *, url: str, platform: str, info: Dict[str, Any], ttl: float
+    ) -> ProbeCache:
+        now = now_kst()
+        row = await self.session.merge(ProbeCache(
+            canonical_url=canonicalize_url(url),
+            url=url,
+            platform=platform,
+            info=info,
+            created_at=now,
+            expires_at=now + timedelta(seconds=ttl),
+        ))
+        await self.session.flush()
+        return row
+
+    async def purge_expired(self) -> int:
+        result = await self.session.exec(
+            delete(ProbeCache).where(ProbeCache.expires_at <= now_kst())
+        )
+        return result.rowcount
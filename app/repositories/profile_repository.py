@@ -0,0 +1,63 @@
+from collections.abc import Sequence
+from datetime import datetime
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.media import Media
+from app.models.profile import Profile
+from utils.app_utils import now_kst
+
+
+class ProfileRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, owner_id: int) -> Profile | None:
+        return await self.session.get(Profile, owner_id)
+
+    async def list(self, page: int, size: int) -> Sequence[Profile]:
+        stmt = select(Profile).order_by(Profile.owner_id).offset((page - 1) * size).limit(size)
+        return (await self.session.exec(stmt)).all()
+
+    async def upsert(self, owner_id: int, owner_name: str) -> Profile:
+        """
+        프로필이 없으면 만들고, 사용자 이름이 바뀌었으면 갱신합니다.
+        """
+        profile = await self.session.get(Profile, owner_id)
+        if profile is None:
+            profile = Profile(owner_id=owner_id, owner_name=owner_name)
+            self.session.add(profile)
+        elif profile.owner_name != owner_name:
+            profile.owner_name = owner_name
+            profile.updated_at = now_kst()
+        await self.session.flush()
+        return profile
+
+    async def known_source_ids(self, owner_name: str) -> set[str]:
+        """
+        해당 사용자의 이미 저장된 게시물 식별자(shortcode) 집합을 반환합니다.
+        """
+        stmt = (
+            select(Media.source_id)
+            .join(Profile, Profile.owner_id == Media.owner_id)
+            .where(
+                func.lower(Profile.owner_name) == owner_name.lower(),
+                Media.source_id.is_not(None),
+            )
+            .distinct()
+        )
+        return set((await self.session.exec(stmt)).all())
+
+    async def due_for_sync(self, before: datetime, limit: int) -> Sequence[Profile]:
+        """
+        팔로우 중이면서 before 이후로 동기화되지 않은 프로필을 오래된 순으로 반환합니다.
+        """
+        stmt = (
+            select(Profile)
+            .where(
+                Profile.followed.is_(True),
+                (Profile.last_update.is_(None)) | (Profile.last_update < before),
+            )
+            .order_by(Profile.last_update.is_(None).desc(), Profile.last_update, Profile.owner_id)
+            .limit(limit)
+        )
+        return (await self.session.exec(stmt)).all()
@@ -0,0 +1,55 @@
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from sqlmodel import delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.search_outbox import OutboxOp, SearchOutbox
+from utils.app_utils import now_kst
+
+
+class SearchOutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def enqueue(self, media_ids: Iterable[int], op: OutboxOp = OutboxOp.upsert) -> None:
+        """
+        현재 트랜잭션에 outbox 행을 추가합니다. 커밋은 호출한 쪽의 unit_of_work 가 담당합니다.
+        """
+        self.session.add_all(
+            SearchOutbox(media_id=media_id, op=op.value) for media_id in dict.fromkeys(media_ids)
+        )
+
+    async def fetch_batch(self, limit: int) -> Sequence[SearchOutbox]:
+        stmt = (
+            select(SearchOutbox)
+            .where(SearchOutbox.processed_at.is_(None))
+            .order_by(SearchOutbox.id)
+            .limit(limit)
+        )
+        return (await self.session.exec(stmt)).all()
+
+    async def fetch_since(self, after_id: int, limit: int) -> Sequence[SearchOutbox]:
+        """
+        after_id 보다 뒤의 행을 반영 여부와 관계없이 id 순으로 가져옵니다.
+        """
+        stmt = (
+            select(SearchOutbox)
+            .where(SearchOutbox.id > after_id)
+            .order_by(SearchOutbox.id)
+            .limit(limit)
+        )
+        return (await self.session.exec(stmt)).all()
+
+    async def max_id(self) -> int:
+        return (await self.session.exec(select(func.max(SearchOutbox.id)))).one() or 0
+
+    async def mark_processed(self, ids: Sequence[int]) -> None:
+        if ids:
+            await self.session.exec(
+                update(SearchOutbox).where(SearchOutbox.id.in_(ids)).values(processed_at=now_kst())
+            )
+
+    async def purge_processed(self, before: datetime) -> int:
+        result = await self.session.exec(
+            delete(SearchOutbox).where(SearchOutbox.processed_at < before)
+        )
+        return result.rowcount
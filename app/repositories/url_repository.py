@@ -0,0 +1,61 @@
+from collections.abc import Sequence
+from sqlmodel import delete, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.urls import Url
+from core.canonical import canonicalize_url
+
+
+class UrlRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def find(self, url: str) -> Url | None:
+        """
+        canonical key 가 같거나 원본 문자열이 같은 Url 을 찾습니다.
+        """
+        stmt = select(Url).where(
+            or_(Url.canonical == canonicalize_url(url), Url.url == url)
+        )
+        return (await self.session.exec(stmt)).first()
+
+    async def find_existing_keys(self, urls: Sequence[str]) -> set[str]:
+        """
+        urls 중 이미 저장된 URL 의 canonical key 집합을 한 번의 IN 쿼리로 조회합니다.
+        """
+        if not urls:
+            return set()
+        keys = {canonicalize_url(url) for url in urls}
+        stmt = select(Url.url, Url.canonical).where(
+            or_(Url.canonical.in_(keys), Url.url.in_(list(urls)))
+        )
+        rows = (await self.session.exec(stmt)).all()
+        return {canonical or canonicalize_url(url) for url, canonical in rows}
+
+    async def add(self, url: str) -> Url:
+        url_obj = Url(url=url, canonical=canonicalize_url(url))
+        self.session.add(url_obj)
+        await self.session.flush()
+        return url_obj
+
+    async def remove(self, url_id: int) -> None:
+        await self.session.exec(delete(Url).where(Url.id == url_id))
+
+    async def backfill_canonical(self) -> int:
+        """
+        canonical 이 비어 있는 기존 Url 을 채웁니다. 다른 Url 과 key 가 겹치면 비워 둡니다.
+        """
+        taken = set((await self.session.exec(
+            select(Url.canonical).where(Url.canonical.is_not(None))
+        )).all())
+        missing = (await self.session.exec(select(Url).where(Url.canonical.is_(None)))).all()
+
+        filled = 0
+        for url_obj in missing:
+            key = canonicalize_url(url_obj.url)
+            if key in taken:
+                continue
+            url_obj.canonical = key
+            taken.add(key)
+            filled += 1
+        await self.session.flush()
+        return filled
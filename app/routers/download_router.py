@@ -1,54 +1,299 @@
-import re
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
-from sqlmodel import select
+import asyncio, json
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from pydantic import BaseModel
-import uuid
-
-from app.models.urls import Url
-from app.services.instagram_service import InstagramService
-from app.services.youtube_services import YoutubeService
-from core.database import get_session
-from core.tasks import schedule_download
+from pydantic import BaseModel, Field
+
+from app.models.job import DownloadJob
+from app.repositories.job_repository import DownloadJobRepository
+from app.repositories.url_repository import UrlRepository
+from app.services.probe_service import ProbeService
+from app.services.registry import resolve_service
+from core.canonical import canonicalize_url
+from core.database import AsyncSessionLocal, get_session
+from core.progress import ProgressBroker, TERMINAL_STATUSES
+from core.ratelimit import get_limiter
+from core.tasks import DownloadWorkerPool
+from core.unit_of_work import unit_of_work
 from utils.domain_extractor import DomainExtractor
 
 router = APIRouter(prefix="/api/download", tags=["download"])
 
-URL_SERVICE_MAP = {
-    r"^(?:instagram|instagr)(?:\.(?:com|am))?$": InstagramService,
-    r"^(?:youtube|youtu)(?:\.(?:com|be))?$"   : YoutubeService,
-}
+SSE_KEEPALIVE_SECONDS = 15
+# 워커가 다른 프로세스에서 실행될 때 DB 에 저장된 진행 상황을 확인하는 주기
+SSE_POLL_SECONDS = 2.0
 
 
 async def get_extractor(request: Request) -> DomainExtractor:
     return request.app.state.tld_extractor
 
+async def get_download_pool(request: Request) -> DownloadWorkerPool:
+    return request.app.state.download_pool
+
+async def get_progress_broker(request: Request) -> ProgressBroker:
+    return request.app.state.progress_broker
+
 class DownloadRequest(BaseModel):
     url: str
+    priority: int = 0
+
+class BatchDownloadRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1, max_length=1000)
+    priority: int = 0
+
+class BatchDownloadItem(BaseModel):
+    url: str
+    status: Literal["queued", "duplicate", "unsupported"]
+    id: Optional[str] = None
+
+class ProbeRequest(BaseModel):
+    url: str
+    refresh: bool = False
+
+class ProbeRead(BaseModel):
+    url: str
+    canonical_url: str
+    platform: str
+    title: Optional[str] = None
+    duration: Optional[float] = None
+    filesize: Optional[int] = None
+    thumbnail: Optional[str] = None
+    uploader: Optional[str] = None
+    webpage_url: Optional[str] = None
+    cached: bool
+    expires_at: datetime
+
+class DownloadJobRead(BaseModel):
+    id: int
+    url: str
+    platform: str
+    status: str
+    priority: int
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def of(cls, job: DownloadJob, progress: Optional[Dict[str, Any]] = None) -> "DownloadJobRead":
+        return cls(**job.model_dump(exclude={"updated_at", "progress"}), progress=progress)
 
 @router.post("", status_code=202)
 async def download_url(
     request: DownloadRequest,
-    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
-    extractor: DomainExtractor = Depends(get_extractor)
+    extractor: DomainExtractor = Depends(get_extractor),
+    pool: DownloadWorkerPool = Depends(get_download_pool),
 ):
     domain = extractor.extract_domain(request.url)
     
-    for pattern, service_cls in URL_SERVICE_MAP.items():
-        if re.search(pattern, str(domain)):
-            print(domain)
-            exists = await session.scalar(select(Url).where(Url.url == request.url))
-            if exists:
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"이미 다운로드된 URL입니다: {request.url}"
-                )
-            
-            schedule_download(request.url, background_tasks, service_cls)
+    service_cls = resolve_service(domain)
+    if service_cls is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 플랫폼입니다: {domain}"
+        )
+    
+    exists = await UrlRepository(session).find(request.url)
+    repo = DownloadJobRepository(session)
+    if exists or await repo.find_active(request.url):
+        raise HTTPException(
+            status_code=409,
+            detail=f"이미 다운로드된 URL입니다: {request.url}"
+        )
+    
+    async with unit_of_work(session):
+        job = await repo.enqueue(
+            url=request.url,
+            platform=service_cls.PLATFORM_NAME,
+            priority=request.priority,
+        )
+    pool.notify()
+    
+    return {"message": "다운로드 예약되었습니다.", "id": str(job.id)}
+
+
+@router.post("/probe", response_model=ProbeRead)
+async def probe_url(
+    request: ProbeRequest,
+    session: AsyncSession = Depends(get_session),
+    extractor: DomainExtractor = Depends(get_extractor),
+):
+    """
+    다운로드 전에 제목/길이/예상 크기/썸네일을 조회합니다.
+    결과는 TTL 동안 캐시되며 실제 다운로드도 같은 결과를 재사용합니다.
+    """
+    domain = extractor.extract_domain(request.url)
+    service_cls = resolve_service(domain)
+    if service_cls is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 플랫폼입니다: {domain}"
+        )
+    
+    platform = service_cls.PLATFORM_NAME
+    try:
+        row, cached = await ProbeService.probe(
+            request.url, platform, session,
+            refresh=request.refresh,
+            limiter=get_limiter(platform),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"URL 정보를 가져오지 못했습니다: {e}")
+    
+    info = row.info
+    filesize = info.get("filesize") or info.get("filesize_approx")
+    return ProbeRead(
+        url=request.url,
+        canonical_url=row.canonical_url,
+        platform=platform,
+        title=info.get("title"),
+        duration=info.get("duration"),
+        filesize=int(filesize) if filesize else None,
+        thumbnail=info.get("thumbnail"),
+        uploader=info.get("uploader"),
+        webpage_url=info.get("webpage_url"),
+        cached=cached,
+        expires_at=row.expires_at,
+    )
+
+
+@router.post("/batch", status_code=202, response_model=List[BatchDownloadItem])
+async def download_batch(
+    request: BatchDownloadRequest,
+    session: AsyncSession = Depends(get_session),
+    extractor: DomainExtractor = Depends(get_extractor),
+    pool: DownloadWorkerPool = Depends(get_download_pool),
+):
+    """
+    여러 URL 을 한 번에 다운로드 예약합니다.
+    중복 검사는 IN 쿼리 한 번, 예약은 트랜잭션 하나로 처리하며 URL 별 결과를 반환합니다.
+    """
+    results: List[BatchDownloadItem] = []
+    candidates: Dict[str, tuple[BatchDownloadItem, str]] = {}
+    for url in request.urls:
+        item = BatchDownloadItem(url=url, status="queued")
+        results.append(item)
+        
+        service_cls = resolve_service(extractor.extract_domain(url))
+        if service_cls is None:
+            item.status = "unsupported"
+            continue
+        
+        key = canonicalize_url(url)
+        if key in candidates:
+            item.status = "duplicate"
+            continue
+        candidates[key] = (item, service_cls.PLATFORM_NAME)
+    
+    repo = DownloadJobRepository(session)
+    taken = await UrlRepository(session).find_existing_keys([i.url for i, _ in candidates.values()])
+    taken |= await repo.find_active_keys(list(candidates))
+    
+    entries = []
+    for key, (item, platform) in candidates.items():
+        if key in taken:
+            item.status = "duplicate"
+        else:
+            entries.append((item, platform))
+    
+    if entries:
+        async with unit_of_work(session):
+            jobs = await repo.enqueue_many(
+                [(item.url, platform) for item, platform in entries],
+                priority=request.priority,
+            )
+        for (item, _), job in zip(entries, jobs):
+            item.id = str(job.id)
+        pool.notify()
+    
+    return results
+
+
+
+@router.get("/{job_id}", response_model=DownloadJobRead)
+async def get_download_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_session),
+    broker: ProgressBroker = Depends(get_progress_broker),
+):
+    """
+    다운로드 작업의 상태와 최근 진행 상황을 조회합니다.
+    """
+    job = await _get_job_or_404(job_id, session)
+    return DownloadJobRead.of(job, broker.latest(job_id) or job.progress)
+
+
+@router.get("/{job_id}/events")
+async def stream_download_events(
+    job_id: int,
+    session: AsyncSession = Depends(get_session),
+    broker: ProgressBroker = Depends(get_progress_broker),
+):
+    """
+    다운로드 진행 상황을 Server-Sent Events 로 전송합니다.
+    작업이 done/failed 상태가 되면 스트림이 종료됩니다.
+    """
+    await _get_job_or_404(job_id, session)
+    
+    async def _events():
+        async with broker.subscribe(job_id) as queue:
+            # 구독 이후에 상태를 읽어야 그 사이에 끝난 작업을 놓치지 않습니다.
+            job = await _load_job(job_id)
+            last_progress = broker.latest(job_id) or job.progress
+            yield _sse("status", DownloadJobRead.of(job, last_progress).model_dump(mode="json"))
+            if job.status in TERMINAL_STATUSES:
+                return
             
-            return {"message": "다운로드 예약되었습니다.", "id": str(uuid.uuid4())}
-    raise HTTPException(
-        status_code=400,
-        detail=f"지원하지 않는 플랫폼입니다: {domain}"
-    )
\ No newline at end of file
+            idle = 0.0
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    job = await _load_job(job_id)
+                    if job.status in TERMINAL_STATUSES:
+                        yield _sse("status", DownloadJobRead.of(job).model_dump(mode="json"))
+                        return
+                    # 다른 프로세스의 워커가 실행 중이면 DB 에 저장된 진행 상황을 전달합니다.
+                    if job.progress and job.progress != last_progress:
+                        last_progress = job.progress
+                        idle = 0.0
+                        yield _sse("progress", job.progress)
+                        continue
+                    idle += SSE_POLL_SECONDS
+                    if idle >= SSE_KEEPALIVE_SECONDS:
+                        idle = 0.0
+                        yield ": keep-alive\n\n"
+                    continue
+                
+                idle = 0.0
+                last_progress = event
+                yield _sse("progress", event)
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+    
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _get_job_or_404(job_id: int, session: AsyncSession) -> DownloadJob:
+    job = await DownloadJobRepository(session).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"다운로드 작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+async def _load_job(job_id: int) -> DownloadJob:
+    async with AsyncSessionLocal() as session:
+        return await DownloadJobRepository(session).get(job_id)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
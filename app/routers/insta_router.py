@@ -1,13 +1,29 @@
 from typing import List
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 from core.database import get_session
+from core.tasks import DownloadWorkerPool
+from core.unit_of_work import unit_of_work
+from app.repositories.job_repository import DownloadJobRepository
 from app.services.instagram_service import InstagramService
 from app.models.profile import Profile
 
 
 router = APIRouter(prefix="/api/instagram", tags=["Instagram"])
 
+
+async def get_download_pool(request: Request) -> DownloadWorkerPool:
+    return request.app.state.download_pool
+
+
+@router.get("/profile/list", response_model=List[Profile])
+async def get_list_profile(
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: int = Query(30, ge=1, le=100, description="페이지 크기"),
+    session: AsyncSession = Depends(get_session)
+):
+    return await InstagramService.list_profile(session, page, size)
+
 @router.get("/profile/{owner_id}", response_model=Profile)
 async def read_profile(
     owner_id: int,
@@ -15,10 +31,38 @@ async def read_profile(
 ):
     return await InstagramService.get_profile(owner_id, session)
 
-@router.get("/profile/list", response_model=List[Profile])
-async def get_list_profile(
-    page: int = Query(1, ge=1, description="페이지 번호"),
-    size: int = Query(30, ge=1, le=100, description="페이지 크기"),
+@router.put("/profile/{owner_id}/follow", response_model=Profile)
+async def follow_profile(
+    owner_id: int,
     session: AsyncSession = Depends(get_session)
 ):
-    return await InstagramService.list_profile(session, page, size)
+    """
+    프로필을 팔로우합니다. 스케줄러가 주기적으로 새 게시물만 동기화합니다.
+    """
+    return await InstagramService.set_followed(owner_id, True, session)
+
+@router.delete("/profile/{owner_id}/follow", response_model=Profile)
+async def unfollow_profile(
+    owner_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    return await InstagramService.set_followed(owner_id, False, session)
+
+@router.post("/profile/{owner_id}/sync", status_code=202)
+async def sync_profile(
+    owner_id: int,
+    session: AsyncSession = Depends(get_session),
+    pool: DownloadWorkerPool = Depends(get_download_pool),
+):
+    """
+    프로필의 새 게시물 동기화를 바로 예약합니다.
+    """
+    profile = await InstagramService.get_profile(owner_id, session)
+    url = InstagramService.profile_url(profile)
+    repo = DownloadJobRepository(session)
+    job = await repo.find_active(url)
+    if job is None:
+        async with unit_of_work(session):
+            job = await repo.enqueue(url=url, platform=InstagramService.PLATFORM_NAME)
+        pool.notify()
+    return {"message": "동기화가 예약되었습니다.", "id": str(job.id)}
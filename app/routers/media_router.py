@@ -1,26 +1,42 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 
+from core import settings
 from core.database import get_session
-from app.models.media import Media
+from app.models.media import Media, MediaReadExpanded
 from app.services.media_service import MediaService
+from app.services.thumbnail_service import MEDIA_TYPES, ThumbnailService
 
 router = APIRouter(prefix="/api/media", tags=["media"])
 
+# 썸네일 URL 의 결과는 원본과 옵션으로 결정되므로 브라우저가 재검증 없이 계속 사용하도록 합니다.
+THUMB_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
 
 @router.post("/upload", response_model=List[Media])
 async def upload_media(
     files: List[UploadFile] = File(..., description="업로드할 미디어 파일"),
     platform_name: str = Form(..., ),
     tag_names: List[str] = Form(..., ),
+    session: AsyncSession = Depends(get_session)
 ):
     try:
         created_media_list = await MediaService.add_media(
             files=files,
             platform_name=platform_name,
             tag_names=tag_names,
+            session=session,
         )
         return created_media_list
     except HTTPException as e:
@@ -29,31 +45,98 @@ async def upload_media(
         raise HTTPException(status_code=500, detail=f"미디어 업로드 중 오류 발생: {str(e)}")
 
 
-@router.get("/list", response_model=List[Media], summary="Get paged media list")
+EXPAND_DESCRIPTION = "함께 반환할 관계. 쉼표로 구분합니다. (tags, platform, profile)"
+
+
+@router.get(
+    "/list",
+    response_model=List[MediaReadExpanded],
+    response_model_exclude_unset=True,
+    summary="Get paged media list",
+)
 async def get_media(
     cursor: Optional[int] = Query(None),
     limit: int = Query(30, ge=1, le=100),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
     session: AsyncSession = Depends(get_session)
 ):
     """
     페이지네이션된 미디어 목록을 조회합니다.
     """
-    return await MediaService.get_medialist_by_cursor(cursor, limit, session)
+    relations = MediaService.parse_expand(expand)
+    medias = await MediaService.get_medialist_by_cursor(cursor, limit, session, expand=relations)
+    return [MediaService.to_read(media, relations) for media in medias]
+
+
+@router.get("/export", summary="Export media as NDJSON")
+async def export_media(
+    platform: Optional[str] = Query(None, description="플랫폼 이름"),
+    tag: Optional[str] = Query(None, description="태그 이름"),
+    updated_since: Optional[datetime] = Query(None, description="이 시각 이후(포함) 수정된 항목만"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    조건에 맞는 미디어 전체를 한 줄에 하나씩 JSON 으로 스트리밍합니다. (application/x-ndjson)
+    행 수와 상관없이 메모리 사용량이 일정하며, 첫 행부터 바로 전송합니다.
+    """
+    rows = await MediaService.export_media(
+        session, platform_name=platform, tag_name=tag, updated_since=updated_since
+    )
+    return StreamingResponse(rows, media_type="application/x-ndjson")
 
 
 @router.get("/platform/{platform_name}", response_model=List[Media])
 async def get_media_by_platform(
     platform_name: str, 
+    cursor: Optional[int] = Query(None, description="마지막으로 받은 Media.id"),
+    limit: int = Query(30, ge=1, le=100),
+    owner_id: Optional[int] = Query(None),
+    created_from: Optional[datetime] = Query(None, description="이 시각 이후 생성 (포함)"),
+    created_to: Optional[datetime] = Query(None, description="이 시각 이전 생성 (제외)"),
     session: AsyncSession = Depends(get_session)
 ):
     """
-    특정 플랫폼의 미디어 목록을 조회합니다.
+    특정 플랫폼의 미디어 목록을 페이지 단위로 조회합니다.
     """
-    return await MediaService.get_media_by_platform_name(platform_name, session)
+    return await MediaService.get_media_by_platform_name(
+        platform_name,
+        session,
+        cursor=cursor,
+        limit=limit,
+        owner_id=owner_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
-@router.get("/{media_id}", response_model=Media)
+@router.get("/{media_id}", response_model=MediaReadExpanded, response_model_exclude_unset=True)
 async def get_media_by_id(
     media_id: int,
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+    session: AsyncSession = Depends(get_session)
+):
+    relations = MediaService.parse_expand(expand)
+    media = await MediaService.get_media_by_id(media_id, session, expand=relations)
+    return MediaService.to_read(media, relations)
+
+
+@router.get("/{media_id}/thumb", summary="Get resized thumbnail")
+async def get_media_thumbnail(
+    media_id: int,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=settings.thumb_max_dimension),
+    h: Optional[int] = Query(None, ge=1, le=settings.thumb_max_dimension),
+    fmt: Literal["webp", "jpeg", "png"] = Query("webp"),
     session: AsyncSession = Depends(get_session)
 ):
-    return await MediaService.get_media_by_id(media_id, session)
\ No newline at end of file
+    """
+    원본을 w x h 안에 들어가도록 축소한 썸네일을 반환합니다. 처음 요청할 때 만들어 디스크 캐시에 보관합니다.
+    """
+    media = await MediaService.get_media_by_id(media_id, session)
+    source, key = await ThumbnailService.resolve(media, w, h, fmt)
+    etag = ThumbnailService.etag(key)
+    headers = {"ETag": etag, "Cache-Control": THUMB_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    path = await ThumbnailService.get_thumbnail(media, source, key, w, h, fmt)
+    return FileResponse(path, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -1,7 +1,9 @@
 from typing import List, Optional
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.services.search_service import SearchService
+from core.database import get_session
 
 router = APIRouter(prefix="/api/search", tags=["search"])
 
@@ -13,5 +15,15 @@ async def search_endpoint(
     platform: Optional[str] = Query(None),
     limit: int = Query(30, gt=0, le=100),
     offset: int = Query(0, ge=0),
+    hydrate: bool = Query(False, description="true 면 DB 의 Media 와 tags/platform/profile 을 함께 반환합니다."),
+    session: AsyncSession = Depends(get_session),
 ):
-    return await SearchService.search(q, owner_id, owner_name, platform, limit, offset)
\ No newline at end of file
+    hits = await SearchService.search(q, owner_id, owner_name, platform, limit, offset)
+    if hydrate:
+        return await SearchService.hydrate(hits, session)
+    return hits
+
+
+@router.get("/cache/stats", response_model=dict)
+async def search_cache_stats():
+    return SearchService.cache_stats()
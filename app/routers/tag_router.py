@@ -1,5 +1,6 @@
-from typing import List
-from fastapi import APIRouter, Depends, Body
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Body, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.database import get_session
@@ -70,12 +71,25 @@ async def remove_tags_from_media(
 @router.get("/media/{tag_name}", response_model=List[Media])
 async def get_media_by_tag(
     tag_name: str, 
+    cursor: Optional[int] = Query(None, description="마지막으로 받은 Media.id"),
+    limit: int = Query(30, ge=1, le=100),
+    owner_id: Optional[int] = Query(None),
+    created_from: Optional[datetime] = Query(None, description="이 시각 이후 생성 (포함)"),
+    created_to: Optional[datetime] = Query(None, description="이 시각 이전 생성 (제외)"),
     session: AsyncSession = Depends(get_session)
 ):
     """
-    특정 태그가 붙은 모든 미디어를 조회합니다.
-    """
-    return await TagService.get_media_by_tag(tag_name, session)
+    특정 태그가 붙은 미디어를 페이지 단위로 조회합니다.
+    """
+    return await TagService.get_media_by_tag(
+        tag_name,
+        session,
+        cursor=cursor,
+        limit=limit,
+        owner_id=owner_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
 
 @router.post("/media/batch", response_model=List[Media])
@@ -1,14 +1,22 @@
+import logging
 from abc import ABC, abstractmethod
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from app.repositories.media_repository import MediaRepository
+from app.repositories.search_outbox_repository import SearchOutboxRepository
+from app.repositories.url_repository import UrlRepository
 from app.models.platform import Platform
+from app.models.urls import Url
 from core.exception import DuplicateUrlError
+from core.ratelimit import get_limiter
 from core.unit_of_work import unit_of_work
-from downloader.models import DownloadResult, FileInfo
+from downloader.models import DownloadPhase, DownloadResult, FileInfo, ProgressCallback, noop_progress
+
+logger = logging.getLogger(__name__)
 
 
 class AbstractMediaService(ABC):
@@ -25,34 +33,71 @@ class AbstractMediaService(ABC):
         self._platform_id: int | None = None
         
     
-    async def handle(self, url: str, **kwargs):
+    async def handle(self, url: str, progress: Optional[ProgressCallback] = None, **kwargs):
         """
         외부에서 호출하는 단일 진입점
+        progress: 단계별 진행 상황을 받을 콜백 (없으면 무시)
         """
+        progress = progress or noop_progress
+        url_obj, created = await self._reserve_url(url)
+        # 저장이 실패해 롤백되면 url_obj 가 만료되므로 id 를 미리 꺼내 둡니다.
+        url_id = url_obj.id
         try:
-            url_obj = await self._get_or_create_url(url)
-        except DuplicateUrlError:
+            return await self._download_and_save(url, url_id, progress)
+        except BaseException:
+            if created:
+                await self._release_url(url_id)
+            raise
+    
+    async def _reserve_url(self, url: str) -> Tuple[Url, bool]:
+        """
+        Url 을 먼저 커밋해 둡니다. 다운로드하는 동안 쓰기 트랜잭션을 잡고 있으면
+        SQLite 에서 probe 캐시, 작업 lease 갱신 같은 다른 세션의 쓰기가 모두 막힙니다.
+        반환값은 (Url, 이번 호출에서 새로 만들었는지) 입니다.
+        """
+        try:
+            async with unit_of_work(self.session):
+                created = await UrlRepository(self.session).find(url) is None
+                url_obj = await self._get_or_create_url(url)
+        except (DuplicateUrlError, IntegrityError):
+            # IntegrityError 는 같은 URL 이 동시에 등록된 경우입니다.
             raise HTTPException(status_code=409, detail="이미 등록된 URL입니다.")
-        
-        result: DownloadResult = await self._download(url)
+        return url_obj, created
+    
+    async def _release_url(self, url_id: int) -> None:
+        """
+        다운로드나 저장에 실패하면 미리 등록한 Url 을 지워 다시 요청할 수 있게 합니다.
+        """
+        try:
+            async with unit_of_work(self.session):
+                await UrlRepository(self.session).remove(url_id)
+        except Exception:
+            logger.warning("실패한 다운로드의 URL 을 정리하지 못했습니다: url_id=%s", url_id, exc_info=True)
+    
+    async def _download_and_save(self, url: str, url_id: int, progress: ProgressCallback) -> DownloadResult:
+        limiter = get_limiter(self.PLATFORM_NAME)
+        result: DownloadResult = await limiter.call(lambda: self._download(url, progress))
         
         metadata: Dict[str, Any] = result.metadata or {}
         caption: Optional[str] = metadata.get("caption")
         owner_id: Optional[int] = metadata.get("owner_id")
         owner_name: Optional[str] = metadata.get("owner_name")
         
+        progress(DownloadPhase.db)
         async with unit_of_work(self.session) as tx:
             await tx.flush()
+            await self._save_owner(tx, result)
             
             repo = MediaRepository(tx)
-            await repo.add_medias(
+            medias = await repo.add_medias(
                 files=result.files,
                 platform_id= await self._get_platform_id(),
-                url_id=url_obj.id,
+                url_id=url_id,
                 owner_id=owner_id,
                 owner_name=owner_name,
                 caption=caption,
             )
+            SearchOutboxRepository(tx).enqueue(m.id for m in medias)
             
             return result
     
@@ -61,9 +106,15 @@ class AbstractMediaService(ABC):
         raise NotImplementedError
     
     @abstractmethod
-    async def _download(self, url: str) -> DownloadResult:
+    async def _download(self, url: str, progress: ProgressCallback) -> DownloadResult:
         raise NotImplementedError
     
+    async def _save_owner(self, session: AsyncSession, result: DownloadResult) -> None:
+        """
+        Media 를 저장하기 전에 작성자 정보를 저장해야 하는 플랫폼에서 구현합니다.
+        """
+        return None
+    
     async def _get_platform_id(self) -> int:
         if self._platform_id is not None:
             return self._platform_id
@@ -73,9 +124,13 @@ class AbstractMediaService(ABC):
         platform: Platform | None = result.first()
         
         if platform is None:
-            platform = Platform(name=self.PLATFORM_NAME)
-            self.session.add(platform)
-            await self.session.flush()
+            try:
+                async with self.session.begin_nested():
+                    platform = Platform(name=self.PLATFORM_NAME)
+                    self.session.add(platform)
+            except IntegrityError:
+                # 같은 플랫폼의 다른 작업이 먼저 만든 경우
+                platform = (await self.session.exec(stmt)).one()
         
         self._platform_id = platform.id
         return self._platform_id
\ No newline at end of file
@@ -2,9 +2,12 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.services.abstract_media_service import AbstractMediaService
 from downloader.generic import GenericDownloader
 from core.exception import DuplicateUrlError
-from app.models.urls import Url
-from sqlmodel import select
+from app.repositories.url_repository import UrlRepository
+from app.services.probe_service import CachingExtractor
 from core import settings
+from core.http import get_http_client
+from core.images import get_image_pipeline
+from core.ratelimit import get_limiter
 from downloader.models import DownloadResult
 
 
@@ -17,17 +20,18 @@ class GenericMediaService(AbstractMediaService):
         self.downloader = GenericDownloader(
             platform=self.PLATFORM_NAME,
             root_dir=settings.download_dir,
-            extractor=self.PLATFORM_NAME,
+            extractor=CachingExtractor(self.PLATFORM_NAME),
+            limiter=get_limiter(self.PLATFORM_NAME),
+            image_pipeline=get_image_pipeline(),
+            http_client=get_http_client(),
         )
         
     async def _get_or_create_url(self, url: str):
-        if (await self.session.exec(select(Url).where(Url.url == url))).first():
+        repo = UrlRepository(self.session)
+        if await repo.find(url):
             raise DuplicateUrlError(url)
         
-        url_obj = Url(url=url)
-        self.session.add(url_obj)
-        await self.session.flush()
-        return url_obj
+        return await repo.add(url)
     
-    async def _download(self, url: str) -> DownloadResult:
-        return await self.downloader.download(url)
\ No newline at end of file
+    async def _download(self, url: str, progress=None) -> DownloadResult:
+        return await self.downloader.download(url, progress=progress)
\ No newline at end of file
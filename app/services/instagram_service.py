@@ -1,11 +1,22 @@
-from sqlmodel import select
+from typing import List
+from fastapi import HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.models.profile import Profile
 from app.models.urls import Url
+from app.repositories.job_repository import DownloadJobRepository
+from app.repositories.profile_repository import ProfileRepository
+from app.repositories.url_repository import UrlRepository
 from core import settings
+from core.canonical import canonicalize_url
 from core.exception import DuplicateUrlError
+from core.http import get_http_client
+from core.images import get_image_pipeline
+from core.instagram import get_instaloader_pool
+from core.unit_of_work import unit_of_work
 from downloader.models import DownloadResult
 from downloader.plugins.instagram import InstagramDownloader
+from utils.app_utils import now_kst
 
 from .abstract_media_service import AbstractMediaService
 
@@ -15,17 +26,81 @@ class InstagramService(AbstractMediaService):
     
     def __init__(self, session: AsyncSession):
         super().__init__(session)
-        self.downloader = InstagramDownloader(settings.download_dir / self.PLATFORM_NAME)
+        self.downloader = InstagramDownloader(
+            settings.download_dir / self.PLATFORM_NAME,
+            image_pipeline=get_image_pipeline(),
+            session_pool=get_instaloader_pool(),
+            http_client=get_http_client(),
+            item_concurrency=settings.instagram_item_concurrency,
+        )
         
     
     async def _get_or_create_url(self, url) -> Url:
-        if (await self.session.exec(select(Url).where(Url.url == url))).first():
+        repo = UrlRepository(self.session)
+        existing = await repo.find(url)
+        if existing:
+            # 프로필 URL 은 새 게시물을 받기 위해 반복해서 동기화합니다.
+            if InstagramDownloader.profile_username(url):
+                return existing
             raise DuplicateUrlError(url)
         
-        url_obj = Url(url=url)
-        self.session.add(url_obj)
-        await self.session.flush()
-        return url_obj
+        return await repo.add(url)
     
-    async def _download(self, url) -> DownloadResult:
-        return await self.downloader.download(url)
\ No newline at end of file
+    async def _download(self, url, progress=None) -> DownloadResult:
+        username = InstagramDownloader.profile_username(url)
+        if username is None:
+            return await self.downloader.download(url, progress=progress)
+        
+        known = await ProfileRepository(self.session).known_source_ids(username)
+        return await self.downloader.sync_profile(username, known, progress=progress)
+    
+    async def _save_owner(self, session: AsyncSession, result: DownloadResult) -> None:
+        metadata = result.metadata or {}
+        owner_id = metadata.get("owner_id")
+        owner_name = metadata.get("owner_name") or metadata.get("owner_username")
+        if owner_id is None or not owner_name:
+            return
+        
+        profile = await ProfileRepository(session).upsert(owner_id, owner_name)
+        if "new_posts" in metadata:
+            profile.last_update = now_kst()
+        
+        # 동기화는 이미 받은 게시물에서 멈추므로, 받지 못한 게시물은 따로 작업을 예약해 다시 받습니다.
+        failed = metadata.get("failed_posts") or []
+        if failed:
+            await self._enqueue_posts(session, failed)
+    
+    async def _enqueue_posts(self, session: AsyncSession, shortcodes: List[str]) -> None:
+        jobs = DownloadJobRepository(session)
+        urls = [self.post_url(shortcode) for shortcode in shortcodes]
+        active = await jobs.find_active_keys([canonicalize_url(url) for url in urls])
+        entries = [(url, self.PLATFORM_NAME) for url in urls if canonicalize_url(url) not in active]
+        if entries:
+            await jobs.enqueue_many(entries, priority=settings.instagram_sync_priority)
+    
+    @staticmethod
+    def post_url(shortcode: str) -> str:
+        return f"https://www.instagram.com/p/{shortcode}/"
+    
+    @staticmethod
+    def profile_url(profile: Profile) -> str:
+        return f"https://www.instagram.com/{profile.owner_name}/"
+    
+    @staticmethod
+    async def get_profile(owner_id: int, session: AsyncSession) -> Profile:
+        profile = await ProfileRepository(session).get(owner_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail=f"프로필을 찾을 수 없습니다: {owner_id}")
+        return profile
+    
+    @staticmethod
+    async def list_profile(session: AsyncSession, page: int, size: int) -> List[Profile]:
+        return list(await ProfileRepository(session).list(page, size))
+    
+    @classmethod
+    async def set_followed(cls, owner_id: int, followed: bool, session: AsyncSession) -> Profile:
+        async with unit_of_work(session):
+            profile = await cls.get_profile(owner_id, session)
+            profile.followed = followed
+            profile.updated_at = now_kst()
+        return profile
@@ -1,51 +1,164 @@
-import os, uuid, aiofiles
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import AbstractSet, AsyncIterator, List, Optional, Tuple
 from fastapi import HTTPException, UploadFile
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.models.media import Media
+from app.models.media import Media, MediaRead, MediaTag, MediaReadExpanded, PlatformRead, ProfileRead, TagRead
+from app.repositories.blob_repository import BlobRepository
+from app.repositories.media_repository import apply_media_filters
+from app.repositories.search_outbox_repository import SearchOutboxRepository
 from app.services.tag_service import TagService
 from app.services.platform_service import PlatformService
 from core import settings
+from core.database import AsyncSessionLocal
+from core.unit_of_work import unit_of_work
+from utils.app_utils import safe_string
+from utils.file_utils import save_upload
 
 UPLOAD_DIR: Path = Path(settings.local_dir)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# expand 로 함께 읽을 수 있는 Media 관계
+EXPANDABLE = {
+    "tags": Media.tags,
+    "platform": Media.platform,
+    "profile": Media.profile,
+}
+
+# export 가 DB 에서 한 번에 가져오는 행 수. 메모리 사용량은 이 크기로 고정됩니다.
+EXPORT_YIELD_PER = 1000
+
 class MediaService:
     async def list_media(session: AsyncSession) -> List[Media]:
         stmt = select(Media)
         result = await session.exec(stmt)
         return result.all()
     
+    @staticmethod
+    def parse_expand(value: Optional[str]) -> frozenset[str]:
+        """
+        "tags,platform" 형식의 expand 값을 관계 이름 집합으로 바꿉니다.
+        """
+        if not value:
+            return frozenset()
+        names = frozenset(name.strip().lower() for name in value.split(",") if name.strip())
+        unknown = names - EXPANDABLE.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"expand 에 사용할 수 없는 값입니다: {', '.join(sorted(unknown))} "
+                       f"(가능: {', '.join(EXPANDABLE)})",
+            )
+        return names
+
+    @staticmethod
+    def with_expand(stmt, expand: AbstractSet[str]):
+        """
+        요청한 관계를 selectinload 로 묶어 읽습니다. 관계마다 쿼리 하나가 추가되므로
+        페이지 크기와 상관없이 쿼리 수가 일정합니다.
+        """
+        return stmt.options(*(selectinload(EXPANDABLE[name]) for name in sorted(expand)))
+
+    @staticmethod
+    def to_read(media: Media, expand: AbstractSet[str] = frozenset()) -> MediaReadExpanded:
+        """
+        Media 를 응답 스키마로 바꿉니다. expand 에 있는 관계는 미리 load 되어 있어야 합니다.
+        """
+        data = MediaRead.model_validate(media).model_dump()
+        if "platform" in expand:
+            data["platform"] = PlatformRead.model_validate(media.platform) if media.platform else None
+        if "profile" in expand:
+            data["profile"] = ProfileRead.model_validate(media.profile) if media.profile else None
+        if "tags" in expand:
+            data["tags"] = [TagRead.model_validate(tag) for tag in media.tags]
+        return MediaReadExpanded(**data)
+
+    @classmethod
     async def get_medialist_by_cursor(
+            cls,
             cursor: Optional[int],
             limit: int,
-            session: AsyncSession
+            session: AsyncSession,
+            expand: AbstractSet[str] = frozenset(),
     ) -> List[Media]:
         """
         cursor: 마지막으로 받은 Media.id (없으면 처음부터)
         limit: 한 번에 가져올 개수
+        expand: 함께 읽을 관계 (tags, platform, profile)
         """
         stmt = select(Media).order_by(Media.id)
         if cursor is not None:
             stmt = stmt.where(Media.id > cursor)
-        stmt = stmt.limit(limit)
+        stmt = cls.with_expand(stmt.limit(limit), expand)
 
         result = await session.exec(stmt)
         return result.all()
     
-    async def get_media_by_platform_name(name: str, session: AsyncSession) -> list[Media]:
+    @classmethod
+    async def get_media_by_platform_name(
+        cls,
+        name: str,
+        session: AsyncSession,
+        cursor: Optional[int] = None,
+        limit: int = 30,
+        owner_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> list[Media]:
+        """
+        플랫폼의 미디어를 id 순으로 cursor 다음부터 limit 개 가져옵니다.
+        (platform_id, id) 인덱스를 타므로 플랫폼의 전체 행 수와 상관없이 한 페이지만 읽습니다.
+        """
         platform = await PlatformService.get_platform_by_name(name=name, session=session)
 
-        result = await session.exec(
-            select(Media).where(Media.platform_id == platform.id)
-        )
+        stmt = select(Media).where(Media.platform_id == platform.id)
+        if cursor is not None:
+            stmt = stmt.where(Media.id > cursor)
+        stmt = apply_media_filters(stmt, owner_id, created_from, created_to)
+        result = await session.exec(stmt.order_by(Media.id).limit(limit))
 
         return result.all()
     
-    async def get_media_by_id(media_id: int, session: AsyncSession) -> Media:
-        stmt = select(Media).where(Media.id == media_id)
+    @staticmethod
+    async def export_media(
+        session: AsyncSession,
+        platform_name: Optional[str] = None,
+        tag_name: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        조건에 맞는 Media 전체를 id 순으로 한 줄에 하나씩 NDJSON 으로 내보냅니다.
+        플랫폼/태그 이름은 응답을 시작하기 전에 확인해 없으면 404 를 올립니다.
+        updated_since 를 주면 그 이후(포함) 수정된 항목만 내보내 증분 동기화에 씁니다.
+        """
+        stmt = select(*(getattr(Media, name) for name in MediaRead.model_fields)).order_by(Media.id)
+        if platform_name:
+            platform = await PlatformService.get_platform_by_name(name=platform_name, session=session)
+            stmt = stmt.where(Media.platform_id == platform.id)
+        if tag_name:
+            tag = await TagService.get_tag_by_name(tag_name, session)
+            stmt = stmt.join(MediaTag, MediaTag.media_id == Media.id).where(MediaTag.tag_id == tag.id)
+        if updated_since is not None:
+            stmt = stmt.where(Media.updated_at >= updated_since)
+        return MediaService._stream_ndjson(stmt)
+
+    @staticmethod
+    async def _stream_ndjson(stmt) -> AsyncIterator[bytes]:
+        # 스트리밍은 요청 세션이 닫힌 뒤에도 이어지므로 별도 세션을 열고, 서버 측 커서로
+        # EXPORT_YIELD_PER 행씩 받아 ORM 객체를 만들지 않고 바로 직렬화합니다.
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+            async for row in result:
+                yield MediaRead.model_validate(row._mapping).model_dump_json().encode() + b"\n"
+
+    @classmethod
+    async def get_media_by_id(
+        cls, media_id: int, session: AsyncSession, expand: AbstractSet[str] = frozenset()
+    ) -> Media:
+        stmt = cls.with_expand(select(Media).where(Media.id == media_id), expand)
         result = await session.exec(stmt)
         media = result.first()
         if not media:
@@ -63,37 +176,43 @@ class MediaService:
     ) -> List[Media]:
         """
         미디어를 추가합니다.
+        파일은 chunk 단위로 디스크에 스트리밍하고, DB 저장은 하나의 트랜잭션으로 처리합니다.
         """
-        platform_service = PlatformService()
-        
-        platform = await platform_service.get_or_create(platform_name, session)
-        
-        tags = [await TagService.get_or_create(name, session) for name in tag_names]
-        
-        created_media_list = []
-        for file in files:
-            unique_filename = f"{file.filename}_{uuid.uuid4().hex[:8]}"
-            filepath = os.path.join(UPLOAD_DIR, unique_filename)
+        saved: List[Tuple[UploadFile, Path, int, str]] = []
+        try:
+            for file in files:
+                unique_filename = f"{safe_string(file.filename or 'upload')}_{uuid.uuid4().hex[:8]}"
+                filepath = UPLOAD_DIR / unique_filename
+                file_size, digest = await save_upload(file, filepath)
+                saved.append((file, filepath, file_size, digest))
             
-            with open(filepath, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
+            async with unit_of_work(session):
+                platform = await PlatformService().get_or_create(platform_name, session, commit=False)
+                tags = [await TagService.get_or_create(name, session, commit=False) for name in tag_names]
                 
-            file_size = os.path.getsize(filepath)
-            
-            media = Media(
-                title=file.filename,
-                filepath=filepath,
-                platform_id=platform.id,
-                platform=platform,
-                tags=tags,
-                file_size=file_size
-            )
-            session.add(media)
-            created_media_list.append(media)
+                created_media_list = []
+                blobs = BlobRepository(session)
+                for file, filepath, file_size, digest in saved:
+                    filepath = await blobs.store(filepath, digest, file_size)
+                    media = Media(
+                        title=file.filename,
+                        filepath=str(filepath),
+                        platform_id=platform.id,
+                        platform=platform,
+                        tags=tags,
+                        file_size=file_size,
+                        sha256=digest,
+                    )
+                    session.add(media)
+                    created_media_list.append(media)
+                await session.flush()
+                SearchOutboxRepository(session).enqueue(m.id for m in created_media_list)
+        except BaseException:
+            for _, filepath, _, _ in saved:
+                filepath.unlink(missing_ok=True)
+            raise
         
-        await session.commit()
         for media in created_media_list:
             await session.refresh(media)
         
-        return created_media_list
\ No newline at end of file
+        return created_media_list
@@ -9,13 +9,16 @@ from sqlmodel import select
 class PlatformService:
     
     @classmethod
-    async def add_platform(cls, name: str, session: AsyncSession) -> Platform:
+    async def add_platform(cls, name: str, session: AsyncSession, commit: bool = True) -> Platform:
         existing = await session.scalar(select(Platform).where(Platform.name == name))
         if existing:
             raise HTTPException(status_code=409, detail=f"이미 존재하는 플랫폼입니다.: {name}")
         
         platform = Platform(name=name)
         session.add(platform)
+        if not commit:
+            await session.flush()
+            return platform
         await session.commit()
         await session.refresh(platform)
         return platform
@@ -30,12 +33,12 @@ class PlatformService:
 
         return platform
     
-    async def get_or_create(self, name: str, session: AsyncSession) -> Platform:
+    async def get_or_create(self, name: str, session: AsyncSession, commit: bool = True) -> Platform:
         try:
             return await self.__class__.get_platform_by_name(name, session)
         except HTTPException as e:
             if e.status_code == 404:
-                return await self.add_platform(name, session)
+                return await self.add_platform(name, session, commit=commit)
             raise
     
     @classmethod
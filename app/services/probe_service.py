@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import yt_dlp
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.probe_cache import ProbeCache
+from app.repositories.probe_cache_repository import ProbeCacheRepository
+from core import settings
+from core.canonical import canonicalize_url
+from core.database import AsyncSessionLocal
+from core.unit_of_work import unit_of_work
+from downloader.generic import GenericExtractor
+from downloader.interfaces import Extractor
+from downloader.models import ExtractionResult
+from utils.app_utils import now_kst
+from utils.rate_limiter import RateLimiter, is_throttle_error
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeService:
+
+    @classmethod
+    async def probe(
+        cls,
+        url: str,
+        platform: str,
+        session: AsyncSession,
+        *,
+        refresh: bool = False,
+        limiter: Optional[RateLimiter] = None,
+    ) -> Tuple[ProbeCache, bool]:
+        """
+        URL 의 yt-dlp 추출 결과를 반환합니다. TTL 안의 캐시가 있으면 외부 요청 없이 돌려줍니다.
+        반환값은 (캐시 행, 캐시 적중 여부) 입니다.
+        """
+        repo = ProbeCacheRepository(session)
+        if not refresh and (row := await repo.get_fresh(url)):
+            return row, True
+
+        extractor = GenericExtractor(platform)
+        if limiter:
+            # probe 는 짧은 메타데이터 요청이므로 다운로드의 동시 실행 slot 은 쓰지 않고 토큰만 받습니다.
+            await limiter.acquire()
+            try:
+                result = await extractor.extract(url)
+            except Exception as e:
+                if is_throttle_error(e):
+                    limiter.penalize()
+                raise
+            limiter.relax()
+        else:
+            result = await extractor.extract(url)
+        # 다운로드 단계에서 그대로 처리할 수 있도록 JSON 으로 저장 가능한 형태로 정리합니다.
+        info = await asyncio.to_thread(yt_dlp.YoutubeDL.sanitize_info, result.metadata, True)
+
+        try:
+            async with unit_of_work(session):
+                await repo.purge_expired()
+                row = await repo.put(url=url, platform=platform, info=info, ttl=settings.probe_cache_ttl)
+        except IntegrityError:
+            # 같은 URL 을 동시에 probe 한 경우입니다. 먼저 저장된 결과를 사용합니다.
+            row = await repo.get_fresh(url)
+            if row is None:
+                raise
+        except OperationalError:
+            # 캐시는 다음 요청을 빠르게 하기 위한 것이므로, 저장에 실패해도 추출 결과는 그대로 씁니다.
+            logger.warning("probe 캐시를 저장하지 못했습니다: %s", url, exc_info=True)
+            row = ProbeCache(
+                canonical_url=canonicalize_url(url), url=url, platform=platform,
+                info=info, expires_at=now_kst(),
+            )
+        return row, False
+
+    @staticmethod
+    def to_result(row: ProbeCache) -> ExtractionResult[Dict[str, Any]]:
+        return GenericExtractor.to_result(row.url, row.info)
+
+
+class CachingExtractor(Extractor[Dict[str, Any]]):
+    """
+    probe 캐시를 먼저 확인하고, 없거나 만료되었을 때만 실제로 추출하는 Extractor.
+    다운로드 중인 작업의 세션과 섞이지 않도록 별도 세션을 사용합니다.
+    작업 세션은 다운로드 전에 Url 을 커밋해 두므로 이 세션의 캐시 쓰기와 잠금이 겹치지 않습니다.
+    """
+
+    def __init__(self, platform: str) -> None:
+        self.platform = platform
+
+    async def extract(self, url: str) -> ExtractionResult[Dict[str, Any]]:
+        async with AsyncSessionLocal() as session:
+            row, _ = await ProbeService.probe(url, self.platform, session)
+        return ProbeService.to_result(row)
@@ -0,0 +1,26 @@
+import re
+from typing import Optional
+
+from app.services.abstract_media_service import AbstractMediaService
+from app.services.instagram_service import InstagramService
+from app.services.youtube_services import YoutubeService
+
+
+URL_SERVICE_MAP = {
+    r"^(?:instagram|instagr)(?:\.(?:com|am))?$": InstagramService,
+    r"^(?:youtube|youtu)(?:\.(?:com|be))?$"   : YoutubeService,
+}
+
+SERVICE_BY_PLATFORM = {
+    service_cls.PLATFORM_NAME: service_cls for service_cls in URL_SERVICE_MAP.values()
+}
+
+
+def resolve_service(domain: str) -> Optional[type[AbstractMediaService]]:
+    """
+    도메인에 대응하는 다운로드 서비스 클래스를 반환합니다.
+    """
+    for pattern, service_cls in URL_SERVICE_MAP.items():
+        if re.search(pattern, str(domain)):
+            return service_cls
+    return None
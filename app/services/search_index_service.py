@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.media import Media
+
+
+class SearchIndexService:
+    """
+    Media 를 Meilisearch 문서로 변환합니다.
+    """
+
+    @staticmethod
+    def build_document(media: Media) -> Dict[str, Any]:
+        return {
+            "id": media.id,
+            "title": media.title,
+            "filename": Path(media.filepath).name,
+            "filepath": media.filepath,
+            "thumbnail_path": media.thumbnail_path,
+            "file_size": media.file_size,
+            "platform": media.platform.name if media.platform else None,
+            "owner_id": media.owner_id,
+            "owner_name": media.profile.owner_name if media.profile else None,
+            "tags": [{"id": tag.id, "name": tag.name} for tag in media.tags],
+            "created_at": int(media.created_at.timestamp()),
+            "updated_at": int(media.updated_at.timestamp()),
+        }
+
+    @staticmethod
+    def with_relations(stmt):
+        return stmt.options(
+            selectinload(Media.tags),
+            selectinload(Media.platform),
+            selectinload(Media.profile),
+        )
+
+    @classmethod
+    async def load_documents(
+        cls, media_ids: Sequence[int], session: AsyncSession
+    ) -> List[Dict[str, Any]]:
+        if not media_ids:
+            return []
+        stmt = cls.with_relations(select(Media).where(Media.id.in_(list(media_ids))))
+        result = await session.exec(stmt)
+        return [cls.build_document(media) for media in result.all()]
+
+    @classmethod
+    async def load_medias(
+        cls, media_ids: Sequence[int], session: AsyncSession
+    ) -> List[Media]:
+        """
+        관계를 포함한 Media 를 IN 쿼리 한 번으로 읽어 media_ids 순서대로 돌려줍니다.
+        DB 에서 사라진 id 는 건너뜁니다.
+        """
+        if not media_ids:
+            return []
+        stmt = cls.with_relations(select(Media).where(Media.id.in_(list(media_ids))))
+        by_id = {media.id: media for media in (await session.exec(stmt)).all()}
+        return [by_id[mid] for mid in media_ids if mid in by_id]
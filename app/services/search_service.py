@@ -1,17 +1,26 @@
-from typing import List, Optional, Any, Dict
-from core.meili import search_media
+from typing import List, Optional, Any, Dict, Tuple
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.media import MediaReadWithRelations
+from app.services.search_index_service import SearchIndexService
+from core import settings
+from core.meili import media_generation, search_media
+from utils.ttl_cache import TTLCache
 
 
 class SearchService:
+    # 색인/삭제로 media 인덱스 generation 이 바뀌면 캐시 전체를 비웁니다.
+    _cache: TTLCache[List[Dict[str, Any]]] = TTLCache(
+        maxsize=settings.search_cache_size,
+        ttl=settings.search_cache_ttl,
+    )
+    _cache_generation = 0
+
     @staticmethod
-    async def search(
-        q: Optional[str],
+    def _build_filters(
         owner_id: Optional[int],
         owner_name: Optional[str],
         platform: Optional[str],
-        limit: int,
-        offset: int
-    ) -> List[Dict[str, Any]]:
+    ) -> List[str]:
         filters = []
         if owner_id is not None:
             filters.append(f"owner_id = {owner_id}")
@@ -19,13 +28,61 @@ class SearchService:
             filters.append(f"owner_name = '{owner_name}'")
         if platform:
             filters.append(f"platform = '{platform}'")
+        return filters
+
+    @staticmethod
+    def _normalize_query(q: Optional[str]) -> str:
+        return " ".join((q or "").split())
+
+    @classmethod
+    def _cache_key(cls, q: str, filters: List[str], limit: int, offset: int) -> Tuple:
+        generation = media_generation()
+        if generation != cls._cache_generation:
+            cls._cache.clear()
+            cls._cache_generation = generation
+        return (generation, q.casefold(), tuple(sorted(filters)), limit, offset)
+
+    @classmethod
+    async def search(
+        cls,
+        q: Optional[str],
+        owner_id: Optional[int],
+        owner_name: Optional[str],
+        platform: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Dict[str, Any]]:
+        query = cls._normalize_query(q)
+        filters = cls._build_filters(owner_id, owner_name, platform)
+
+        # 요청 도중 generation 이 바뀌면 결과는 이전 key 로 저장되어 다시 쓰이지 않습니다.
+        key = cls._cache_key(query, filters, limit, offset)
+        hits = cls._cache.get(key)
+        if hits is not None:
+            return hits
+
         filter_str = " AND ".join(filters) if filters else ""
-        
+
         res = await search_media(
-            query=q or "",
+            query=query,
             filters=filter_str,
             limit=limit,
             offset=offset
         )
         hits = getattr(res, 'hits', [])
-        return hits
\ No newline at end of file
+        cls._cache.set(key, hits)
+        return hits
+
+    @staticmethod
+    async def hydrate(hits: List[Dict[str, Any]], session: AsyncSession) -> List[Dict[str, Any]]:
+        """
+        검색 결과의 id 로 현재 DB 의 Media 와 관계를 한 번에 읽어 Meili 랭킹 순서대로 돌려줍니다.
+        인덱스에는 남아 있지만 DB 에서 사라진 항목은 제외됩니다.
+        """
+        ids = [int(hit["id"]) for hit in hits if hit.get("id") is not None]
+        medias = await SearchIndexService.load_medias(ids, session)
+        return [MediaReadWithRelations.model_validate(m).model_dump(mode="json") for m in medias]
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        return {**cls._cache.stats(), "generation": media_generation()}
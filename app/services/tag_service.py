@@ -1,22 +1,29 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import HTTPException
-from sqlmodel import select
+from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.media import Media
+from app.models.media import Media, MediaTag
 from app.models.tag import Tag
+from app.repositories.media_repository import apply_media_filters
+from app.repositories.search_outbox_repository import SearchOutboxRepository
+from utils.app_utils import now_kst
 
 
 class TagService:
 
     @classmethod
-    async def add_tag(cls, name: str, session: AsyncSession) -> Tag:
+    async def add_tag(cls, name: str, session: AsyncSession, commit: bool = True) -> Tag:
         existing = await session.scalar(select(Tag).where(Tag.name == name))
         if existing:
             raise HTTPException(status_code=409, detail=f"이미 존재하는 태그입니다: {name}")
         
         tag = Tag(name=name)
         session.add(tag)
+        if not commit:
+            await session.flush()
+            return tag
         await session.commit()
         await session.refresh(tag)
         return tag
@@ -32,12 +39,12 @@ class TagService:
         return tag
     
     @classmethod
-    async def get_or_create(cls, name: str, session: AsyncSession) -> Tag:
+    async def get_or_create(cls, name: str, session: AsyncSession, commit: bool = True) -> Tag:
         try:
             return await cls.get_tag_by_name(name, session)
         except HTTPException as e:
             if e.status_code == 404:
-                return await cls.add_tag(name, session)
+                return await cls.add_tag(name, session, commit=commit)
             raise
     
     @classmethod
@@ -48,7 +55,15 @@ class TagService:
     @classmethod
     async def delete_tag(cls, name: str, session: AsyncSession) -> None:
         tag = await cls.get_tag_by_name(name, session)
+        media_ids = (await session.exec(
+            select(MediaTag.media_id).where(MediaTag.tag_id == tag.id)
+        )).all()
         await session.delete(tag)
+        if media_ids:
+            await session.exec(
+                update(Media).where(Media.id.in_(media_ids)).values(updated_at=now_kst())
+            )
+        SearchOutboxRepository(session).enqueue(media_ids)
         await session.commit()
     
     @classmethod
@@ -62,6 +77,8 @@ class TagService:
             if tag not in media.tags:
                 media.tags.append(tag)
         
+        media.updated_at = now_kst()
+        SearchOutboxRepository(session).enqueue([media_id])
         await session.commit()
         await session.refresh(media)
         return media
@@ -80,14 +97,38 @@ class TagService:
             except HTTPException:
                 continue  # 태그가 없으면 무시
         
+        media.updated_at = now_kst()
+        SearchOutboxRepository(session).enqueue([media_id])
         await session.commit()
         await session.refresh(media)
         return media
     
     @classmethod
-    async def get_media_by_tag(cls, tag_name: str, session: AsyncSession) -> List[Media]:
+    async def get_media_by_tag(
+        cls,
+        tag_name: str,
+        session: AsyncSession,
+        cursor: Optional[int] = None,
+        limit: int = 30,
+        owner_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[Media]:
+        """
+        태그가 붙은 미디어를 id 순으로 cursor 다음부터 limit 개 가져옵니다.
+        media_tag 의 (tag_id, media_id) 인덱스 순서로 읽습니다.
+        """
         tag = await cls.get_tag_by_name(tag_name, session)
-        return tag.media
+        stmt = (
+            select(Media)
+            .join(MediaTag, MediaTag.media_id == Media.id)
+            .where(MediaTag.tag_id == tag.id)
+        )
+        if cursor is not None:
+            stmt = stmt.where(MediaTag.media_id > cursor)
+        stmt = apply_media_filters(stmt, owner_id, created_from, created_to)
+        result = await session.exec(stmt.order_by(MediaTag.media_id).limit(limit))
+        return result.all()
     
     @classmethod
     async def add_tags_to_multiple_media(
@@ -130,8 +171,10 @@ class TagService:
             for tag in tags:
                 if tag not in media.tags:
                     media.tags.append(tag)
+            media.updated_at = now_kst()
             updated_media.append(media)
         
+        SearchOutboxRepository(session).enqueue(media_ids)
         await session.commit()
         
         # 모든 미디어 새로고침
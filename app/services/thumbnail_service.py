@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+from app.models.media import Media
+from core.images import get_image_pipeline, get_thumbnail_cache
+
+# 렌더링 방식이 바뀌면 올려서 이전 캐시/ETag 를 무효화합니다.
+RENDER_VERSION = 1
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
+MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+
+class ThumbnailService:
+
+    @staticmethod
+    def source_path(media: Media) -> Path:
+        """
+        이미지 미디어는 원본을, 영상은 저장된 썸네일을 원본으로 사용합니다.
+        """
+        filepath = Path(media.filepath)
+        if filepath.suffix.lower() in IMAGE_EXTS and filepath.exists():
+            return filepath
+        if media.thumbnail_path and Path(media.thumbnail_path).exists():
+            return Path(media.thumbnail_path)
+        raise HTTPException(status_code=404, detail=f"썸네일을 만들 원본 이미지가 없습니다: {media.id}")
+
+    @classmethod
+    def cache_key(
+        cls, media: Media, source: Path, width: Optional[int], height: Optional[int], fmt: str
+    ) -> str:
+        # 원본 내용이 같으면 같은 key 가 되도록 sha256 을 우선 사용합니다.
+        if media.sha256 and source == Path(media.filepath):
+            identity = media.sha256
+        else:
+            st = source.stat()
+            identity = f"{source.resolve()}:{st.st_mtime_ns}:{st.st_size}"
+        raw = f"v{RENDER_VERSION}|{identity}|{width or ''}x{height or ''}|{fmt}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @classmethod
+    async def resolve(
+        cls, media: Media, width: Optional[int], height: Optional[int], fmt: str
+    ) -> Tuple[Path, str]:
+        """
+        원본 경로와 캐시 key 를 반환합니다. 파일 확인(exists/stat)은 이벤트 루프를 막지 않도록 스레드에서 합니다.
+        """
+        def _resolve() -> Tuple[Path, str]:
+            source = cls.source_path(media)
+            return source, cls.cache_key(media, source, width, height, fmt)
+
+        return await asyncio.to_thread(_resolve)
+
+    @staticmethod
+    def etag(key: str) -> str:
+        """
+        렌더링 없이 계산할 수 있는 강한 ETag. 원본과 옵션이 같으면 결과 파일도 같습니다.
+        """
+        return f'"{key}"'
+
+    @classmethod
+    async def get_thumbnail(
+        cls, media: Media, source: Path, key: str, width: Optional[int], height: Optional[int], fmt: str
+    ) -> Path:
+        """
+        resolve() 로 얻은 원본과 key 의 캐시된 썸네일 경로를 반환합니다. 같은 썸네일을 동시에 요청하면 렌더링은 한 번만 합니다.
+        """
+        async def _render(dst: Path) -> bool:
+            return await get_image_pipeline().resize(
+                source, dst, width=width, height=height, fmt=fmt
+            )
+
+        path = await get_thumbnail_cache().get_or_create(key, f".{fmt}", _render)
+        if path is None:
+            raise HTTPException(status_code=422, detail=f"이미지를 변환할 수 없습니다: {media.id}")
+        return path
@@ -1,10 +1,13 @@
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.urls import Url
+from app.repositories.url_repository import UrlRepository
 from app.services.abstract_media_service import AbstractMediaService
+from app.services.probe_service import CachingExtractor
 from core.exception import DuplicateUrlError
 from core.config import Settings
+from core.http import get_http_client
+from core.images import get_image_pipeline
+from core.ratelimit import get_limiter
 from downloader.interfaces import DownloadResult
 from downloader.generic import GenericDownloader
 
@@ -15,22 +18,23 @@ class YoutubeService(AbstractMediaService):
     
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
-        self.downloader = GenericDownloader(platform=self.PLATFORM_NAME, root_dir=Settings().base_dir, extractor=None)
+        self.downloader = GenericDownloader(
+            platform=self.PLATFORM_NAME,
+            root_dir=Settings().base_dir,
+            extractor=CachingExtractor(self.PLATFORM_NAME),
+            limiter=get_limiter(self.PLATFORM_NAME),
+            image_pipeline=get_image_pipeline(),
+            http_client=get_http_client(),
+        )
         
         
     async def _get_or_create_url(self, url):
-        result = (await self.session.exec(
-            select(Url).where(Url.url == url)
-        )).first()
-        
-        if result:
+        repo = UrlRepository(self.session)
+        if await repo.find(url):
             raise DuplicateUrlError(url)
         
-        url_obj = Url(url=url)
-        self.session.add(url_obj)
-        await self.session.flush()
-        return url_obj
+        return await repo.add(url)
     
-    async def _download(self, url) -> DownloadResult:
-        return await self.downloader.download(url)
+    async def _download(self, url, progress=None) -> DownloadResult:
+        return await self.downloader.download(url, progress=progress)
         
\ No newline at end of file
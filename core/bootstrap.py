@@ -1,14 +1,23 @@
-import httpx
-
 from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
 from fastapi import FastAPI
 from pathlib import Path
 
+from app.repositories.url_repository import UrlRepository
 from app.routers import ALL_ROUTERS
+from app.services.registry import SERVICE_BY_PLATFORM
 from core import settings
-from core.database import init_db
-from utils.domain_extractor import DomainExtractor
+from core.canonical import get_canonicalizer
+from core.database import AsyncSessionLocal, init_db
+from core.http import close_http_client, get_http_client
+from core.images import shutdown_image_pipeline
+from core.instagram import close_instaloader_pool
+from core.meili import close_meili, init_meili
+from core.profile_sync import ProfileSyncScheduler
+from core.progress import ProgressBroker
+from core.search_sync import SearchOutboxFlusher
+from core.tasks import DownloadWorkerPool
+from core.unit_of_work import unit_of_work
 
 
 _static_method = False
@@ -21,9 +30,14 @@ async def bootstrap(app: FastAPI):
     global _static_method, _routers_registed, _extractor_created
     
     await init_db()
+    await init_meili()
+    
+    async with AsyncSessionLocal() as session:
+        async with unit_of_work(session):
+            await UrlRepository(session).backfill_canonical()
     
     if not _extractor_created:
-        app.state.tld_extractor = DomainExtractor(settings.base_dir)
+        app.state.tld_extractor = get_canonicalizer().extractor
         _extractor_created = True
     
     if not _static_method:
@@ -38,4 +52,52 @@ async def bootstrap(app: FastAPI):
             app.include_router(rt)
         _routers_registed = True
     
-    yield
+    get_http_client()
+    
+    progress_broker = ProgressBroker(persist_interval=settings.download_progress_persist_interval)
+    download_pool = DownloadWorkerPool(
+        SERVICE_BY_PLATFORM,
+        concurrency=settings.download_concurrency,
+        poll_interval=settings.download_poll_interval,
+        broker=progress_broker,
+        lease_seconds=settings.download_lease_seconds,
+        heartbeat_interval=settings.download_heartbeat_interval,
+        max_attempts=settings.download_max_attempts,
+    )
+    # 내장 워커를 끄면 pool 은 notify() 만 받고 작업은 별도 워커 프로세스가 실행합니다.
+    if settings.download_embedded_workers:
+        await progress_broker.start()
+        await download_pool.start()
+    app.state.progress_broker = progress_broker
+    app.state.download_pool = download_pool
+    
+    search_flusher = SearchOutboxFlusher(
+        interval=settings.search_sync_interval_ms / 1000,
+        batch_size=settings.search_sync_batch_size,
+        retention=settings.search_outbox_retention,
+    )
+    await search_flusher.start()
+    
+    profile_sync = None
+    if settings.instagram_sync_interval > 0:
+        profile_sync = ProfileSyncScheduler(
+            download_pool,
+            sync_interval=settings.instagram_sync_interval,
+            check_interval=settings.instagram_sync_check_interval,
+            batch_size=settings.instagram_sync_batch_size,
+            priority=settings.instagram_sync_priority,
+        )
+        await profile_sync.start()
+    
+    try:
+        yield
+    finally:
+        if profile_sync is not None:
+            await profile_sync.stop()
+        await download_pool.stop()
+        await progress_broker.stop()
+        await search_flusher.stop()
+        await close_meili()
+        await close_http_client()
+        shutdown_image_pipeline()
+        close_instaloader_pool()
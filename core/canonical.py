@@ -0,0 +1,17 @@
+from functools import lru_cache
+
+from core import settings
+from utils.domain_extractor import DomainExtractor
+from utils.url_canonicalizer import UrlCanonicalizer
+
+
+@lru_cache(maxsize=1)
+def get_canonicalizer() -> UrlCanonicalizer:
+    return UrlCanonicalizer(DomainExtractor(settings.base_dir))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL 중복 검사에 사용하는 canonical key 를 반환합니다.
+    """
+    return get_canonicalizer().canonicalize(url)
@@ -1,12 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
-from pydantic import Field, model_validator
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Literal, ClassVar, Optional
+from typing import Dict, List, Literal, ClassVar, Optional
 from sqlalchemy.engine import URL
+from utils.image_profiles import DEFAULT_PROFILES as DEFAULT_IMAGE_PROFILES, ImageProfile
 import os
 
+class PlatformLimit(BaseModel):
+    """플랫폼별 외부 요청 제한 설정"""
+    concurrency: int = Field(default=2, ge=1)
+    rate: float = Field(default=30, gt=0)
+    window: float = Field(default=60.0, gt=0)
+    max_backoff: float = Field(default=600.0, gt=0)
+    max_retries: int = Field(default=2, ge=0)
+
+
 class _Default:
     DB_TYPE: Literal["sqlite", "postgresql"] = "sqlite"
     DEBUG: bool = True
@@ -24,6 +34,53 @@ class _Default:
     DOWNLOAD_DIR = BASE_DIR / "downloads"
     LOCAL_DIR = "local"
     
+    DOWNLOAD_CONCURRENCY = 2
+    DOWNLOAD_POLL_INTERVAL = 5.0
+    DOWNLOAD_EMBEDDED_WORKERS = True
+    DOWNLOAD_LEASE_SECONDS = 60.0
+    DOWNLOAD_MAX_ATTEMPTS = 3
+    DOWNLOAD_PROGRESS_PERSIST_INTERVAL = 1.0
+    
+    SEARCH_SYNC_INTERVAL_MS = 500
+    SEARCH_SYNC_BATCH_SIZE = 500
+    SEARCH_OUTBOX_RETENTION = 86400.0
+    
+    SEARCH_CACHE_SIZE = 1024
+    SEARCH_CACHE_TTL = 30.0
+    
+    IMAGE_WORKERS = min(4, os.cpu_count() or 1)
+    IMAGE_PROFILES = DEFAULT_IMAGE_PROFILES
+    
+    PROBE_CACHE_TTL = 1800.0
+    
+    HTTP_HTTP2 = True
+    HTTP_TIMEOUT = 10.0
+    HTTP_MAX_CONNECTIONS = 100
+    HTTP_MAX_KEEPALIVE = 20
+    HTTP_KEEPALIVE_EXPIRY = 30.0
+    
+    INSTAGRAM_SESSIONS: List[str] = []
+    INSTAGRAM_SESSION_DIR = BASE_DIR / "sessions" / "instagram"
+    INSTAGRAM_ANONYMOUS_SESSIONS = 1
+    INSTAGRAM_SESSION_COOLDOWN = 300.0
+    INSTAGRAM_SESSION_MAX_COOLDOWN = 3600.0
+    
+    INSTAGRAM_ITEM_CONCURRENCY = 4
+    
+    INSTAGRAM_SYNC_INTERVAL = 6 * 60 * 60.0
+    INSTAGRAM_SYNC_CHECK_INTERVAL = 60.0
+    INSTAGRAM_SYNC_BATCH_SIZE = 50
+    INSTAGRAM_SYNC_PRIORITY = -10
+    
+    THUMB_CACHE_DIR = BASE_DIR / "cache" / "thumbs"
+    THUMB_CACHE_MAX_BYTES = 512 * 1024 * 1024
+    THUMB_MAX_DIMENSION = 2048
+    
+    PLATFORM_LIMITS = {
+        "instagram": PlatformLimit(concurrency=1, rate=20, window=60),
+        "youtube": PlatformLimit(concurrency=3, rate=60, window=60),
+    }
+    
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file = ".env", env_file_encoding="utf-8", extra="ignore")
@@ -47,12 +104,102 @@ class Settings(BaseSettings):
             os.getenv("DOWNLOAD_DIR", _Default.DOWNLOAD_DIR)))
     local_dir: Optional[Path] = None
     
+    download_concurrency: int = Field(default=_Default.DOWNLOAD_CONCURRENCY, alias="DOWNLOAD_CONCURRENCY")
+    download_poll_interval: float = Field(default=_Default.DOWNLOAD_POLL_INTERVAL, alias="DOWNLOAD_POLL_INTERVAL")
+    # False 면 API 는 작업을 예약만 하고, 실행은 python -m app.commands.worker 가 맡습니다.
+    download_embedded_workers: bool = Field(default=_Default.DOWNLOAD_EMBEDDED_WORKERS, alias="DOWNLOAD_EMBEDDED_WORKERS")
+    # 워커가 작업을 임대하는 시간(초). heartbeat 로 연장하지 못하면 다른 워커가 다시 가져갑니다.
+    download_lease_seconds: float = Field(default=_Default.DOWNLOAD_LEASE_SECONDS, gt=0, alias="DOWNLOAD_LEASE_SECONDS")
+    # 비워 두면 임대 시간의 1/4 로 정합니다. 직접 지정하면 임대 시간보다 짧아야 합니다.
+    download_heartbeat_interval: Optional[float] = Field(default=None, gt=0, alias="DOWNLOAD_HEARTBEAT_INTERVAL")
+    # 임대 만료로 이 횟수만큼 실행된 작업은 다시 넣지 않고 실패 처리합니다.
+    download_max_attempts: int = Field(default=_Default.DOWNLOAD_MAX_ATTEMPTS, ge=1, alias="DOWNLOAD_MAX_ATTEMPTS")
+    # 진행 상황을 DB 에 저장하는 주기(초). 0 이면 저장하지 않습니다.
+    download_progress_persist_interval: float = Field(
+        default=_Default.DOWNLOAD_PROGRESS_PERSIST_INTERVAL, ge=0, alias="DOWNLOAD_PROGRESS_PERSIST_INTERVAL")
+    
+    search_sync_interval_ms: int = Field(default=_Default.SEARCH_SYNC_INTERVAL_MS, alias="SEARCH_SYNC_INTERVAL_MS")
+    search_sync_batch_size: int = Field(default=_Default.SEARCH_SYNC_BATCH_SIZE, alias="SEARCH_SYNC_BATCH_SIZE")
+    # 반영한 outbox 행을 남겨 두는 시간(초). 재색인은 이 시간 안에 끝나야 도중의 변경을 모두 다시 반영합니다.
+    search_outbox_retention: float = Field(
+        default=_Default.SEARCH_OUTBOX_RETENTION, gt=0, alias="SEARCH_OUTBOX_RETENTION")
+    
+    # 0 이면 검색 결과 캐시를 사용하지 않습니다.
+    search_cache_size: int = Field(default=_Default.SEARCH_CACHE_SIZE, alias="SEARCH_CACHE_SIZE")
+    search_cache_ttl: float = Field(default=_Default.SEARCH_CACHE_TTL, alias="SEARCH_CACHE_TTL")
+    
+    # 0 이면 프로세스 풀 없이 스레드에서 변환합니다.
+    image_workers: int = Field(default=_Default.IMAGE_WORKERS, ge=0, alias="IMAGE_WORKERS")
+    # 지정하지 않은 프로필은 기본값을 유지합니다.
+    # 예: IMAGE_PROFILES='{"media": {"quality": 85, "method": 4}, "thumbnail": {"quality": 75, "max_dimension": 480}}'
+    image_profiles: Dict[str, ImageProfile] = Field(
+        default_factory=lambda: dict(_Default.IMAGE_PROFILES), alias="IMAGE_PROFILES")
+    
+    # yt-dlp 포맷 URL 은 서명 만료가 있으므로 수 시간보다 짧게 유지합니다.
+    probe_cache_ttl: float = Field(default=_Default.PROBE_CACHE_TTL, gt=0, alias="PROBE_CACHE_TTL")
+    
+    http_http2: bool = Field(default=_Default.HTTP_HTTP2, alias="HTTP_HTTP2")
+    http_timeout: float = Field(default=_Default.HTTP_TIMEOUT, gt=0, alias="HTTP_TIMEOUT")
+    http_max_connections: int = Field(default=_Default.HTTP_MAX_CONNECTIONS, ge=1, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive: int = Field(default=_Default.HTTP_MAX_KEEPALIVE, ge=0, alias="HTTP_MAX_KEEPALIVE")
+    http_keepalive_expiry: float = Field(default=_Default.HTTP_KEEPALIVE_EXPIRY, ge=0, alias="HTTP_KEEPALIVE_EXPIRY")
+    
+    # 로그인 세션 사용자 이름 목록. 세션 파일은 INSTAGRAM_SESSION_DIR/<username> 에 둡니다.
+    # 예: INSTAGRAM_SESSIONS='["account_a", "account_b"]'
+    # 세션 수만큼 동시에 받으려면 PLATFORM_LIMITS 의 instagram concurrency 도 함께 올립니다.
+    instagram_sessions: List[str] = Field(
+        default_factory=lambda: list(_Default.INSTAGRAM_SESSIONS), alias="INSTAGRAM_SESSIONS")
+    instagram_session_dir: Path = Field(default=_Default.INSTAGRAM_SESSION_DIR, alias="INSTAGRAM_SESSION_DIR")
+    # 로그인 세션이 없을 때 만들 익명 세션 수
+    instagram_anonymous_sessions: int = Field(
+        default=_Default.INSTAGRAM_ANONYMOUS_SESSIONS, ge=1, alias="INSTAGRAM_ANONYMOUS_SESSIONS")
+    instagram_session_cooldown: float = Field(
+        default=_Default.INSTAGRAM_SESSION_COOLDOWN, gt=0, alias="INSTAGRAM_SESSION_COOLDOWN")
+    instagram_session_max_cooldown: float = Field(
+        default=_Default.INSTAGRAM_SESSION_MAX_COOLDOWN, gt=0, alias="INSTAGRAM_SESSION_MAX_COOLDOWN")
+    
+    # 한 작업에서 동시에 받는 게시물 파일(캐러셀 항목) 수
+    instagram_item_concurrency: int = Field(
+        default=_Default.INSTAGRAM_ITEM_CONCURRENCY, ge=1, alias="INSTAGRAM_ITEM_CONCURRENCY")
+    
+    # 팔로우한 프로필을 다시 동기화하는 주기(초). 0 이면 스케줄러를 실행하지 않습니다.
+    instagram_sync_interval: float = Field(
+        default=_Default.INSTAGRAM_SYNC_INTERVAL, ge=0, alias="INSTAGRAM_SYNC_INTERVAL")
+    instagram_sync_check_interval: float = Field(
+        default=_Default.INSTAGRAM_SYNC_CHECK_INTERVAL, gt=0, alias="INSTAGRAM_SYNC_CHECK_INTERVAL")
+    instagram_sync_batch_size: int = Field(
+        default=_Default.INSTAGRAM_SYNC_BATCH_SIZE, ge=1, alias="INSTAGRAM_SYNC_BATCH_SIZE")
+    # 사용자가 직접 요청한 다운로드보다 뒤에 실행되도록 낮게 둡니다.
+    instagram_sync_priority: int = Field(default=_Default.INSTAGRAM_SYNC_PRIORITY, alias="INSTAGRAM_SYNC_PRIORITY")
+    
+    thumb_cache_dir: Path = Field(default=_Default.THUMB_CACHE_DIR, alias="THUMB_CACHE_DIR")
+    thumb_cache_max_bytes: int = Field(default=_Default.THUMB_CACHE_MAX_BYTES, gt=0, alias="THUMB_CACHE_MAX_BYTES")
+    thumb_max_dimension: int = Field(default=_Default.THUMB_MAX_DIMENSION, gt=0, alias="THUMB_MAX_DIMENSION")
+    
+    # 예: PLATFORM_LIMITS='{"instagram": {"concurrency": 1, "rate": 10, "window": 60}}'
+    platform_limits: Dict[str, PlatformLimit] = Field(
+        default_factory=lambda: dict(_Default.PLATFORM_LIMITS), alias="PLATFORM_LIMITS")
+    default_platform_limit: PlatformLimit = Field(
+        default_factory=PlatformLimit, alias="DEFAULT_PLATFORM_LIMIT")
+    
     @model_validator(mode="after")
     def _populate_subdir(self):
         self.local_dir = self.local_dir or self.download_dir / _Default.LOCAL_DIR
         
         return self
     
+    @model_validator(mode="after")
+    def _check_download_lease(self):
+        if self.download_heartbeat_interval is None:
+            self.download_heartbeat_interval = self.download_lease_seconds / 4
+        elif self.download_heartbeat_interval >= self.download_lease_seconds:
+            raise ValueError(
+                "DOWNLOAD_HEARTBEAT_INTERVAL 은 DOWNLOAD_LEASE_SECONDS 보다 짧아야 합니다: "
+                f"{self.download_heartbeat_interval} >= {self.download_lease_seconds}"
+            )
+        
+        return self
+    
     @property
     def database_url(self) -> str:
         if self.database_type == 'sqlite':
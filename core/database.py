@@ -1,7 +1,9 @@
+import importlib, pkgutil
 from typing import AsyncGenerator
 from sqlmodel import SQLModel
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from core import settings
+from core.migrations import run_migrations
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 DATABASE_URL = settings.database_url
@@ -17,9 +19,22 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+def load_models() -> None:
+    """
+    app.models 아래의 모든 테이블 모델을 로드합니다.
+    관계 매핑과 create_all 은 모든 모델이 import 되어 있어야 동작합니다.
+    """
+    import app.models
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"{app.models.__name__}.{module.name}")
+
+
 async def init_db():
+    load_models()
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        # create_all 은 기존 테이블을 바꾸지 않으므로 빠진 컬럼/인덱스를 따로 추가합니다.
+        await conn.run_sync(run_migrations)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -4,7 +4,7 @@ class DuplicateUrlError(Exception):
     def __init__(self, url):
         msg = "이미 등록된 URL입니다."
         if url:
-            mag += f"{url}"
+            msg += f" {url}"
         super().__init__(msg)
     
 
@@ -12,4 +12,19 @@ class PlatformNotFoundError(Exception):
     """지정된 PLATFORM_NAME이 없을 경우"""
     
     def __init__(self, platform_name: str):
-        super().__init__(f"플랫폼 '{platform_name}'가 DB에 없습니다.")
\ No newline at end of file
+        super().__init__(f"플랫폼 '{platform_name}'가 DB에 없습니다.")
+
+
+class DownloadCancelledError(Exception):
+    """실행 중인 다운로드 작업이 취소되었을 경우 (임대를 잃었거나 워커가 종료됨)"""
+    
+    def __init__(self, job_id: int):
+        super().__init__(f"다운로드 작업 {job_id} 이(가) 취소되었습니다.")
+
+
+class SearchIndexWriteError(Exception):
+    """Meilisearch 가 쓰기 작업을 처리하지 못했거나 제한 시간 안에 끝내지 못했을 경우"""
+    
+    def __init__(self, task_uid: int, reason: str):
+        self.task_uid = task_uid
+        super().__init__(f"Meilisearch 작업 {task_uid} 을(를) 반영하지 못했습니다: {reason}")
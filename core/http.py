@@ -0,0 +1,33 @@
+import httpx
+from typing import Optional
+
+from core import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    다운로더가 썸네일/메타데이터를 받을 때 공유하는 httpx 클라이언트를 반환합니다.
+    커넥션 풀과 HTTP/2 연결을 재사용하므로 close_http_client() 로 닫아야 합니다.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=settings.http_http2,
+            timeout=settings.http_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
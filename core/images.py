@@ -0,0 +1,41 @@
+from typing import Optional
+
+from core import settings
+from utils.disk_cache import DiskLRUCache
+from utils.image_pipeline import ImagePipeline
+
+_pipeline: Optional[ImagePipeline] = None
+_thumbnail_cache: Optional[DiskLRUCache] = None
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """
+    앱 전역에서 공유하는 ImagePipeline 을 반환합니다. 워커 프로세스는 첫 변환 때 생성됩니다.
+    """
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ImagePipeline(
+            workers=settings.image_workers,
+            profiles=settings.image_profiles,
+        )
+    return _pipeline
+
+
+def get_thumbnail_cache() -> DiskLRUCache:
+    """
+    리사이즈한 썸네일을 보관하는 디스크 캐시. 용량은 THUMB_CACHE_MAX_BYTES 로 제한됩니다.
+    """
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = DiskLRUCache(
+            settings.thumb_cache_dir,
+            max_bytes=settings.thumb_cache_max_bytes,
+        )
+    return _thumbnail_cache
+
+
+def shutdown_image_pipeline() -> None:
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.shutdown()
+    _pipeline = None
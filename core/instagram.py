@@ -0,0 +1,30 @@
+from typing import Optional
+
+from core import settings
+from downloader.plugins.instagram_sessions import InstaloaderSessionPool
+
+_pool: Optional[InstaloaderSessionPool] = None
+
+
+def get_instaloader_pool() -> InstaloaderSessionPool:
+    """
+    Instagram 다운로드 작업이 공유하는 Instaloader 세션 풀을 반환합니다.
+    로그인 세션은 INSTAGRAM_SESSIONS 와 INSTAGRAM_SESSION_DIR 의 세션 파일로 구성됩니다.
+    """
+    global _pool
+    if _pool is None:
+        _pool = InstaloaderSessionPool(
+            usernames=settings.instagram_sessions,
+            session_dir=settings.instagram_session_dir,
+            anonymous=settings.instagram_anonymous_sessions,
+            cooldown=settings.instagram_session_cooldown,
+            max_cooldown=settings.instagram_session_max_cooldown,
+        )
+    return _pool
+
+
+def close_instaloader_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+    _pool = None
@@ -1,35 +1,122 @@
+import logging
 from meilisearch_python_async import Client
-from typing import Any, Dict, List, Union
+from meilisearch_python_async.errors import MeilisearchTimeoutError
+from meilisearch_python_async.index import Index
+from meilisearch_python_async.models.task import TaskInfo
+from meilisearch_python_async.task import wait_for_task
+from typing import Any, Awaitable, Dict, List, Optional, Union
 
-from core.config import Settings
+from core import settings
+from core.exception import SearchIndexWriteError
 
-settings = Settings()
-
-client = Client(settings.meili_url, settings.meili_key)
+logger = logging.getLogger(__name__)
 
 MEDIA_INDEX_NAME = "media"
 MEDIA_PRIMARY_KEY = 'id'
+MEDIA_SEARCHABLE_ATTRIBUTES = ["title", "filename", "platform", "tags.name", "owner_name"]
+MEDIA_FILTERABLE_ATTRIBUTES = ["platform", "owner_id"]
+# 쓰기 작업이 처리되기를 기다리는 최대 시간(ms)
+MEDIA_TASK_TIMEOUT_MS = 30_000
+
+_client: Optional[Client] = None
+_media_index: Optional[Index] = None
+_media_generation = 0
+
+
+def get_client() -> Client:
+    """
+    앱 전역에서 공유하는 Meilisearch Client 를 반환합니다.
+    Client 는 내부 httpx 커넥션 풀을 유지하므로 close_meili() 로 닫아야 합니다.
+    """
+    global _client
+    if _client is None:
+        _client = Client(settings.meili_url, settings.meili_key)
+    return _client
+
+
+async def configure_media_index(uid: str = MEDIA_INDEX_NAME) -> Index:
+    """
+    인덱스를 만들고 검색/필터 속성을 적용합니다. 이미 같은 설정이면 갱신하지 않습니다.
+    """
+    index = await get_client().get_or_create_index(uid, primary_key=MEDIA_PRIMARY_KEY)
+    current = await index.get_settings()
+    if current.searchable_attributes != MEDIA_SEARCHABLE_ATTRIBUTES:
+        await index.update_searchable_attributes(MEDIA_SEARCHABLE_ATTRIBUTES)
+    if sorted(current.filterable_attributes or []) != sorted(MEDIA_FILTERABLE_ATTRIBUTES):
+        await index.update_filterable_attributes(MEDIA_FILTERABLE_ATTRIBUTES)
+    return index
+
 
-async def ensure_media_index() -> Any:
-    
+async def init_meili() -> None:
+    """
+    lifespan 시작 시 한 번 호출해 media 인덱스를 준비하고 핸들을 캐시합니다.
+    """
+    global _media_index
     try:
-        index = await client.get_index(MEDIA_INDEX_NAME)
+        _media_index = await configure_media_index()
     except Exception:
-        index = await client.create_index(uid=MEDIA_INDEX_NAME, primary_key=MEDIA_PRIMARY_KEY)
-    await index.update_searchable_attributes(["title", "filename", "platform", "tags.name", "owner_name"])
-    await index.update_filterable_attributes(["platform", "owner_id"])
-    
-    return index
+        logger.warning("Meilisearch 인덱스를 준비하지 못했습니다. 검색 요청 시 다시 시도합니다.", exc_info=True)
+
+
+async def close_meili() -> None:
+    global _client, _media_index
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _media_index = None
+
 
+def get_media_index() -> Index:
+    """
+    캐시된 media 인덱스 핸들을 반환합니다. (HTTP 호출 없음)
+    """
+    global _media_index
+    if _media_index is None:
+        _media_index = get_client().index(MEDIA_INDEX_NAME)
+    return _media_index
 
-async def index_media(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
-    index = await ensure_media_index()
-    return await index.add_documents(documents)
 
+def media_generation() -> int:
+    """
+    이 프로세스에서 media 인덱스에 보낸 쓰기가 처리될 때마다 1씩 증가하는 값. 검색 결과 캐시 무효화에 사용합니다.
+    """
+    return _media_generation
 
-async def delete_media(document_id: Union[int, str]) -> Dict[str, Any]:
-    index = await ensure_media_index()
-    return await index.delete_document(document_id)
+
+def _bump_media_generation() -> None:
+    global _media_generation
+    _media_generation += 1
+
+
+async def _apply_media_write(write: Awaitable[TaskInfo]) -> TaskInfo:
+    """
+    쓰기 작업을 보내고 Meilisearch 가 처리할 때까지 기다린 뒤 세대를 올립니다.
+    작업이 접수만 된 시점에 올리면, 처리 전에 들어온 검색이 이전 결과를 새 세대로 캐시합니다.
+    작업이 실패했거나 제한 시간 안에 끝나지 않으면 SearchIndexWriteError 를 올려, 호출한 쪽이 다시 시도하게 합니다.
+    """
+    try:
+        task = await write
+        try:
+            result = await wait_for_task(get_client(), task.task_uid, timeout_in_ms=MEDIA_TASK_TIMEOUT_MS)
+        except MeilisearchTimeoutError as e:
+            raise SearchIndexWriteError(task.task_uid, f"{MEDIA_TASK_TIMEOUT_MS}ms 안에 끝나지 않았습니다.") from e
+        if result.status != "succeeded":
+            raise SearchIndexWriteError(task.task_uid, f"status={result.status}, error={result.error}")
+        return task
+    finally:
+        _bump_media_generation()
+
+
+async def index_media(documents: List[Dict[str, Any]]) -> TaskInfo:
+    return await _apply_media_write(get_media_index().add_documents(documents))
+
+
+async def delete_media(document_id: Union[int, str]) -> TaskInfo:
+    return await _apply_media_write(get_media_index().delete_document(str(document_id)))
+
+
+async def delete_media_documents(document_ids: List[Union[int, str]]) -> TaskInfo:
+    return await _apply_media_write(get_media_index().delete_documents([str(i) for i in document_ids]))
 
 
 async def search_media(
@@ -38,14 +125,10 @@ async def search_media(
     limit: int = 20,
     offset: int = 0
 ) -> Dict[str, Any]:
-    
-    await ensure_media_index()
-    
-    index = await client.get_index(MEDIA_INDEX_NAME)
-    
-    return await index.search(
+
+    return await get_media_index().search(
         query=query or "",
         filter=filters or None,
         limit=limit,
         offset=offset
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,114 @@
+"""
+기존 DB 스키마 마이그레이션.
+
+create_all 은 없는 테이블만 만들고, 이미 있는 테이블에는 새 컬럼이나 인덱스를 추가하지 않습니다.
+init_db 가 create_all 뒤에 run_migrations 를 실행해 기존 DB 에 빠진 컬럼과 인덱스를 채웁니다.
+모든 단계는 현재 스키마를 확인한 뒤 실행하므로 여러 번 실행해도 안전합니다.
+컬럼 타입과 인덱스 정의는 모델에서 가져오며, 새 컬럼/인덱스를 모델에 추가하면 여기에도 추가합니다.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Index, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+from sqlmodel import SQLModel
+
+logger = logging.getLogger(__name__)
+
+# (테이블, 컬럼, 기존 행에 채울 기본값 SQL). 기본값이 있으면 NOT NULL 로 추가합니다.
+ADD_COLUMNS: List[Tuple[str, str, Optional[str]]] = [
+    ("media", "sha256", None),
+    ("url", "canonical", None),
+    ("media", "source_id", None),
+    ("profile", "followed", "false"),
+    ("download_job", "progress", None),
+    ("download_job", "worker_id", None),
+    ("download_job", "lease_expires_at", None),
+    ("search_outbox", "processed_at", None),
+]
+
+# (테이블, 컬럼). 예전 스키마에서 NOT NULL 이던 컬럼의 제약을 풉니다.
+DROP_NOT_NULL: List[Tuple[str, str]] = [
+    # 처음 만든 프로필은 아직 동기화하지 않아 last_update 가 비어 있습니다.
+    ("profile", "last_update"),
+]
+
+# (테이블, 인덱스 이름). 모델에 정의된 인덱스를 없을 때만 만듭니다.
+ADD_INDEXES: List[Tuple[str, str]] = [
+    ("media", "ix_media_sha256"),
+    # 기존 행은 canonical 이 NULL 이므로 unique 인덱스를 바로 만들 수 있고, 값은 시작 시 backfill 이 채웁니다.
+    ("url", "ix_url_canonical"),
+    ("media", "ix_media_owner_source"),
+    ("profile", "ix_profile_followed"),
+    ("download_job", "ix_download_job_worker_id"),
+    ("download_job", "ix_download_job_lease"),
+    ("media", "ix_media_platform_cursor"),
+    ("media_tag", "ix_media_tag_tag_media"),
+    ("media", "ix_media_updated_at"),
+    ("search_outbox", "ix_search_outbox_processed_at"),
+]
+
+
+def run_migrations(conn: Connection) -> None:
+    inspector = inspect(conn)
+
+    for table, column, default in ADD_COLUMNS:
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column not in existing:
+            _add_column(conn, table, column, default)
+
+    for table, column in DROP_NOT_NULL:
+        columns = {c["name"]: c for c in inspect(conn).get_columns(table)}
+        if not columns[column]["nullable"]:
+            _drop_not_null(conn, table, column)
+
+    inspector = inspect(conn)
+    for table, name in ADD_INDEXES:
+        existing = {i["name"] for i in inspector.get_indexes(table)}
+        if name not in existing:
+            logger.info("인덱스 추가: %s.%s", table, name)
+            _model_index(table, name).create(conn)
+
+
+def _add_column(conn: Connection, table: str, column: str, default: Optional[str]) -> None:
+    col = SQLModel.metadata.tables[table].c[column]
+    quote = conn.dialect.identifier_preparer.quote
+    ddl = f"ALTER TABLE {quote(table)} ADD COLUMN {quote(column)} {col.type.compile(dialect=conn.dialect)}"
+    if default is not None:
+        ddl += f" NOT NULL DEFAULT {default}"
+    logger.info("컬럼 추가: %s.%s", table, column)
+    conn.exec_driver_sql(ddl)
+
+
+def _drop_not_null(conn: Connection, table: str, column: str) -> None:
+    logger.info("NOT NULL 제거: %s.%s", table, column)
+    quote = conn.dialect.identifier_preparer.quote
+    if conn.dialect.name != "sqlite":
+        conn.exec_driver_sql(f"ALTER TABLE {quote(table)} ALTER COLUMN {quote(column)} DROP NOT NULL")
+        return
+
+    # SQLite 는 컬럼 제약을 바꿀 수 없어, 모델 정의로 새 테이블을 만들어 옮긴 뒤 이름을 바꿉니다.
+    model = SQLModel.metadata.tables[table]
+    rebuild = f"_{table}_rebuild"
+    create = str(CreateTable(model).compile(dialect=conn.dialect)).strip()
+    prefix = f"CREATE TABLE {quote(table)} ("
+    if not create.startswith(prefix):
+        raise RuntimeError(f"{table} 테이블을 다시 만들 수 없습니다: {create[:60]}")
+    conn.exec_driver_sql(f"CREATE TABLE {quote(rebuild)} (" + create[len(prefix):])
+
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    columns = ", ".join(quote(c.name) for c in model.columns if c.name in existing)
+    conn.exec_driver_sql(f"INSERT INTO {quote(rebuild)} ({columns}) SELECT {columns} FROM {quote(table)}")
+    conn.exec_driver_sql(f"DROP TABLE {quote(table)}")
+    conn.exec_driver_sql(f"ALTER TABLE {quote(rebuild)} RENAME TO {quote(table)}")
+    # 기존 인덱스는 테이블과 함께 지워졌으므로 모델의 인덱스를 다시 만듭니다.
+    for index in model.indexes:
+        index.create(conn)
+
+
+def _model_index(table: str, name: str) -> Index:
+    for index in SQLModel.metadata.tables[table].indexes:
+        if index.name == name:
+            return index
+    raise LookupError(f"모델에 정의되지 않은 인덱스입니다: {table}.{name}")
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.repositories.job_repository import DownloadJobRepository
+from app.repositories.profile_repository import ProfileRepository
+from app.services.instagram_service import InstagramService
+from core.canonical import canonicalize_url
+from core.database import AsyncSessionLocal
+from core.tasks import DownloadWorkerPool
+from core.unit_of_work import unit_of_work
+from utils.app_utils import now_kst
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileSyncScheduler:
+    """
+    팔로우 중인 Instagram 프로필을 sync_interval 마다 다시 동기화하도록 다운로드 작업을 예약합니다.
+
+    check_interval 초마다 last_update 가 sync_interval 보다 오래된 프로필을 batch_size 개씩 골라
+    낮은 우선순위로 예약합니다. 진행 중이거나 sync_interval 안에 이미 예약된 프로필은 건너뛰므로
+    실패한 동기화도 다음 주기에 한 번만 다시 시도합니다.
+    """
+
+    def __init__(
+        self,
+        pool: DownloadWorkerPool,
+        *,
+        sync_interval: float,
+        check_interval: float,
+        batch_size: int,
+        priority: int,
+    ) -> None:
+        self.pool = pool
+        self.sync_interval = sync_interval
+        self.check_interval = check_interval
+        self.batch_size = max(1, batch_size)
+        self.priority = priority
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="profile-sync-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                scheduled = await self.schedule_once()
+            except Exception:
+                logger.exception("프로필 동기화 예약 실패. 다음 주기에 다시 시도합니다.")
+                scheduled = 0
+
+            if scheduled < self.batch_size:
+                await asyncio.sleep(self.check_interval)
+
+    async def schedule_once(self) -> int:
+        since = now_kst() - timedelta(seconds=self.sync_interval)
+        async with AsyncSessionLocal() as session:
+            profiles = await ProfileRepository(session).due_for_sync(since, self.batch_size)
+            if not profiles:
+                return 0
+
+            urls = {canonicalize_url(url): url for url in map(InstagramService.profile_url, profiles)}
+            jobs = DownloadJobRepository(session)
+            taken = await jobs.find_recent_keys(list(urls), since)
+            entries = [
+                (url, InstagramService.PLATFORM_NAME)
+                for key, url in urls.items()
+                if key not in taken
+            ]
+            if entries:
+                async with unit_of_work(session):
+                    await jobs.enqueue_many(entries, priority=self.priority)
+
+        if entries:
+            logger.info("프로필 %d개의 동기화를 예약했습니다.", len(entries))
+            self.pool.notify()
+        return len(entries)
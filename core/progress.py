@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy.exc import OperationalError
+
+from app.models.job import JobStatus
+from app.repositories.job_repository import DownloadJobRepository
+from core.database import AsyncSessionLocal
+from core.exception import DownloadCancelledError
+from core.unit_of_work import unit_of_work
+from downloader.models import DownloadPhase
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {JobStatus.done.value, JobStatus.failed.value}
+# 진행 상황 저장이 계속 실패하면 저장 주기를 이 배수까지 늘립니다.
+PERSIST_MAX_BACKOFF = 8
+
+
+class ProgressBroker:
+    """
+    다운로드 작업별 최신 진행 상태를 보관하고 SSE 구독자에게 전달합니다.
+    publish 는 이벤트 루프 스레드에서만 호출해야 하며, 스레드에서는 ProgressReporter 를 사용합니다.
+
+    persist_interval 이 0 보다 크면 start() 이후 그 주기마다 작업별 최신 상태를 download_job.progress 에
+    저장해, 워커가 다른 프로세스에서 실행될 때도 API 가 진행 상황을 읽을 수 있게 합니다.
+    """
+
+    def __init__(self, queue_size: int = 64, persist_interval: float = 0.0) -> None:
+        self.queue_size = queue_size
+        self.persist_interval = persist_interval
+        self._latest: Dict[int, Dict[str, Any]] = {}
+        self._subscribers: Dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._persist_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self.persist_interval > 0 and self._persist_task is None:
+            self._persist_task = asyncio.create_task(self._persist_loop(), name="progress-persist")
+
+    async def stop(self) -> None:
+        if self._persist_task is None:
+            return
+        self._persist_task.cancel()
+        await asyncio.gather(self._persist_task, return_exceptions=True)
+        self._persist_task = None
+
+    async def _persist_loop(self) -> None:
+        delay = self.persist_interval
+        while True:
+            await asyncio.sleep(delay)
+            if not self._pending:
+                continue
+            pending, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as session:
+                    async with unit_of_work(session):
+                        await DownloadJobRepository(session).save_progress(pending)
+            except Exception as e:
+                # 저장하지 못한 상태는 다음 주기에 다시 저장합니다. 그 사이 새 이벤트가 왔거나 끝난 작업은 제외합니다.
+                for job_id, event in pending.items():
+                    if job_id in self._latest:
+                        self._pending.setdefault(job_id, event)
+                delay = min(delay * 2, self.persist_interval * PERSIST_MAX_BACKOFF)
+                # SQLite 잠금 같은 DB 오류는 일시적인 경우가 많아 traceback 없이 남깁니다.
+                logger.warning(
+                    "다운로드 진행 상황 %d건을 저장하지 못해 %.1f초 뒤 다시 시도합니다: %s",
+                    len(pending), delay, e, exc_info=not isinstance(e, OperationalError),
+                )
+            else:
+                delay = self.persist_interval
+
+    def latest(self, job_id: int) -> Optional[Dict[str, Any]]:
+        return self._latest.get(job_id)
+
+    def discard(self, job_id: int) -> None:
+        """
+        이 프로세스에서 실행을 멈춘 작업의 진행 상황을 지웁니다.
+        조회와 SSE 는 DB 에 저장된 상태를 읽게 됩니다.
+        """
+        self._latest.pop(job_id, None)
+        self._pending.pop(job_id, None)
+
+    def publish(self, job_id: int, event: Dict[str, Any]) -> None:
+        event = {"job_id": job_id, **event}
+        if event.get("status") in TERMINAL_STATUSES:
+            self._latest.pop(job_id, None)
+            self._pending.pop(job_id, None)
+        else:
+            self._latest[job_id] = event
+            if self.persist_interval > 0:
+                self._pending[job_id] = event
+
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                # 진행 상황은 스냅샷이므로 밀린 이벤트는 버려도 됩니다.
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: int) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[job_id].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def reporter(self, job_id: int) -> "ProgressReporter":
+        return ProgressReporter(self, job_id, asyncio.get_running_loop())
+
+
+class ProgressReporter:
+    """
+    downloader 에 넘기는 진행 상황 콜백.
+    yt-dlp / instaloader 가 실행되는 워커 스레드에서 호출되어도 안전합니다.
+
+    cancel() 이후에는 호출될 때 DownloadCancelledError 를 올립니다. asyncio 작업을 취소해도
+    스레드의 yt-dlp 다운로드는 멈추지 않으므로, 진행 상황 hook 에서 예외를 올려 중단시킵니다.
+    """
+
+    def __init__(
+        self,
+        broker: ProgressBroker,
+        job_id: int,
+        loop: asyncio.AbstractEventLoop,
+        min_interval: float = 0.5,
+    ) -> None:
+        self.broker = broker
+        self.job_id = job_id
+        self.loop = loop
+        self.min_interval = min_interval
+        self._last_phase: Optional[DownloadPhase] = None
+        self._last_sent = 0.0
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """
+        다음 진행 상황 호출부터 다운로드를 중단시키고, 이 작업의 진행 상황을 broker 에서 지웁니다.
+        이벤트 루프 스레드에서 호출해야 합니다.
+        """
+        self._cancelled = True
+        self.broker.discard(self.job_id)
+
+    def __call__(self, phase: DownloadPhase, **fields: Any) -> None:
+        if self._cancelled:
+            raise DownloadCancelledError(self.job_id)
+        now = time.monotonic()
+        final = fields.pop("final", False)
+        if phase == self._last_phase and not final and now - self._last_sent < self.min_interval:
+            return
+        self._last_phase = phase
+        self._last_sent = now
+
+        event = {"status": JobStatus.running.value, "phase": DownloadPhase(phase).value, **fields}
+        self._dispatch(event)
+
+    def status(self, status: JobStatus, **fields: Any) -> None:
+        self._dispatch({"status": status.value, **fields})
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            self._publish(event)
+        else:
+            self.loop.call_soon_threadsafe(self._publish, event)
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        # 취소 전에 스레드에서 보낸 이벤트가 늦게 도착해도 지운 진행 상황을 되살리지 않습니다.
+        if not self._cancelled:
+            self.broker.publish(self.job_id, event)
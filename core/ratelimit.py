@@ -0,0 +1,27 @@
+from typing import Dict
+
+from core import settings
+from utils.rate_limiter import RateLimiter
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_limiter(platform: str) -> RateLimiter:
+    """
+    플랫폼별로 하나씩 공유되는 RateLimiter 를 반환합니다.
+    설정은 Settings.platform_limits, 없으면 default_platform_limit 을 따릅니다.
+    """
+    platform = platform.lower()
+    limiter = _limiters.get(platform)
+    if limiter is None:
+        conf = settings.platform_limits.get(platform, settings.default_platform_limit)
+        limiter = RateLimiter(
+            platform,
+            concurrency=conf.concurrency,
+            rate=conf.rate,
+            window=conf.window,
+            max_backoff=conf.max_backoff,
+            max_retries=conf.max_retries,
+        )
+        _limiters[platform] = limiter
+    return limiter
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Dict, Sequence
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.search_outbox import OutboxOp, SearchOutbox
+from app.repositories.search_outbox_repository import SearchOutboxRepository
+from app.services.search_index_service import SearchIndexService
+from core.database import AsyncSessionLocal
+from core.exception import SearchIndexWriteError
+from core.meili import delete_media_documents, index_media
+from core.unit_of_work import unit_of_work
+from utils.app_utils import now_kst
+
+logger = logging.getLogger(__name__)
+
+
+class SearchOutboxFlusher:
+    """
+    search_outbox 를 주기적으로 읽어 Meilisearch 에 배치로 반영합니다.
+
+    interval 초마다, 또는 직전 배치가 batch_size 만큼 찼으면 바로 다음 배치를 처리합니다.
+    반영한 행은 retention 초 동안 남겨 두었다가 지웁니다.
+    """
+
+    def __init__(self, *, interval: float, batch_size: int, retention: float) -> None:
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.retention = retention
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="search-outbox-flusher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                flushed = await self.flush_once()
+            except SearchIndexWriteError as e:
+                logger.warning("검색 인덱스에 반영하지 못했습니다. 다음 주기에 다시 시도합니다: %s", e)
+                flushed = 0
+            except Exception:
+                logger.exception("검색 인덱스 동기화 실패. 다음 주기에 다시 시도합니다.")
+                flushed = 0
+
+            if flushed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    async def flush_once(self) -> int:
+        async with AsyncSessionLocal() as session:
+            repo = SearchOutboxRepository(session)
+            rows = await repo.fetch_batch(self.batch_size)
+            if not rows:
+                return 0
+
+            # 반영에 실패하면 SearchIndexWriteError 가 올라오고, outbox 행은 남아 다음 주기에 다시 처리됩니다.
+            await apply_outbox_rows(rows, session)
+
+            async with unit_of_work(session):
+                await repo.mark_processed([row.id for row in rows])
+                await repo.purge_processed(now_kst() - timedelta(seconds=self.retention))
+
+        return len(rows)
+
+
+async def apply_outbox_rows(rows: Sequence[SearchOutbox], session: AsyncSession) -> None:
+    """
+    outbox 행을 live 인덱스에 반영합니다. 같은 media 의 여러 변경은 마지막 변경 하나로 합쳐집니다.
+    """
+    latest: Dict[int, str] = {}
+    for row in rows:
+        latest[row.media_id] = row.op
+
+    upsert_ids = [mid for mid, op in latest.items() if op == OutboxOp.upsert.value]
+    documents = await SearchIndexService.load_documents(upsert_ids, session)
+
+    # upsert 대상인데 DB 에서 사라진 media 는 삭제로 처리합니다.
+    found = {doc["id"] for doc in documents}
+    delete_ids = [
+        mid for mid, op in latest.items()
+        if op == OutboxOp.delete.value or mid not in found
+    ]
+
+    if documents:
+        await index_media(documents)
+    if delete_ids:
+        await delete_media_documents(delete_ids)
@@ -1,22 +1,202 @@
-from fastapi import BackgroundTasks
+import asyncio
+import logging
+import os
+import socket
+from typing import Dict, Iterable, Mapping
+
+from app.repositories.job_repository import DownloadJobRepository
+from app.models.job import DownloadJob, JobStatus
 from core.database import AsyncSessionLocal
+from core.progress import ProgressBroker
+from core.unit_of_work import unit_of_work
+from utils.app_utils import uuid_generator
+
+logger = logging.getLogger(__name__)
 
 
-def schedule_download(
-    url: str,
-    background_tasks: BackgroundTasks,
-    service_cls: type,
-) -> None:
+class DownloadWorkerPool:
     """
-    URL 다운로드를 백그라운드 작업으로 예약합니다.
+    download_job 테이블을 대기열로 사용하는 워커 풀.
+    이벤트 루프 위에서 concurrency 개의 워커가 작업을 하나씩 가져가 실행합니다.
+    API 프로세스에 내장하거나 app.commands.worker 로 별도 프로세스에서 실행합니다.
+
+    가져간 작업은 lease_seconds 동안 이 풀에 임대되며 heartbeat_interval 마다 연장합니다.
+    여러 노드가 같은 DB 를 쓰면, 멈추거나 죽은 노드의 작업은 임대가 만료된 뒤 다른 노드가 다시 실행하고,
+    임대를 잃은 작업은 이 노드에서 취소해 중복 다운로드를 막습니다.
+    스레드에서 실행 중인 yt-dlp 다운로드는 진행 상황 콜백에서 중단되며, 콜백을 부르지 않는 구간
+    (Instagram 게시물 조회, ffmpeg 병합 등)은 그 구간이 끝날 때까지 이어진 뒤 멈춥니다.
     """
-    
-    def _job():
-        import asyncio
-        async def _run():
+
+    def __init__(
+        self,
+        services: Mapping[str, type],
+        *,
+        concurrency: int,
+        poll_interval: float,
+        broker: ProgressBroker | None = None,
+        platforms: Iterable[str] | None = None,
+        lease_seconds: float = 60.0,
+        heartbeat_interval: float = 15.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.services = dict(services)
+        if platforms is not None:
+            platforms = set(platforms)
+            unknown = platforms - self.services.keys()
+            if unknown:
+                raise ValueError(f"지원하지 않는 플랫폼입니다: {', '.join(sorted(unknown))}")
+            self.services = {name: cls for name, cls in self.services.items() if name in platforms}
+        # None 이면 모든 플랫폼의 작업을 가져옵니다.
+        self.platforms = sorted(self.services) if platforms is not None else None
+        self.broker = broker or ProgressBroker()
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        if heartbeat_interval >= lease_seconds:
+            raise ValueError("heartbeat_interval 은 lease_seconds 보다 짧아야 합니다.")
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.max_attempts = max(1, max_attempts)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid_generator()}"
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._running: Dict[int, asyncio.Task] = {}
+
+    async def start(self) -> None:
+        await self._requeue_expired()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"download-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._workers.append(asyncio.create_task(self._lease_loop(), name="download-lease"))
+
+    async def stop(self) -> None:
+        if not self._workers:
+            return
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        # 실행 중이던 작업은 임대 만료를 기다리지 않고 바로 다른 워커가 가져가게 합니다.
+        try:
+            async with AsyncSessionLocal() as session:
+                async with unit_of_work(session):
+                    released = await DownloadJobRepository(session).release(self.worker_id)
+            if released:
+                logger.info("실행 중이던 다운로드 작업 %d건을 대기열에 돌려놓았습니다.", released)
+        except Exception:
+            logger.exception("다운로드 작업 임대를 반환하지 못했습니다. 임대 만료 후 다시 실행됩니다.")
+
+    def notify(self) -> None:
+        """
+        새 작업이 들어왔음을 알려 대기 중인 워커를 깨웁니다.
+        """
+        self._wakeup.set()
+
+    async def _worker_loop(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("다운로드 작업을 가져오지 못했습니다.")
+                job = None
+
+            if job is None:
+                await self._wait()
+                continue
+
+            task = asyncio.create_task(self._run(job), name=f"download-job-{job.id}")
+            self._running[job.id] = task
+            try:
+                await task
+            except asyncio.CancelledError:
+                # 워커 자신이 취소된 것이 아니면 임대를 잃은 작업만 취소된 것입니다.
+                if asyncio.current_task().cancelling():
+                    task.cancel()
+                    raise
+            finally:
+                self._running.pop(job.id, None)
+
+    async def _wait(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _claim(self) -> DownloadJob | None:
+        async with AsyncSessionLocal() as session:
+            async with unit_of_work(session):
+                return await DownloadJobRepository(session).claim_next(
+                    self.worker_id, self.lease_seconds, self.platforms
+                )
+
+    async def _lease_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._heartbeat()
+                await self._requeue_expired()
+            except Exception:
+                logger.exception("다운로드 작업 임대를 갱신하지 못했습니다.")
+
+    async def _heartbeat(self) -> None:
+        job_ids = list(self._running)
+        if not job_ids:
+            return
+        async with AsyncSessionLocal() as session:
+            async with unit_of_work(session):
+                owned = await DownloadJobRepository(session).heartbeat(
+                    self.worker_id, job_ids, self.lease_seconds
+                )
+        for job_id in set(job_ids) - owned:
+            task = self._running.get(job_id)
+            if task is not None and not task.done():
+                logger.warning("다운로드 작업 %s 의 임대를 잃어 이 노드에서 취소합니다.", job_id)
+                task.cancel()
+
+    async def _requeue_expired(self) -> None:
+        async with AsyncSessionLocal() as session:
+            async with unit_of_work(session):
+                requeued, failed = await DownloadJobRepository(session).requeue_expired(self.max_attempts)
+        if requeued:
+            logger.info("임대가 만료된 다운로드 작업 %d건을 다시 대기열에 넣었습니다.", requeued)
+        if failed:
+            logger.warning("임대가 만료된 다운로드 작업 %d건을 실패 처리했습니다.", failed)
+
+    async def _run(self, job: DownloadJob) -> None:
+        reporter = self.broker.reporter(job.id)
+        reporter.status(JobStatus.running)
+
+        error: str | None = None
+        try:
+            service_cls = self.services.get(job.platform)
+            if service_cls is None:
+                raise LookupError(f"지원하지 않는 플랫폼입니다: {job.platform}")
+
             async with AsyncSessionLocal() as session:
-                service = service_cls(session)
-                await service.handle(url)
-        
-        asyncio.run(_run())
-    background_tasks.add_task(_job)
\ No newline at end of file
+                await service_cls(session).handle(job.url, progress=reporter)
+        except asyncio.CancelledError:
+            # 임대를 잃었거나 워커가 종료되는 경우입니다. 스레드에서 실행 중인 다운로드는 다음 진행 상황
+            # 호출에서 멈추고, 다른 워커가 이어받으므로 이 노드의 진행 상황은 지웁니다.
+            reporter.cancel()
+            raise
+        except Exception as e:
+            logger.exception("다운로드 작업 %s 실패: %s", job.id, job.url)
+            error = str(e) or e.__class__.__name__
+
+        async with AsyncSessionLocal() as session:
+            async with unit_of_work(session):
+                repo = DownloadJobRepository(session)
+                if error is None:
+                    recorded = await repo.mark_done(job.id, self.worker_id)
+                else:
+                    recorded = await repo.mark_failed(job.id, self.worker_id, error)
+
+        if not recorded:
+            logger.warning("다운로드 작업 %s 의 임대가 이미 다른 워커에게 넘어가 결과를 기록하지 않았습니다.", job.id)
+            return
+        if error is None:
+            reporter.status(JobStatus.done)
+        else:
+            reporter.status(JobStatus.failed, error=error)
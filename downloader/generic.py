@@ -1,11 +1,15 @@
 import asyncio, httpx, yt_dlp
+from yt_dlp.utils import DownloadError, ReExtractInfo
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from downloader.models import FileInfo, DownloadResult, ExtractionResult
+from downloader.models import (
+    FileInfo, DownloadResult, ExtractionResult, DownloadPhase, ProgressCallback, noop_progress
+)
 from downloader.interfaces import Downloader, Extractor
 from utils.app_utils import safe_string, uuid_generator
-from utils.image_utils import convert_to_webp
+from utils.image_pipeline import ImagePipeline
+from utils.rate_limiter import RateLimiter, parse_retry_after
 from utils.ytdlp_utils import YtOptsBuilder, VideoContainer
 
 
@@ -22,19 +26,27 @@ class GenericDownloader(Downloader[Dict[str, Any]]):
         root_dir: Path,
         extractor: Optional[Extractor[Dict[str, Any]]] = None,
         http_client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[RateLimiter] = None,
+        image_pipeline: Optional[ImagePipeline] = None,
     ):
         self.platform = platform.lower()
         self.extractor = extractor or GenericExtractor(self.platform)
-        self.http = http_client or httpx.AsyncClient(timeout=10)
+        self.http = http_client
+        self.limiter = limiter
+        self.images = image_pipeline or ImagePipeline(workers=0)
         
         self.platform_dir = _ensure_dir(root_dir.expanduser()/ "downloads" / self.platform)
         self.thumbnail_dir = _ensure_dir(self.platform_dir / "thumbnails")
         
-    async def download(self, url: str) -> DownloadResult:
+    async def download(self, url: str, progress: Optional[ProgressCallback] = None) -> DownloadResult:
+        progress = progress or noop_progress
+        
+        progress(DownloadPhase.probe)
         meta = await self.extractor.extract(url)
         
         uid = uuid_generator()
-        video_info = await self._download_video(meta, uid)
+        video_info = await self._download_video(meta, uid, progress=progress)
+        progress(DownloadPhase.thumbnail)
         thumbnail_info = await self._handle_thumbnail(meta.thumbnail_url, meta.title, uid)
         
         files = [video_info]
@@ -52,42 +64,95 @@ class GenericDownloader(Downloader[Dict[str, Any]]):
         return f"{safe_string(title)}_{uid}.{ext}"
 
     async def _download_video(
-        self, meta: ExtractionResult, uid: str, container: VideoContainer = VideoContainer.mp4
+        self,
+        meta: ExtractionResult,
+        uid: str,
+        container: VideoContainer = VideoContainer.mp4,
+        progress: ProgressCallback = noop_progress,
     ) -> FileInfo:
         dest_stem = self.platform_dir / f"{safe_string(meta.title)}_{uid}"
+        
+        def _on_progress(d: Dict[str, Any]) -> None:
+            if d.get("status") not in ("downloading", "finished"):
+                return
+            progress(
+                DownloadPhase.download,
+                downloaded_bytes=d.get("downloaded_bytes"),
+                total_bytes=d.get("total_bytes") or d.get("total_bytes_estimate"),
+                speed=d.get("speed"),
+                eta=d.get("eta"),
+                final=d.get("status") == "finished",
+            )
+        
+        def _on_postprocess(d: Dict[str, Any]) -> None:
+            if d.get("postprocessor") == "Merger" and d.get("status") == "started":
+                progress(DownloadPhase.merge)
+        
         ydl_opts = (
             YtOptsBuilder()
             .best_video_audio()
             .merge_output(container)
             .outtmpl(f"{dest_stem}.%(ext)s")
+            .progress_hook(_on_progress)
+            .postprocessor_hook(_on_postprocess)
             .build()
         )
 
-        def _run():
+        def _run() -> Dict[str, Any]:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([meta.video_url])
+                if not meta.metadata:
+                    return ydl.extract_info(meta.video_url, download=True)
+                # probe 결과를 그대로 처리해 페이지/포맷 정보를 다시 받지 않습니다.
+                info = ydl.sanitize_info(meta.metadata, remove_private_keys=True)
+                try:
+                    return ydl.process_ie_result(info, download=True)
+                except (DownloadError, ReExtractInfo) as e:
+                    # 포맷 URL 이 만료된 경우 등에는 URL 로 다시 추출합니다. (yt-dlp --load-info-json 과 동일)
+                    ydl.report_warning(f"probe 결과로 다운로드하지 못해 URL 로 다시 시도합니다: {e}")
+                    return ydl.extract_info(meta.video_url, download=True)
 
-        await asyncio.to_thread(_run)
-        fp = dest_stem.with_suffix(f".{meta.ext}")
+        result = await asyncio.to_thread(_run)
+        fp = self._output_path(result) or dest_stem.with_suffix(f".{result.get('ext') or meta.ext}")
         return FileInfo(filename=fp.name, filepath=fp)
 
+    @staticmethod
+    def _output_path(result: Dict[str, Any]) -> Optional[Path]:
+        """
+        yt-dlp 가 후처리(병합 등)까지 마친 최종 파일 경로를 반환합니다.
+        """
+        downloads = result.get("requested_downloads") or []
+        filepath = (downloads[0].get("filepath") if downloads else None) or result.get("filepath")
+        return Path(filepath) if filepath else None
+
     async def _handle_thumbnail(
         self, url: Optional[str], title: str, uid: str
     ) -> Optional[FileInfo]:
         if not url:
-            return None, None
+            return None
         data = await self._fetch(url)
         if not data:
-            return None, None
+            return None
 
-        webp = await asyncio.to_thread(convert_to_webp, data)
         filename = self._build_filename(title, uid, "webp")
         filepath = self.thumbnail_dir / filename
-        filepath.write_bytes(webp)
-        return FileInfo(filename=filename, filepath=filepath)
+        source = filepath.with_name(f".{filepath.name}.src")
+        await asyncio.to_thread(source.write_bytes, data)
+        try:
+            converted = await self.images.convert(source, filepath, "thumbnail")
+        finally:
+            source.unlink(missing_ok=True)
+        return FileInfo(filename=filename, filepath=filepath) if converted else None
 
     async def _fetch(self, url: str) -> Optional[bytes]:
-        resp = await self.http.get(url)
+        if self.limiter:
+            await self.limiter.acquire()
+        if self.http is None:
+            async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+                resp = await client.get(url)
+        else:
+            resp = await self.http.get(url)
+        if resp.status_code == 429 and self.limiter:
+            self.limiter.penalize(parse_retry_after(resp.headers.get("Retry-After")))
         return resp.content if resp.status_code == 200 else None
 
 
@@ -110,7 +175,10 @@ class GenericExtractor(Extractor[Dict[str, Any]]):
                 return ydl.extract_info(url, download=False)
         
         info = await asyncio.to_thread(_probe)
-        
+        return self.to_result(url, info)
+    
+    @staticmethod
+    def to_result(url: str, info: Dict[str, Any]) -> ExtractionResult[Dict[str, Any]]:
         return ExtractionResult(
             title=info.get("title") or "video",
             video_url=url,
@@ -1,16 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar, Optional, Dict, Any
-from .models import DownloadResult, ExtractionResult
+from .models import DownloadResult, ExtractionResult, ProgressCallback
 
 MetaT = TypeVar("MetaT", bound=Optional[Dict[str, Any]])
 
 
 class Downloader(ABC, Generic[MetaT]):
     @abstractmethod
-    async def download(self, url: str) -> DownloadResult[MetaT]:
+    async def download(
+        self, url: str, progress: Optional[ProgressCallback] = None
+    ) -> DownloadResult[MetaT]:
         ...
 
 class Extractor(ABC, Generic[MetaT]):
     @abstractmethod
     async def extract(self, url: str) -> ExtractionResult[MetaT]:
-        ...
\ No newline at end of file
+        ...
@@ -1,5 +1,6 @@
+from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
 from pydantic import BaseModel, field_validator
 
 MetaT = TypeVar("MetaT", bound=Optional[Dict[str, Any]])
@@ -9,6 +10,8 @@ class FileInfo(BaseModel):
     filename: str
     filepath: Path
     filesize: int | None = None
+    # 플랫폼의 원본 게시물 식별자 (Instagram shortcode 등)
+    source_id: str | None = None
     
     @field_validator("filesize", mode="after")
     @classmethod
@@ -45,4 +48,19 @@ class ExtractionResult(Generic[MetaT]):
         self.video_url = video_url
         self.ext = ext
         self.thumbnail_url = thumbnail_url
-        self.metadata = metadata or {}
\ No newline at end of file
+        self.metadata = metadata or {}
+
+class DownloadPhase(str, Enum):
+    probe = "probe"
+    download = "download"
+    merge = "merge"
+    thumbnail = "thumbnail"
+    db = "db"
+
+
+# progress(phase, **fields) 형태로 호출되는 진행 상황 콜백
+ProgressCallback = Callable[..., None]
+
+
+def noop_progress(phase: DownloadPhase, **fields: Any) -> None:
+    return None
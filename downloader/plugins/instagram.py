@@ -1,88 +1,226 @@
-from instaloader import Instaloader, Post, Profile, exceptions, StoryItem
+from instaloader import Instaloader, Post, PostSidecarNode, Profile, exceptions, StoryItem
+from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import urlparse
-from typing import List
+from typing import AbstractSet, Callable, Dict, List, Optional, Tuple, Union
 
 from downloader.interfaces import Downloader, DownloadResult
-from downloader.models import FileInfo
+from downloader.models import FileInfo, DownloadPhase, ProgressCallback, noop_progress
 from utils.app_utils import uuid_generator
-from utils.image_utils import convert_to_webp
+from utils.image_pipeline import ImagePipeline
+from utils.rate_limiter import parse_retry_after
 
-import re, asyncio
+from .instagram_sessions import InstaloaderSessionPool
+
+import re, asyncio, httpx, logging, os
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _PlannedFile:
+    """Instaloader 로 조회한 뒤 httpx 로 받을 파일 하나."""
+    url: str
+    path: Path
+    mtime: float
+    source_id: Optional[str] = None
 
 
 class InstagramDownloader(Downloader):
     PLATFORM = "instagram"
-    
+
     _IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".heic", ".heif"}
-    
-    def __init__(self, platform_dir: Path):
+    _CHUNK_SIZE = 256 * 1024
+
+    def __init__(
+        self,
+        platform_dir: Path,
+        image_pipeline: Optional[ImagePipeline] = None,
+        session_pool: Optional[InstaloaderSessionPool] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        item_concurrency: int = 4,
+    ):
         self.platform_dir = platform_dir
         self.platform_dir.mkdir(parents=True, exist_ok=True)
+        self.images = image_pipeline or ImagePipeline(workers=0)
+        self.sessions = session_pool or InstaloaderSessionPool()
+        self.http = http_client
+        self.item_concurrency = max(1, item_concurrency)
 
-    def _create_loader(self, target_dir: Path, prefix: str) -> Instaloader:
+    def _prepare_loader(self, loader: Instaloader, prefix: str) -> Instaloader:
+        """
+        풀에서 빌린 loader 의 파일 이름 규칙을 이번 작업에 맞춥니다.
+        """
         uid = uuid_generator()
-        loader = Instaloader(
-            dirname_pattern=str(target_dir),
-            filename_pattern=f"{prefix}_{{shortcode}}_{uid}"
-        )
-        loader.save_metadata = False
-        loader.post_metadata_txt_pattern = ""
-        loader.storyitem_metadata_txt_pattern = ""
+        loader.filename_pattern = f"{prefix}_{{shortcode}}_{uid}"
         return loader
-    
-    def _collect_files(self, target_dir: Path) -> List[FileInfo]:
-        return [
-            FileInfo(filename=file.name, filepath=file)
-            for file in sorted(target_dir.iterdir())
-            if file.is_file()
-        ]
-        
-    async def download(self, url: str) -> DownloadResult:
+
+    async def download(self, url: str, progress: Optional[ProgressCallback] = None) -> DownloadResult:
+        progress = progress or noop_progress
         parsed = urlparse(url)
         path = parsed.path.rstrip("/")
-        
+
+        if re.match(r"^/(?:p|reel)/", path):
+            return await self._run(self._plan_post, path, progress=progress)
+        if re.match(r"^/stories/[\w\.]+/[0-9]+$", path):
+            return await self._run(self._plan_story, path, progress=progress)
+        username = self.profile_username(url) or path.strip("/").split("/")[0]
+        return await self.sync_profile(username, progress=progress)
+
+    async def sync_profile(
+        self,
+        username: str,
+        known: AbstractSet[str] = frozenset(),
+        progress: Optional[ProgressCallback] = None,
+    ) -> DownloadResult:
+        """
+        프로필의 게시물을 최신순으로 받다가 known 에 있는 shortcode 를 만나면 멈춥니다.
+        known 이 비어 있으면 전체 게시물을 받습니다.
+        """
+        progress = progress or noop_progress
+        # 게시물 하나가 실패해도 나머지는 저장하고, 실패한 shortcode 는 metadata["failed_posts"] 로 알립니다.
+        return await self._run(self._plan_profile, username, known, progress=progress, partial=True)
+
+    @staticmethod
+    def profile_username(url: str) -> Optional[str]:
+        match = re.match(r"^/([\w\.]+)$", urlparse(url).path.rstrip("/"))
+        return match.group(1) if match else None
+
+    async def _run(
+        self,
+        plan: Callable[..., Tuple[DownloadResult, List[_PlannedFile]]],
+        *args,
+        progress: ProgressCallback,
+        partial: bool = False,
+    ) -> DownloadResult:
+        """
+        세션을 빌려 스레드에서 게시물을 조회하고, 세션을 반납한 뒤 파일을 병렬로 받습니다.
+        partial 이면 실패한 게시물만 빼고 결과를 돌려줍니다.
+        """
+        progress(DownloadPhase.probe)
         try:
-            if re.match(r"^/(?:p|reel)/", path):
-                result = await asyncio.to_thread(self._download_post, path)
-            elif re.match(r"^/stories/[\w\.]+/[0-9]+$", path):
-                result = await asyncio.to_thread(self._download_story, path)
-            else:
-                result = await asyncio.to_thread(self._download_profile, path)
+            async with self.sessions.lease() as loader:
+                result, planned = await asyncio.to_thread(plan, loader, *args)
         except exceptions.InstaloaderException as e:
             raise RuntimeError(f"Instaloader 오류: {e}") from e
-        
-        return result
-    
-    async def _convert_to_webp(self, paths: list[Path]) -> list[Path]:
-        converted: list[Path] = []
-        for p in paths:
-            if p.suffix.lower() in self._IMAGE_EXTS:
-                dst = p.with_suffix(".webp")
-                await asyncio.to_thread(convert_to_webp, p, dst)
-                p.unlink(missing_ok=True)
-                converted.append(dst)
+
+        files, failed = await self._fetch_all(planned, progress, partial=partial)
+        update: dict = {"files": files}
+        if failed:
+            update["metadata"] = {**(result.metadata or {}), "failed_posts": failed}
+        return result.model_copy(update=update)
+
+    async def _fetch_all(
+        self, planned: List[_PlannedFile], progress: ProgressCallback, *, partial: bool = False
+    ) -> Tuple[List[FileInfo], List[str]]:
+        """
+        파일을 최대 item_concurrency 개씩 동시에 받고, 받은 이미지는 바로 WebP 로 변환합니다.
+        한 항목이라도 실패한 게시물(source_id)은 받은 파일을 지워 일부만 남지 않게 합니다.
+        partial 이 아니거나 모든 게시물이 실패하면 받은 파일을 모두 지우고 첫 예외를 올립니다.
+        (받은 파일, 실패한 게시물의 source_id) 를 반환합니다.
+        """
+        semaphore = asyncio.Semaphore(self.item_concurrency)
+        state = {"files_done": 0, "downloaded_bytes": 0}
+
+        async def _fetch_one(item: _PlannedFile) -> FileInfo:
+            async with semaphore:
+                size = await self._fetch_to(item.url, item.path)
+            await asyncio.to_thread(os.utime, item.path, (item.mtime, item.mtime))
+            state["files_done"] += 1
+            state["downloaded_bytes"] += size
+            progress(DownloadPhase.download, filename=item.path.name, final=True, **state)
+            # 변환은 semaphore 밖에서 하므로 다음 항목 다운로드와 겹쳐 진행됩니다.
+            return await self._convert_to_webp(
+                FileInfo(filename=item.path.name, filepath=item.path, source_id=item.source_id)
+            )
+
+        results = await asyncio.gather(*(_fetch_one(item) for item in planned), return_exceptions=True)
+
+        posts: Dict[str, list] = {}
+        for item, res in zip(planned, results):
+            posts.setdefault(item.source_id or str(item.path), []).append(res)
+
+        files: List[FileInfo] = []
+        failed: List[str] = []
+        errors: List[BaseException] = []
+        discard: List[Path] = []
+        for key, post in posts.items():
+            post_errors = [r for r in post if isinstance(r, BaseException)]
+            if post_errors:
+                failed.append(key)
+                errors.extend(post_errors)
+                discard.extend(r.filepath for r in post if isinstance(r, FileInfo))
             else:
-                converted.append(p)
-        return converted
-    
-    def _download_post(self, url: str) -> DownloadResult:
+                files.extend(post)
+
+        if errors and (not partial or not files):
+            discard.extend(f.filepath for f in files)
+            await asyncio.to_thread(self._unlink_all, discard)
+            raise errors[0]
+        if discard:
+            await asyncio.to_thread(self._unlink_all, discard)
+        if failed:
+            logger.warning("Instagram 게시물 %d개를 받지 못했습니다: %s (%s)", len(failed), ", ".join(failed), errors[0])
+        return files, failed
+
+    @staticmethod
+    def _unlink_all(paths: List[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    async def _fetch_to(self, url: str, dest: Path) -> int:
+        if self.http is None:
+            async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+                return await self._stream_to(client, url, dest)
+        return await self._stream_to(self.http, url, dest)
+
+    async def _stream_to(self, client: httpx.AsyncClient, url: str, dest: Path) -> int:
+        tmp = dest.with_name(f"{dest.name}.part")
+        size = 0
+        try:
+            async with client.stream("GET", url) as resp:
+                if resp.status_code == 429:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    raise RuntimeError(f"429 Too Many Requests (retry after {retry_after})")
+                resp.raise_for_status()
+                fh = await asyncio.to_thread(open, tmp, "wb")
+                try:
+                    async for chunk in resp.aiter_bytes(self._CHUNK_SIZE):
+                        await asyncio.to_thread(fh.write, chunk)
+                        size += len(chunk)
+                finally:
+                    await asyncio.to_thread(fh.close)
+            await asyncio.to_thread(os.replace, tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return size
+
+    async def _convert_to_webp(self, file: FileInfo) -> FileInfo:
+        """
+        이미지 파일을 이미지 파이프라인에서 WebP 로 변환합니다.
+        변환에 실패하면 원본을 그대로 둡니다.
+        """
+        if file.filepath.suffix.lower() not in self._IMAGE_EXTS:
+            return file
+        dst = file.filepath.with_suffix(".webp")
+        if not await self.images.convert(file.filepath, dst, "media"):
+            return file
+        await asyncio.to_thread(file.filepath.unlink, missing_ok=True)
+        return file.model_copy(update={"filename": dst.name, "filepath": dst, "filesize": None})
+
+    def _plan_post(
+        self, loader: Instaloader, url: str
+    ) -> Tuple[DownloadResult, List[_PlannedFile]]:
         shortcode = url.split('/')[-1]
-        base_loader = Instaloader()
-        post = Post.from_shortcode(base_loader.context, shortcode)
+        post = Post.from_shortcode(loader.context, shortcode)
         owner_id = post.owner_id
         dest = self._prepare_target(f"posts/{owner_id}")
-        
-        loader = self._create_loader(dest, post.owner_username)
-        expect_paths = self._predict_post_files(loader, post, dest)
-        
-        loader.download_post(post, target="")
-        
-        saved_paths = [p for p in expect_paths if p.exists()]
-        saved_paths = asyncio.run(self._convert_to_webp(saved_paths))
-        files = [FileInfo(filename=p.name, filepath=p) for p in saved_paths] or self._collect_files(dest)
-        
-        raw_caption = post.caption
+
+        self._prepare_loader(loader, post.owner_username)
+        planned = self._plan_post_files(loader, post, dest)
+
+        raw_caption = post.caption or ""
         _caption = raw_caption.replace("\r\n", " ").replace("\n", " ")
         caption = re.sub(r"\s+", " ", _caption).strip() or "caption_empty"
         metadata = {
@@ -90,91 +228,108 @@ class InstagramDownloader(Downloader):
             "owner_id": owner_id,
             "owner_username": post.owner_username
         }
-        
-        return DownloadResult(
+
+        result = DownloadResult(
             platform=self.PLATFORM,
             title=caption,
-            files=files,
+            files=[],
             metadata=metadata
         )
-    
-    def _download_profile(self, url: str) -> DownloadResult:
-        username = url.strip('/').split('/')[0]
-        base_loader = Instaloader()
-        profile = Profile.from_username(base_loader.context, username)
+        return result, planned
+
+    def _plan_profile(
+        self, loader: Instaloader, username: str, known: AbstractSet[str]
+    ) -> Tuple[DownloadResult, List[_PlannedFile]]:
+        profile = Profile.from_username(loader.context, username)
         owner_id = profile.userid
-        
+
         dest = self._prepare_target(f"posts/{owner_id}")
-        loader = self._create_loader(dest, username)
-        loader.download_profile(profile, profile_pic_only=False, fast_update=True)
-        
-        files = self._collect_files(dest)
-        files = asyncio.run(self._convert_to_webp([f.filepath for f in files]))
-        files = [FileInfo(filename=p.name, filepath=p) for p in files]
+        self._prepare_loader(loader, username)
+
+        planned: List[_PlannedFile] = []
+        new_posts = 0
+        for post in profile.get_posts():
+            if post.shortcode in known:
+                # 고정 게시물은 오래된 글이어도 맨 앞에 나오므로 건너뛰고 계속 확인합니다.
+                if post.is_pinned:
+                    continue
+                break
+            planned.extend(self._plan_post_files(loader, post, dest))
+            new_posts += 1
+
         metadata = {
             'owner_id': owner_id,
-            'owner_name': profile.username
+            'owner_name': profile.username,
+            'new_posts': new_posts,
         }
-        return DownloadResult(platform=self.PLATFORM, title=profile.username, files=files, metadata=metadata)
-    
-    def _download_story(self, url: str) -> DownloadResult:
+        result = DownloadResult(platform=self.PLATFORM, title=profile.username, files=[], metadata=metadata)
+        return result, planned
+
+    def _plan_story(
+        self, loader: Instaloader, url: str
+    ) -> Tuple[DownloadResult, List[_PlannedFile]]:
         parts = url.strip('/').split('/')
         _, owner_name, story_id = parts[-3:]
-        base_loader = Instaloader()
-        profile = Profile.from_username(base_loader.context, owner_name)
+        profile = Profile.from_username(loader.context, owner_name)
         owner_id = profile.userid
 
         dest = self._prepare_target(f'stories/{owner_id}')
-        loader = self._create_loader(dest, owner_name)
+        self._prepare_loader(loader, owner_name)
 
-        files: List[FileInfo] = []
+        planned: List[_PlannedFile] = []
         for story in loader.get_stories(userids=[owner_id]):
             for item in story.get_items():
                 if str(item.mediaid) == story_id:
-                    except_paths = self._predict_story_files(loader, item, dest)
-                    loader.download_storyitem(item, target="")
-                    saved_files = [p for p in except_paths if p.exists()]
-                    saved_files = asyncio.run(self._convert_to_webp(saved_files))
-                    files = [FileInfo(filename=p.name, filepath=p) for p in saved_files] or self._collect_files(dest)
+                    stem = loader.format_filename(item, target="")
+                    planned = [self._plan_item(item, dest / stem)]
                     break
-            if files:
+            if planned:
                 break
 
-        if not files:
+        if not planned:
             raise ValueError(f"Story {story_id} not found for user {owner_name}")
         metadata = {"owner_id": owner_id, "owner_name": owner_name}
-        return DownloadResult(
+        result = DownloadResult(
             platform=self.PLATFORM,
             title=owner_name,
-            files=files,
+            files=[],
             metadata=metadata
         )
-    
-    def _predict_post_files(
+        return result, planned
+
+    def _plan_post_files(
         self, loader: Instaloader, post: Post, dest: Path
-    ) -> List[Path]:
-        paths: List[Path] = []
-        
-        if post.typename == "GraghSidecar":
-            for node in post.get_sidecar_nodes():
-                stem = loader.format_filename(node, target="")
-                ext = ".mp4" if node.is_video else ".webp"
-                paths.append(dest / f"{stem}{ext}")
-        else:
-            stem = loader.format_filename(post, target="")
-            ext = ".mp4" if post.is_video else ".webp"
-            paths.append(dest / f"{stem}{ext}")
-            
-        return paths
-    
-    def _predict_story_files(
-        self, loader: Instaloader, item: StoryItem, dest: Path
-    ) -> List[Path]:
-        stem = loader.format_filename(item, target="")
-        ext = ".mp4" if item.is_video else ".webp"
-        return [dest / f"{stem}{ext}"]
-    
+    ) -> List[_PlannedFile]:
+        """
+        게시물의 파일 목록을 Instaloader 와 같은 이름 규칙으로 만듭니다.
+        캐러셀은 <이름>_1, <이름>_2 ... 로 저장됩니다.
+        """
+        stem = loader.format_filename(post, target="")
+        mtime = post.date_local.timestamp()
+
+        if post.typename == "GraphSidecar":
+            return [
+                self._plan_item(node, dest / f"{stem}_{index}", mtime, post.shortcode)
+                for index, node in enumerate(post.get_sidecar_nodes(), start=1)
+            ]
+        return [self._plan_item(post, dest / stem, mtime, post.shortcode)]
+
+    @staticmethod
+    def _plan_item(
+        item: Union[Post, StoryItem, PostSidecarNode],
+        base: Path,
+        mtime: Optional[float] = None,
+        source_id: Optional[str] = None,
+    ) -> _PlannedFile:
+        if mtime is None:
+            mtime = item.date_local.timestamp()
+        if item.is_video and item.video_url:
+            return _PlannedFile(item.video_url, base.with_name(f"{base.name}.mp4"), mtime, source_id)
+        # PostSidecarNode 는 display_url, Post/StoryItem 은 url 에 원본 이미지 주소가 있습니다.
+        url = getattr(item, "display_url", None) or item.url
+        return _PlannedFile(url, base.with_name(f"{base.name}.jpg"), mtime, source_id)
+
     def _prepare_target(self, subdir: str) -> Path:
         dest = self.platform_dir / subdir
         dest.mkdir(parents=True, exist_ok=True)
-        return dest
\ No newline at end of file
+        return dest
@@ -0,0 +1,222 @@
+import asyncio, logging, re, time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence
+
+from instaloader import Instaloader, RateController, exceptions
+
+from utils.rate_limiter import is_throttle_error
+
+logger = logging.getLogger(__name__)
+
+
+class _FailFastRateController(RateController):
+    """
+    Instaloader 는 429 를 받으면 작업 스레드에서 수 분씩 잠든 뒤 재시도합니다.
+    풀에서는 그 세션을 쉬게 하고 다른 세션을 쓰는 편이 빠르므로 바로 예외를 올립니다.
+    """
+
+    def handle_429(self, query_type: str) -> None:
+        raise exceptions.TooManyRequestsException(f"429 Too Many Requests ({query_type})")
+
+
+@dataclass(eq=False)
+class _Session:
+    loader: Instaloader
+    username: Optional[str] = None
+    session_file: Optional[Path] = None
+    failures: int = 0
+    blocked_until: float = 0.0
+    needs_check: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.username or "anonymous"
+
+
+class InstaloaderSessionPool:
+    """
+    여러 작업이 재사용하는 Instaloader 세션 풀.
+
+    - 세션(InstaloaderContext)은 작업 하나가 독점해서 빌려 쓰고 끝나면 반납합니다.
+    - 로그인 세션은 session_dir/<username> 파일에서 불러오고, 작업이 성공하면 쿠키를 다시 저장합니다.
+    - 401/로그인 요구를 받은 세션은 다음 대여 전에 test_login 으로 확인하고,
+      429 를 받은 세션은 지수적으로 늘어나는 cooldown 동안 빌려주지 않습니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        usernames: Sequence[str] = (),
+        session_dir: Optional[Path] = None,
+        anonymous: int = 1,
+        cooldown: float = 300.0,
+        max_cooldown: float = 3600.0,
+    ) -> None:
+        self.session_dir = session_dir
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._sessions: List[_Session] = [self._open(username) for username in usernames]
+        # 로그인 세션이 하나도 없을 때만 익명 세션을 만듭니다.
+        if not self._sessions:
+            self._sessions = [_Session(loader=self._new_loader()) for _ in range(max(1, anonymous))]
+        self._idle: List[_Session] = list(self._sessions)
+        self._changed = asyncio.Event()
+
+    @staticmethod
+    def _new_loader() -> Instaloader:
+        return Instaloader(
+            quiet=True,
+            save_metadata=False,
+            post_metadata_txt_pattern="",
+            storyitem_metadata_txt_pattern="",
+            rate_controller=_FailFastRateController,
+        )
+
+    def _open(self, username: str) -> _Session:
+        session = _Session(loader=self._new_loader(), username=username)
+        if self.session_dir is None:
+            logger.warning("INSTAGRAM_SESSION_DIR 가 없어 %s 세션을 익명으로 사용합니다.", username)
+            return session
+        session.session_file = self.session_dir / username
+        try:
+            session.loader.load_session_from_file(username, str(session.session_file))
+        except FileNotFoundError:
+            logger.warning("Instagram 세션 파일이 없습니다: %s", session.session_file)
+        except Exception:
+            logger.warning("Instagram 세션 파일을 읽지 못했습니다: %s", session.session_file, exc_info=True)
+        return session
+
+    @property
+    def size(self) -> int:
+        return len(self._sessions)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Instaloader]:
+        """
+        세션 하나를 독점으로 빌립니다. 블록 안에서 난 예외로 세션 상태를 판단합니다.
+        """
+        session = await self._checkout()
+        error: Optional[BaseException] = None
+        try:
+            yield session.loader
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._checkin(session, error)
+
+    async def _checkout(self) -> _Session:
+        failed = set()
+        while True:
+            session = await self._wait_idle()
+            if not session.needs_check:
+                return session
+            try:
+                healthy = await asyncio.to_thread(self._health_check, session)
+            except BaseException:
+                self._release(session)
+                raise
+            if healthy:
+                session.needs_check = False
+                return session
+            self._block(session)
+            self._release(session)
+            # 모든 세션이 확인에 실패하면 cooldown 을 기다리지 않고 작업을 실패시킵니다.
+            failed.add(id(session))
+            if len(failed) >= len(self._sessions):
+                raise exceptions.LoginRequiredException("사용할 수 있는 Instagram 세션이 없습니다.")
+
+    async def _wait_idle(self) -> _Session:
+        while True:
+            now = time.monotonic()
+            ready = [s for s in self._idle if s.blocked_until <= now]
+            if ready:
+                session = min(ready, key=lambda s: s.failures)
+                self._idle.remove(session)
+                return session
+
+            self._changed.clear()
+            timeout = min((s.blocked_until - now for s in self._idle), default=None)
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _checkin(self, session: _Session, error: Optional[BaseException]) -> None:
+        if error is None:
+            session.failures = 0
+            self._save(session)
+        elif is_throttle_error(error):
+            logger.warning("Instagram 요청 제한: %s 세션을 쉬게 합니다.", session.name)
+            self._block(session)
+            session.needs_check = True
+        elif self._is_auth_error(error):
+            logger.warning("Instagram 인증 오류: %s 세션을 다음 대여 전에 확인합니다.", session.name)
+            session.needs_check = True
+        self._release(session)
+
+    def _release(self, session: _Session) -> None:
+        self._idle.append(session)
+        self._changed.set()
+
+    def _block(self, session: _Session) -> None:
+        session.failures += 1
+        delay = min(self.max_cooldown, self.cooldown * 2 ** (session.failures - 1))
+        session.blocked_until = time.monotonic() + delay
+
+    @staticmethod
+    def _is_auth_error(error: BaseException) -> bool:
+        if isinstance(error, (exceptions.LoginRequiredException, exceptions.LoginException)):
+            return True
+        return re.search(r"\b401\b", str(error)) is not None
+
+    def _health_check(self, session: _Session) -> bool:
+        """
+        로그인 세션은 test_login 으로 확인하고, 실패하면 세션 파일을 다시 읽어 한 번 더 확인합니다.
+        익명 세션은 쿠키를 버리고 새 세션으로 바꿉니다.
+        """
+        if session.username is None:
+            session.loader.close()
+            session.loader = self._new_loader()
+            return True
+
+        try:
+            if session.loader.test_login() == session.username:
+                return True
+            if session.session_file is not None and session.session_file.exists():
+                session.loader.load_session_from_file(session.username, str(session.session_file))
+                if session.loader.test_login() == session.username:
+                    return True
+        except Exception:
+            logger.warning("Instagram 세션 확인 실패: %s", session.name, exc_info=True)
+            return False
+        logger.warning("Instagram 세션이 로그인 상태가 아닙니다: %s", session.name)
+        return False
+
+    @staticmethod
+    def _save(session: _Session) -> None:
+        if session.session_file is None or not session.loader.context.is_logged_in:
+            return
+        try:
+            session.loader.save_session_to_file(str(session.session_file))
+        except Exception:
+            logger.warning("Instagram 세션 저장 실패: %s", session.session_file, exc_info=True)
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "session": s.name,
+                "leased": s not in self._idle,
+                "failures": s.failures,
+                "cooldown": max(0.0, round(s.blocked_until - now, 1)),
+                "needs_check": s.needs_check,
+            }
+            for s in self._sessions
+        ]
+
+    def close(self) -> None:
+        for session in self._sessions:
+            session.loader.close()
@@ -5,10 +5,10 @@ import httpx
 from pathlib import Path
 from typing import Optional
 
-from downloader.models import FileInfo, DownloadResult
+from downloader.models import FileInfo, DownloadResult, DownloadPhase, ProgressCallback, noop_progress
 from downloader.interfaces import Downloader
 from utils.app_utils import uuid_generator
-from utils.image_utils import convert_to_webp
+from utils.image_pipeline import ImagePipeline
 from utils.ytdlp_utils import YtOptsBuilder, VideoContainer
 
 class YoutubeDownloader(Downloader):
@@ -18,35 +18,61 @@ class YoutubeDownloader(Downloader):
         self,
         video_dir: Path,
         thumb_dir: Optional[Path] = None,
+        image_pipeline: Optional[ImagePipeline] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         self.video_dir = video_dir.expanduser()
         self.thumb_dir = (thumb_dir or (video_dir / "thumbnails")).expanduser()
+        self.images = image_pipeline or ImagePipeline(workers=0)
+        self.http = http_client
         
         self.video_dir.mkdir(parents=True, exist_ok=True)
         self.thumb_dir.mkdir(parents=True, exist_ok=True)
 
     async def _fetch_bytes(self, url: str) -> Optional[bytes]:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url)
-            if r.status_code == 200:
-                return r.content
-        return None
-    async def thumbnail_download(self, url: str):
+        if self.http is None:
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                r = await client.get(url)
+        else:
+            r = await self.http.get(url)
+        return r.content if r.status_code == 200 else None
+
+    async def thumbnail_download(self, url: str, dest: Path) -> bool:
+        """
+        썸네일을 받아 dest 에 WebP 로 저장합니다. 변환은 이미지 파이프라인에서 파일 경로로 처리합니다.
+        """
         data = await self._fetch_bytes(url)
-        if data:
-            return await asyncio.to_thread(convert_to_webp, data)
-        return None
+        if not data:
+            return False
+        source = dest.with_name(f".{dest.name}.src")
+        await asyncio.to_thread(source.write_bytes, data)
+        try:
+            return await self.images.convert(source, dest, "thumbnail")
+        finally:
+            source.unlink(missing_ok=True)
 
 
-    async def download(self, url: str) -> DownloadResult:
+    async def download(self, url: str, progress: Optional[ProgressCallback] = None) -> DownloadResult:
+        progress = progress or noop_progress
 
         unique_id = uuid_generator()
 
+        def _on_progress(d: dict) -> None:
+            if d.get("status") == "downloading":
+                progress(
+                    DownloadPhase.download,
+                    downloaded_bytes=d.get("downloaded_bytes"),
+                    total_bytes=d.get("total_bytes") or d.get("total_bytes_estimate"),
+                    speed=d.get("speed"),
+                    eta=d.get("eta"),
+                )
+
         ydl_opts = (
             YtOptsBuilder()
             .best_video_audio()
             .outtmpl(self.video_dir / f"%(title)s_{unique_id}.%(ext)s")
             .merge_output(VideoContainer.mp4)
+            .progress_hook(_on_progress)
             .build()
         )
         
@@ -59,10 +85,10 @@ class YoutubeDownloader(Downloader):
         thumbnail_filename: Optional[str] = None
         thumbnail_filepath: Optional[Path] = None
         if (thumbnail_url := info.get('thumbnail')):
-            if (thumb_bytes := await self.thumbnail_download(thumbnail_url)):
+            progress(DownloadPhase.thumbnail)
+            if await self.thumbnail_download(thumbnail_url, self.thumb_dir / f"{title}.webp"):
                 thumbnail_filename = f"{title}.webp"
                 thumbnail_filepath = self.thumb_dir / thumbnail_filename
-                thumbnail_filepath.write_bytes(thumb_bytes)
 
         return DownloadResult(
             platform= self.PLATFORM,
@@ -94,12 +120,9 @@ class YoutubeDownloader(Downloader):
         thumbnail_filename = None
         thumbnail_filepath = None
         if thumbnail_url:
-            content = await self.thumbnail_download(thumbnail_url)
-            if content:
-                thumbnail_filename = f"{info['title']}.jpg"
+            if await self.thumbnail_download(thumbnail_url, self.thumb_dir / f"{info['title']}.webp"):
+                thumbnail_filename = f"{info['title']}.webp"
                 thumbnail_filepath = self.thumb_dir / thumbnail_filename
-                with open(thumbnail_filepath, "wb") as f:
-                    f.write(content)
         return DownloadResult(
             platform= self.PLATFORM,
             title=info["title"],
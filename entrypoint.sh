@@ -1,6 +1,13 @@
 #!/usr/bin/env bash
 set -e
 
+# 다운로드 워커만 실행: docker compose run web worker --concurrency 4 --platforms youtube
+if [[ "$1" == "worker" ]]; then
+  shift
+  echo "[entrypoint] Starting download worker."
+  exec python -m app.commands.worker "$@"
+fi
+
 # certs 폴더가 있고 키·인증서 파일이 둘 다 있으면 SSL 모드
 if [[ -d "/app/certs" && -f "/app/certs/localhost.pem" && -f "/app/certs/localhost-key.pem" ]]; then
   echo "[entrypoint] SSL mode is enabled; Starting in SSL mode."
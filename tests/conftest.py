@@ -0,0 +1,48 @@
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# core.settings 는 import 시점에 만들어지므로 테스트용 환경 변수를 먼저 설정합니다.
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="storagebucket-test-"))
+os.environ.setdefault("MEILI_URL", "http://127.0.0.1:7700")
+os.environ.setdefault("MEILI_MASTER_KEY", "test")
+os.environ["DATABASE_TYPE"] = "sqlite"
+os.environ["SQLITE_DB_NAME"] = str(_TMP_DIR / "test")
+os.environ["DOWNLOAD_DIR"] = str(_TMP_DIR / "downloads")
+
+from sqlmodel import SQLModel  # noqa: E402
+
+from core.database import engine, init_db, load_models  # noqa: E402
+from core.ratelimit import _limiters  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """
+    빈 SQLite DB 를 만든 뒤 코루틴 함수를 실행합니다.
+    테스트마다 이벤트 루프가 바뀌므로 끝나면 엔진의 연결을 닫습니다.
+    """
+    def _run(scenario):
+        async def main():
+            # limiter 의 Lock/Semaphore 가 이전 테스트의 이벤트 루프에 묶이지 않도록 비웁니다.
+            _limiters.clear()
+            load_models()
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.drop_all)
+            await init_db()
+            try:
+                return await scenario()
+            finally:
+                await engine.dispose()
+        return asyncio.run(main())
+    return _run
+
+
+@pytest.fixture
+def download_dir() -> Path:
+    path = _TMP_DIR / "downloads"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
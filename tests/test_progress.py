@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from app.repositories.job_repository import DownloadJobRepository
+from core.progress import ProgressBroker
+
+
+def test_persist_retries_after_lock_error(run, monkeypatch):
+    saved = []
+    calls = 0
+
+    async def save_progress(self, progress):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise OperationalError("UPDATE download_job", {}, Exception("database is locked"))
+        saved.append(dict(progress))
+    monkeypatch.setattr(DownloadJobRepository, "save_progress", save_progress)
+
+    async def scenario():
+        broker = ProgressBroker(persist_interval=0.05)
+        await broker.start()
+        try:
+            broker.publish(1, {"status": "running", "percent": 10})
+            broker.publish(2, {"status": "running", "percent": 20})
+            await asyncio.sleep(0.08)
+            # 첫 저장이 실패한 뒤 들어온 이벤트는 실패한 이벤트보다 우선합니다.
+            broker.publish(1, {"status": "running", "percent": 50})
+            broker.publish(2, {"status": "done"})
+            for _ in range(20):
+                if saved:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await broker.stop()
+
+    run(scenario)
+    assert calls == 2
+    assert saved == [{1: {"job_id": 1, "status": "running", "percent": 50}}]
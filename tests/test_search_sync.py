@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import select
+
+import core.meili as meili
+import core.search_sync as search_sync
+from app.models.search_outbox import OutboxOp, SearchOutbox
+from app.repositories.search_outbox_repository import SearchOutboxRepository
+from core.database import AsyncSessionLocal
+from core.exception import SearchIndexWriteError
+from core.search_sync import SearchOutboxFlusher
+from core.unit_of_work import unit_of_work
+
+
+async def _unprocessed() -> int:
+    async with AsyncSessionLocal() as session:
+        stmt = select(SearchOutbox).where(SearchOutbox.processed_at.is_(None))
+        return len((await session.exec(stmt)).all())
+
+
+def test_failed_task_raises(monkeypatch):
+    async def write():
+        return SimpleNamespace(task_uid=7)
+
+    async def wait_for_task(client, task_uid, timeout_in_ms):
+        return SimpleNamespace(status="failed", error={"message": "invalid document"})
+    monkeypatch.setattr(meili, "wait_for_task", wait_for_task)
+    monkeypatch.setattr(meili, "get_client", lambda: None)
+
+    with pytest.raises(SearchIndexWriteError):
+        asyncio.run(meili._apply_media_write(write()))
+
+
+def test_flush_keeps_outbox_until_applied(run, monkeypatch):
+    applied = []
+
+    async def failing_delete(ids):
+        raise SearchIndexWriteError(1, "status=failed")
+
+    async def delete(ids):
+        applied.append(ids)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            async with unit_of_work(session):
+                SearchOutboxRepository(session).enqueue([1, 2], OutboxOp.delete)
+
+        flusher = SearchOutboxFlusher(interval=1, batch_size=10, retention=60)
+        monkeypatch.setattr(search_sync, "delete_media_documents", failing_delete)
+        with pytest.raises(SearchIndexWriteError):
+            await flusher.flush_once()
+        kept = await _unprocessed()
+
+        monkeypatch.setattr(search_sync, "delete_media_documents", delete)
+        flushed = await flusher.flush_once()
+        left = await _unprocessed()
+        return kept, flushed, left
+
+    assert run(scenario) == (2, 2, 0)
+    assert applied == [[1, 2]]
+
+
+def test_reindex_replays_outbox_after_high_water(run, monkeypatch):
+    from app.commands.reindex import replay_outbox
+
+    deleted = []
+
+    async def delete(ids):
+        deleted.append(ids)
+    monkeypatch.setattr(search_sync, "delete_media_documents", delete)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            repo = SearchOutboxRepository(session)
+            async with unit_of_work(session):
+                repo.enqueue([1])
+            high_water = await repo.max_id()
+            async with unit_of_work(session):
+                repo.enqueue([2])
+            # 재색인 도중 flusher 가 이전 인덱스에 반영한 행도 다시 반영해야 합니다.
+            async with unit_of_work(session):
+                await repo.mark_processed([row.id for row in await repo.fetch_batch(10)])
+                repo.enqueue([3], OutboxOp.delete)
+        return await replay_outbox(high_water, batch_size=1)
+
+    assert run(scenario) == 2
+    # media 2 는 DB 에 없으므로 upsert 대신 삭제됩니다.
+    assert deleted == [[2], [3]]
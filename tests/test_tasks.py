@@ -0,0 +1,108 @@
+import asyncio
+
+from sqlmodel import select
+
+from app.models.job import DownloadJob, JobStatus
+from app.models.media import Media
+from app.models.probe_cache import ProbeCache
+from app.repositories.job_repository import DownloadJobRepository
+from app.services.youtube_services import YoutubeService
+from core.database import AsyncSessionLocal
+from core.tasks import DownloadWorkerPool
+from core.unit_of_work import unit_of_work
+from downloader.generic import GenericExtractor
+from downloader.models import DownloadResult, FileInfo
+
+URLS = [
+    "https://www.youtube.com/watch?v=first",
+    "https://www.youtube.com/watch?v=second",
+]
+LEASE_SECONDS = 1.0
+HEARTBEAT_INTERVAL = 0.2
+
+
+class SlowDownloader:
+    """probe 캐시를 쓴 뒤 임대 시간보다 오래 다운로드하는 stub."""
+
+    running = 0
+    max_running = 0
+
+    def __init__(self, extractor, root):
+        self.extractor = extractor
+        self.root = root
+
+    async def download(self, url, progress=None):
+        extraction = await self.extractor.extract(url)
+        cls = type(self)
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        try:
+            await asyncio.sleep(LEASE_SECONDS * 1.5)
+        finally:
+            cls.running -= 1
+        path = self.root / f"{extraction.metadata['id']}.mp4"
+        path.write_bytes(b"video")
+        return DownloadResult(
+            title=extraction.title,
+            platform=YoutubeService.PLATFORM_NAME,
+            files=[FileInfo(filename=path.name, filepath=path)],
+        )
+
+
+def test_concurrent_jobs_keep_their_lease(run, monkeypatch, download_dir):
+    async def extract(self, url):
+        return GenericExtractor.to_result(url, {"id": url.rsplit("=", 1)[1], "title": "video"})
+    monkeypatch.setattr(GenericExtractor, "extract", extract)
+
+    class SlowYoutubeService(YoutubeService):
+        def __init__(self, session):
+            super().__init__(session)
+            self.downloader = SlowDownloader(self.downloader.extractor, download_dir)
+
+    heartbeats = []
+    original_heartbeat = DownloadJobRepository.heartbeat
+
+    async def heartbeat(self, worker_id, job_ids, lease_seconds):
+        owned = await original_heartbeat(self, worker_id, job_ids, lease_seconds)
+        heartbeats.append(set(owned))
+        return owned
+    monkeypatch.setattr(DownloadJobRepository, "heartbeat", heartbeat)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            async with unit_of_work(session):
+                repo = DownloadJobRepository(session)
+                for url in URLS:
+                    await repo.enqueue(url=url, platform=YoutubeService.PLATFORM_NAME)
+
+        pool = DownloadWorkerPool(
+            {YoutubeService.PLATFORM_NAME: SlowYoutubeService},
+            concurrency=2,
+            poll_interval=0.05,
+            lease_seconds=LEASE_SECONDS,
+            heartbeat_interval=HEARTBEAT_INTERVAL,
+        )
+        await pool.start()
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.1)
+                async with AsyncSessionLocal() as session:
+                    jobs = (await session.exec(select(DownloadJob))).all()
+                if all(job.status in (JobStatus.done, JobStatus.failed) for job in jobs):
+                    break
+        finally:
+            await pool.stop()
+
+        async with AsyncSessionLocal() as session:
+            jobs = (await session.exec(select(DownloadJob))).all()
+            probes = (await session.exec(select(ProbeCache))).all()
+            medias = (await session.exec(select(Media))).all()
+        return jobs, probes, medias
+
+    jobs, probes, medias = run(scenario)
+    assert [(job.status, job.attempts, job.error) for job in jobs] == [(JobStatus.done, 1, None)] * 2
+    assert SlowDownloader.max_running == 2
+    # 두 작업이 다운로드하는 동안 heartbeat 가 두 작업의 임대를 모두 연장했습니다.
+    assert any(len(owned) == 2 for owned in heartbeats)
+    assert len(probes) == 2
+    assert len(medias) == 2
@@ -0,0 +1,106 @@
+from sqlmodel import select
+
+from app.models.media import Media
+from app.models.probe_cache import ProbeCache
+from app.models.urls import Url
+from app.repositories.media_repository import MediaRepository
+from app.services.youtube_services import YoutubeService
+from core.database import AsyncSessionLocal
+from downloader.generic import GenericExtractor
+from downloader.models import DownloadResult, FileInfo
+
+URL = "https://www.youtube.com/watch?v=abc123"
+
+
+class StubDownloader:
+    """실제 다운로더처럼 extractor 로 정보를 얻은 뒤 파일을 씁니다."""
+
+    def __init__(self, extractor, root):
+        self.extractor = extractor
+        self.root = root
+
+    async def download(self, url, progress=None):
+        extraction = await self.extractor.extract(url)
+        path = self.root / f"{extraction.metadata['id']}.{extraction.ext}"
+        path.write_bytes(b"video")
+        return DownloadResult(
+            title=extraction.title,
+            platform=YoutubeService.PLATFORM_NAME,
+            files=[FileInfo(filename=path.name, filepath=path)],
+        )
+
+
+class FailingDownloader:
+    async def download(self, url, progress=None):
+        raise RuntimeError("download failed")
+
+
+def _stub_extract(monkeypatch):
+    async def extract(self, url):
+        return GenericExtractor.to_result(url, {"id": "abc123", "title": "video", "ext": "mp4"})
+    monkeypatch.setattr(GenericExtractor, "extract", extract)
+
+
+def test_handle_writes_probe_cache_and_media(run, monkeypatch, download_dir):
+    _stub_extract(monkeypatch)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            service = YoutubeService(session)
+            service.downloader = StubDownloader(service.downloader.extractor, download_dir)
+            result = await service.handle(URL)
+
+        async with AsyncSessionLocal() as session:
+            probes = (await session.exec(select(ProbeCache))).all()
+            medias = (await session.exec(select(Media))).all()
+        return result, probes, medias
+
+    result, probes, medias = run(scenario)
+    assert result.title == "video"
+    assert [p.url for p in probes] == [URL]
+    assert probes[0].info["id"] == "abc123"
+    assert len(medias) == 1
+    assert medias[0].title == "abc123.mp4"
+    assert medias[0].url_id is not None
+
+
+def test_failed_download_releases_url(run):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            service = YoutubeService(session)
+            service.downloader = FailingDownloader()
+            try:
+                await service.handle(URL)
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("다운로드 실패가 전달되지 않았습니다.")
+
+        async with AsyncSessionLocal() as session:
+            return (await session.exec(select(Url))).all()
+
+    assert run(scenario) == []
+
+
+def test_failed_save_releases_url(run, monkeypatch, download_dir):
+    _stub_extract(monkeypatch)
+
+    async def add_medias(self, **kwargs):
+        raise RuntimeError("save failed")
+    monkeypatch.setattr(MediaRepository, "add_medias", add_medias)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            service = YoutubeService(session)
+            service.downloader = StubDownloader(service.downloader.extractor, download_dir)
+            try:
+                await service.handle(URL)
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("저장 실패가 전달되지 않았습니다.")
+
+        async with AsyncSessionLocal() as session:
+            return (await session.exec(select(Url))).all()
+
+    assert run(scenario) == []
@@ -0,0 +1,145 @@
+import asyncio, logging, os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    """
+    용량 제한이 있는 파생 파일(썸네일 등) 디스크 캐시.
+
+    - key 는 내용이 결정되는 값(원본 해시 + 변환 옵션)이어야 하며, 같은 key 는 같은 파일을 뜻합니다.
+    - max_bytes 를 넘으면 가장 오래 쓰이지 않은 파일부터 지웁니다. 사용 순서는 mtime 으로 남겨
+      재시작 후에도 이어집니다.
+    - 같은 key 를 동시에 요청하면 생성은 한 번만 하고 나머지는 그 결과를 기다립니다.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def path_for(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    async def get_or_create(
+        self,
+        key: str,
+        suffix: str,
+        create: Callable[[Path], Awaitable[bool]],
+    ) -> Optional[Path]:
+        """
+        캐시된 파일 경로를 반환하고, 없으면 create(path) 로 만든 뒤 반환합니다.
+        create 는 path 에 파일을 원자적으로 써야 하며 실패하면 False 를 반환합니다.
+        """
+        await self._ensure_loaded()
+        path = self.path_for(key, suffix)
+        entry = f"{key}{suffix}"
+
+        if entry in self._entries and path.exists():
+            self.hits += 1
+            self._touch(entry, path)
+            return path
+
+        task = self._inflight.get(entry)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._create(entry, path, create))
+            self._inflight[entry] = task
+            task.add_done_callback(lambda _: self._inflight.pop(entry, None))
+        else:
+            self.coalesced += 1
+        # 먼저 요청한 쪽이 끊겨도 생성은 계속되어 다른 대기자가 결과를 받습니다.
+        return await asyncio.shield(task)
+
+    async def _create(
+        self, entry: str, path: Path, create: Callable[[Path], Awaitable[bool]]
+    ) -> Optional[Path]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not await create(path):
+            return None
+
+        size = path.stat().st_size
+        self._total += size - self._entries.pop(entry, 0)
+        self._entries[entry] = size
+        await self._evict()
+        return path
+
+    def _touch(self, entry: str, path: Path) -> None:
+        self._entries.move_to_end(entry)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _pop_victims(self) -> List[Path]:
+        # 방금 추가한 항목(가장 최근)은 남겨 둡니다.
+        victims: List[Path] = []
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            entry, size = self._entries.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            victims.append(self.path_for(entry, ""))
+        return victims
+
+    async def _evict(self) -> None:
+        victims = self._pop_victims()
+        if victims:
+            await asyncio.to_thread(self._unlink, victims)
+
+    @staticmethod
+    def _unlink(paths: List[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                logger.warning("캐시 파일 삭제 실패: %s", path, exc_info=True)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            files = await asyncio.to_thread(self._scan)
+            for entry, size in files:
+                self._entries[entry] = size
+                self._total += size
+            self._loaded = True
+        await self._evict()
+
+    def _scan(self) -> List[Tuple[str, int]]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        found = []
+        for p in self.root.glob("*/*"):
+            if not p.is_file():
+                continue
+            if p.name.endswith(".part"):
+                p.unlink(missing_ok=True)
+                continue
+            st = p.stat()
+            found.append((st.st_mtime, p.name, st.st_size))
+        found.sort()
+        return [(name, size) for _, name, size in found]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,64 @@
+import asyncio, hashlib, os
+from pathlib import Path
+from typing import BinaryIO, Tuple
+
+from fastapi import UploadFile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _write_chunk(fh: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    hasher.update(chunk)
+    fh.write(chunk)
+
+
+async def save_upload(
+    file: UploadFile, dest: Path, *, chunk_size: int = CHUNK_SIZE
+) -> Tuple[int, str]:
+    """
+    UploadFile 을 chunk 단위로 dest 에 저장합니다.
+    파일 쓰기와 해시 계산은 스레드에서 수행하며 (파일 크기, sha256 hex) 를 반환합니다.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    fh = await asyncio.to_thread(open, dest, "wb")
+    try:
+        while chunk := await file.read(chunk_size):
+            await asyncio.to_thread(_write_chunk, fh, hasher, chunk)
+            size += len(chunk)
+    except BaseException:
+        await asyncio.to_thread(fh.close)
+        dest.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(fh.close)
+    return size, hasher.hexdigest()
+
+
+def hash_file(path: Path, *, chunk_size: int = CHUNK_SIZE) -> Tuple[int, str]:
+    """
+    파일을 chunk 단위로 읽어 (파일 크기, sha256 hex) 를 반환합니다.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            hasher.update(chunk)
+            size += len(chunk)
+    return size, hasher.hexdigest()
+
+
+def replace_with_link(source: Path, target: Path) -> bool:
+    """
+    target 을 source 의 하드링크로 교체합니다.
+    하드링크를 만들 수 없으면(다른 파일시스템 등) target 을 건드리지 않고 False 를 반환합니다.
+    """
+    if target.exists() and source.samefile(target):
+        return True
+    tmp = target.with_name(f".{target.name}.link")
+    try:
+        tmp.unlink(missing_ok=True)
+        os.link(source, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, target)
+    return True
@@ -0,0 +1,146 @@
+import asyncio, logging, multiprocessing, os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+from utils.image_profiles import DEFAULT_PROFILES, ImageProfile
+
+logger = logging.getLogger(__name__)
+
+
+_SAVE_FORMATS = {"webp": "WEBP", "jpeg": "JPEG", "png": "PNG"}
+_UNBOUNDED = 1 << 16
+
+
+def _render(
+    src: str,
+    dst: str,
+    *,
+    box: Optional[Tuple[int, int]],
+    fmt: str,
+    profile: ImageProfile,
+) -> bool:
+    tmp = f"{dst}.part"
+    try:
+        with Image.open(src) as img:
+            if box:
+                # JPEG 는 디코딩 단계에서 축소해 메모리와 시간을 줄입니다.
+                img.draft("RGB", box)
+            out = ImageOps.exif_transpose(img)
+            has_alpha = out.mode in ("RGBA", "LA") or (out.mode == "P" and "transparency" in out.info)
+            out = out.convert("RGBA" if has_alpha and fmt != "jpeg" else "RGB")
+            if box:
+                out.thumbnail(box, Image.Resampling.LANCZOS)
+
+            options = {"quality": profile.quality}
+            if fmt == "webp":
+                options.update(method=profile.method, lossless=profile.lossless)
+            elif fmt == "jpeg":
+                options.update(optimize=True, progressive=True)
+            else:
+                options = {"optimize": True}
+            out.save(tmp, format=_SAVE_FORMATS[fmt], **options)
+        os.replace(tmp, dst)
+        return True
+    except Exception:
+        logger.warning("이미지 변환 실패: %s", src, exc_info=True)
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return False
+
+
+def convert_image(src: str, dst: str, profile: ImageProfile) -> bool:
+    """
+    src 이미지를 profile 에 맞춰 dst 에 WebP 로 저장합니다. 워커 프로세스에서 실행됩니다.
+    임시 파일에 쓴 뒤 교체하므로 실패해도 dst 에 깨진 파일이 남지 않습니다.
+    """
+    box = (profile.max_dimension, profile.max_dimension) if profile.max_dimension else None
+    return _render(src, dst, box=box, fmt="webp", profile=profile)
+
+
+def resize_image(
+    src: str, dst: str, width: Optional[int], height: Optional[int], fmt: str, profile: ImageProfile
+) -> bool:
+    """
+    비율을 유지한 채 width x height 안에 들어가도록 축소해 fmt 형식으로 저장합니다. (확대하지 않음)
+    둘 다 없으면 profile.max_dimension 을 사용합니다.
+    """
+    if width or height:
+        box = (width or _UNBOUNDED, height or _UNBOUNDED)
+    else:
+        box = (profile.max_dimension, profile.max_dimension) if profile.max_dimension else None
+    return _render(src, dst, box=box, fmt=fmt, profile=profile)
+
+
+class ImagePipeline:
+    """
+    ProcessPoolExecutor 로 이미지를 병렬 변환합니다.
+
+    PIL 인코딩이 GIL 을 오래 잡아 이벤트 루프와 다른 스레드를 굶기지 않도록 별도 프로세스에서 실행하며,
+    바이트 대신 파일 경로만 주고받습니다. workers=0 이면 스레드에서 변환합니다.
+    """
+
+    def __init__(self, *, workers: int, profiles: Optional[Mapping[str, ImageProfile]] = None) -> None:
+        self.workers = workers
+        self.profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 스레드가 많은 서버 프로세스에서 fork 하지 않도록 spawn 을 사용합니다.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def profile(self, name: str) -> ImageProfile:
+        try:
+            return self.profiles[name]
+        except KeyError:
+            raise ValueError(f"알 수 없는 이미지 프로필입니다: {name}") from None
+
+    async def _submit(self, fn: Callable[..., bool], *args) -> bool:
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # 워커가 비정상 종료되면 풀을 버리고 다음 요청에서 새로 만듭니다.
+            logger.warning("이미지 워커 프로세스가 종료되어 풀을 다시 만듭니다: %s", args[0])
+            self.shutdown(wait=False)
+            return False
+
+    async def convert(self, src: Path, dst: Path, profile: str) -> bool:
+        return await self._submit(convert_image, str(src), str(dst), self.profile(profile))
+
+    async def resize(
+        self,
+        src: Path,
+        dst: Path,
+        *,
+        width: Optional[int],
+        height: Optional[int],
+        fmt: str = "webp",
+        profile: str = "thumbnail",
+    ) -> bool:
+        if fmt not in _SAVE_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 형식입니다: {fmt}")
+        return await self._submit(
+            resize_image, str(src), str(dst), width, height, fmt, self.profile(profile)
+        )
+
+    async def convert_many(self, pairs: Sequence[Tuple[Path, Path]], profile: str) -> List[bool]:
+        return list(await asyncio.gather(*(self.convert(src, dst, profile) for src, dst in pairs)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
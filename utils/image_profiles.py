@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# 설정(core.config)에서도 읽으므로 PIL 을 import 하지 않습니다. 변환은 utils.image_pipeline 이 맡습니다.
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """
+    WebP 인코딩 설정.
+
+    - quality : 손실 압축 품질 (0~100)
+    - method : 인코딩 노력 (0 빠름 ~ 6 느리고 작음)
+    - max_dimension : 긴 변의 최대 픽셀. None 이면 원본 크기를 유지합니다.
+    - lossless : True 면 quality 대신 무손실로 저장합니다.
+    """
+    quality: int = 85
+    method: int = 4
+    max_dimension: Optional[int] = None
+    lossless: bool = False
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.quality <= 100:
+            raise ValueError(f"quality 는 0~100 사이여야 합니다: {self.quality}")
+        if not 0 <= self.method <= 6:
+            raise ValueError(f"method 는 0~6 사이여야 합니다: {self.method}")
+        if self.max_dimension is not None and self.max_dimension <= 0:
+            raise ValueError(f"max_dimension 은 양수여야 합니다: {self.max_dimension}")
+
+
+DEFAULT_PROFILES = {
+    "media": ImageProfile(quality=90, method=4),
+    "thumbnail": ImageProfile(quality=80, method=4, max_dimension=720),
+}
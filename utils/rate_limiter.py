@@ -0,0 +1,134 @@
+import asyncio, re, time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_THROTTLE_PATTERN = re.compile(r"\b429\b|too many requests|rate.?limit|please wait a few minutes", re.I)
+_THROTTLE_EXCEPTIONS = {"TooManyRequestsException", "RateLimitError"}
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """
+    예외 체인 중에 플랫폼의 요청 제한(429 등) 신호가 있는지 확인합니다.
+    """
+    seen: set[int] = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if current.__class__.__name__ in _THROTTLE_EXCEPTIONS:
+            return True
+        if _THROTTLE_PATTERN.search(str(current)):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환합니다.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    동시 실행 수 제한 + 토큰 버킷 + 적응형 백오프를 합친 비동기 limiter.
+
+    - concurrency: 동시에 slot 을 점유할 수 있는 작업 수
+    - rate / window: window 초 동안 허용되는 요청 수 (버스트 크기도 rate)
+    - penalize() 가 호출되면 백오프 시간만큼 모든 요청을 멈추고, 성공할 때마다 백오프를 줄입니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        concurrency: int,
+        rate: float,
+        window: float,
+        min_backoff: float = 5.0,
+        max_backoff: float = 600.0,
+        max_retries: int = 2,
+    ) -> None:
+        self.name = name
+        self.capacity = max(1.0, rate)
+        self.refill_per_sec = max(rate, 1e-6) / max(window, 1e-6)
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._lock = asyncio.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._backoff = 0.0
+        self._blocked_until = 0.0
+
+    async def acquire(self) -> None:
+        """
+        토큰 하나를 얻을 때까지 기다립니다.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.refill_per_sec
+                await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            await self.acquire()
+            yield
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        slot 안에서 fn 을 실행하고, 요청 제한 오류면 백오프 후 max_retries 번까지 재시도합니다.
+        """
+        attempt = 0
+        while True:
+            async with self.slot():
+                try:
+                    result = await fn()
+                except Exception as e:
+                    if not is_throttle_error(e):
+                        raise
+                    self.penalize()
+                    if attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    continue
+            self.relax()
+            return result
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        self._backoff = min(self.max_backoff, max(self.min_backoff, self._backoff * 2))
+        delay = max(retry_after or 0.0, self._backoff)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        # 차단이 풀린 시점부터 토큰이 다시 차오르도록 합니다.
+        self._tokens = 0.0
+        self._updated = self._blocked_until
+
+    def relax(self) -> None:
+        self._backoff = self._backoff / 2 if self._backoff >= self.min_backoff else 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_sec)
@@ -0,0 +1,99 @@
+import re
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, SplitResult
+
+from utils.domain_extractor import DomainExtractor
+
+
+# 내용과 무관한 추적/공유용 쿼리 파라미터
+_TRACKING_PARAMS = {"fbclid", "gclid", "igsh", "igshid", "si", "feature", "ref_src"}
+_TRACKING_PREFIXES = ("utm_",)
+
+_YOUTUBE_ID = re.compile(r"^[\w-]{11}$")
+_YOUTUBE_PATH_ID = re.compile(r"^/(?:shorts|embed|live|v|e)/([\w-]{11})")
+_INSTAGRAM_POST = re.compile(r"^/(?:[\w.]+/)?(?:p|reel|reels|tv)/([\w-]+)")
+_INSTAGRAM_STORY = re.compile(r"^/stories/([\w.]+)/(\d+)")
+_INSTAGRAM_PROFILE = re.compile(r"^/([\w.]+)$")
+
+
+class UrlCanonicalizer:
+    """
+    같은 콘텐츠를 가리키는 URL 들을 하나의 canonical key 로 정규화합니다.
+
+    - youtube : youtu.be/X, youtube.com/watch?v=X&t=10, m.youtube.com/shorts/X → "youtube:video:X"
+    - instagram : /p/X?igsh=..., /reel/X, /user/p/X → "instagram:post:X"
+    - 그 외 : scheme/호스트/추적 파라미터를 정리한 URL
+    """
+
+    def __init__(self, extractor: DomainExtractor) -> None:
+        self.extractor = extractor
+        self._rules: Dict[str, Callable[[SplitResult], Optional[str]]] = {
+            "youtube": self._youtube,
+            "youtu": self._youtube,
+            "instagram": self._instagram,
+            "instagr": self._instagram,
+        }
+
+    def canonicalize(self, url: str) -> str:
+        url = url.strip()
+        if "://" not in url:
+            url = f"https://{url}"
+        parsed = urlsplit(url)
+
+        rule = self._rules.get(self.extractor.extract_domain(url))
+        key = rule(parsed) if rule else None
+        return key or self._generic(parsed)
+
+    __call__ = canonicalize
+
+    def _youtube(self, parsed: SplitResult) -> Optional[str]:
+        path = parsed.path.rstrip("/")
+        query = dict(parse_qsl(parsed.query))
+        host = (parsed.hostname or "").lower()
+
+        if host.endswith("youtu.be"):
+            video_id = path.lstrip("/").split("/")[0]
+            if _YOUTUBE_ID.match(video_id):
+                return f"youtube:video:{video_id}"
+
+        if path == "/watch" and _YOUTUBE_ID.match(query.get("v", "")):
+            return f"youtube:video:{query['v']}"
+
+        if m := _YOUTUBE_PATH_ID.match(path):
+            return f"youtube:video:{m.group(1)}"
+
+        if path == "/playlist" and query.get("list"):
+            return f"youtube:playlist:{query['list']}"
+
+        return None
+
+    def _instagram(self, parsed: SplitResult) -> Optional[str]:
+        path = parsed.path.rstrip("/")
+
+        if m := _INSTAGRAM_STORY.match(path):
+            return f"instagram:story:{m.group(2)}"
+
+        if m := _INSTAGRAM_POST.match(path):
+            return f"instagram:post:{m.group(1)}"
+
+        if m := _INSTAGRAM_PROFILE.match(path):
+            return f"instagram:profile:{m.group(1).lower()}"
+
+        return None
+
+    def _generic(self, parsed: SplitResult) -> str:
+        host = (parsed.hostname or "").lower()
+        for prefix in ("www.", "m."):
+            if host.startswith(prefix):
+                host = host[len(prefix):]
+                break
+
+        query = sorted(
+            (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+            if k not in _TRACKING_PARAMS and not k.startswith(_TRACKING_PREFIXES)
+        )
+        path = parsed.path.rstrip("/") or ""
+        canonical = f"https://{host}{path}"
+        if query:
+            canonical += f"?{urlencode(query)}"
+        return canonical
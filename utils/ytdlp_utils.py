@@ -1,6 +1,6 @@
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Tuple
 
 import asyncio, pathlib
 
@@ -67,6 +67,14 @@ class YtOptsBuilder:
         self._opts.setdefault("postprocessor", []).append(pp)
         return self
     
+    def progress_hook(self, hook: Callable[[Dict[str, Any]], None]) -> "YtOptsBuilder":
+        self._opts.setdefault("progress_hooks", []).append(hook)
+        return self
+    
+    def postprocessor_hook(self, hook: Callable[[Dict[str, Any]], None]) -> "YtOptsBuilder":
+        self._opts.setdefault("postprocessor_hooks", []).append(hook)
+        return self
+    
     def merge_output(self, fmt: VideoContainer) -> "YtOptsBuilder":
         self._opts["merge_output_format"] = fmt.value
         return self